@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Benchmark and equivalence check for the course detail-page extractor.
+
+Parses every page twice -- with the previous find()-per-field extractor kept
+below and with SUTDCourseScraper.parse_course_detail_page (one-pass index) --
+checks the two agree field for field, and reports per-page parse time.
+Then runs each detail parser backend (BeautifulSoup, direct lxml, each with
+and without --region) from raw bytes, checks their output against the old
+extractor, and reports parse+extract time and peak memory per page. A few
+windows-1252 pages (declared, undeclared, and with an unknown charset) check
+that every backend decodes them the way BeautifulSoup does.
+
+Pages come from the on-disk HTTP cache written by courses.py (raw detail
+pages under --cache-dir); with no cache, synthetic detail pages are used.
+
+Usage:
+    python bench_detail_extractor.py [--cache-dir .http_cache] [--synthetic 200] [--region main]
+"""
+
+import argparse
+import os
+import random
+import re
+import sqlite3
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from courses import DETAIL_PARSERS, SUTDCourseScraper
+
+
+def legacy_parse(soup: BeautifulSoup, url: str, course_code: str = None) -> Dict:
+    """Extractor as it was before DetailPageIndex: one tree search per field and fallback"""
+    course_data = {}
+    
+    # Extract course code and title from page
+    title_elem = soup.find('h1') or soup.find(['h2', 'h3'], string=re.compile(r'50\.\d+'))
+    if title_elem:
+        title_text = title_elem.get_text(strip=True)
+        code_match = re.search(r'(50\.\d+)', title_text)
+        if code_match:
+            course_data['course_code'] = code_match.group(1)
+            # Extract name after the code
+            name_match = re.search(r'50\.\d+\s+(.+)', title_text)
+            if name_match:
+                course_data['course_name'] = name_match.group(1).strip()
+    
+    # Use provided course code as fallback
+    if not course_data.get('course_code') and course_code:
+        course_data['course_code'] = course_code
+    
+    # Extract detailed description
+    desc_selectors = [
+        'div.course-description',
+        'div.description', 
+        'div.content',
+        'section.description',
+        'div.course-content'
+    ]
+    
+    description = ""
+    for selector in desc_selectors:
+        desc_elem = soup.select_one(selector)
+        if desc_elem:
+            description = desc_elem.get_text(strip=True)
+            break
+    
+    # Fallback: look for paragraphs with substantial content
+    if not description:
+        content_divs = soup.find_all(['div', 'section', 'article'])
+        for div in content_divs:
+            paragraphs = div.find_all('p')
+            if len(paragraphs) >= 2:  # Section with multiple paragraphs likely contains description
+                full_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+                if len(full_text) > 100:  # Substantial content
+                    description = full_text
+                    break
+    
+    course_data['description'] = description
+    
+    # Extract professor/instructor
+    prof_patterns = [
+        soup.find(text=re.compile(r'Instructor:|Professor:|Faculty:')),
+        soup.find(class_=re.compile(r'instructor|professor|faculty', re.I)),
+        soup.find('dt', string=re.compile(r'Instructor|Professor|Faculty'))
+    ]
+    
+    for pattern in prof_patterns:
+        if pattern:
+            if hasattr(pattern, 'find_next'):
+                prof_elem = pattern.find_next(['dd', 'span', 'div', 'p'])
+            else:
+                prof_elem = pattern.parent.find_next(['span', 'div', 'p'])
+            
+            if prof_elem:
+                prof_text = prof_elem.get_text(strip=True)
+                # Extract actual name (skip labels)
+                prof_match = re.search(r'([A-Z][a-z]+\s+[A-Z][a-z]+)', prof_text)
+                if prof_match:
+                    course_data['professor'] = prof_match.group(1)
+                    break
+    
+    # Extract prerequisites
+    prereq_patterns = [
+        soup.find(text=re.compile(r'Prerequisites?:')),
+        soup.find(class_=re.compile(r'prerequisite', re.I)),
+        soup.find(['dt', 'strong', 'b'], string=re.compile(r'Prerequisites?', re.I))
+    ]
+    
+    for pattern in prereq_patterns:
+        if pattern:
+            if hasattr(pattern, 'find_next'):
+                prereq_elem = pattern.find_next(['dd', 'div', 'p', 'ul'])
+            else:
+                prereq_elem = pattern.parent.find_next(['div', 'p', 'ul'])
+            
+            if prereq_elem:
+                course_data['prerequisites'] = prereq_elem.get_text(strip=True)
+                break
+    
+    # Extract credits
+    credits_patterns = [
+        soup.find(text=re.compile(r'Credits?:')),
+        soup.find(text=re.compile(r'\d+\s+credits?')),
+        soup.find(class_=re.compile(r'credits?', re.I))
+    ]
+    
+    for pattern in credits_patterns:
+        if pattern:
+            credits_text = pattern if isinstance(pattern, str) else pattern.get_text()
+            credits_match = re.search(r'(\d+)\s*credits?', credits_text, re.I)
+            if credits_match:
+                course_data['credits'] = int(credits_match.group(1))
+                break
+    
+    # Extract terms offered
+    term_patterns = [
+        soup.find(text=re.compile(r'Terms?:')),
+        soup.find(text=re.compile(r'Term \d+')),
+        soup.find(class_=re.compile(r'terms?', re.I))
+    ]
+    
+    for pattern in term_patterns:
+        if pattern:
+            term_text = pattern if isinstance(pattern, str) else pattern.get_text()
+            # Extract term numbers
+            term_matches = re.findall(r'Term \d+', term_text)
+            if term_matches:
+                course_data['terms_offered'] = ', '.join(term_matches)
+                break
+    
+    # Extract learning outcomes
+    outcomes_patterns = [
+        soup.find(text=re.compile(r'Learning Outcomes?:')),
+        soup.find(text=re.compile(r'Course Objectives?:')),
+        soup.find(class_=re.compile(r'outcomes?|objectives?', re.I))
+    ]
+    
+    for pattern in outcomes_patterns:
+        if pattern:
+            if hasattr(pattern, 'find_next'):
+                outcomes_elem = pattern.find_next(['ul', 'ol', 'div', 'p'])
+            else:
+                outcomes_elem = pattern.parent.find_next(['ul', 'ol', 'div', 'p'])
+            
+            if outcomes_elem:
+                course_data['learning_outcomes'] = outcomes_elem.get_text(strip=True)
+                break
+    
+    # Extract assessment methods
+    assessment_patterns = [
+        soup.find(text=re.compile(r'Assessment:')),
+        soup.find(text=re.compile(r'Grading:')),
+        soup.find(class_=re.compile(r'assessment|grading', re.I))
+    ]
+    
+    for pattern in assessment_patterns:
+        if pattern:
+            if hasattr(pattern, 'find_next'):
+                assess_elem = pattern.find_next(['div', 'p', 'ul'])
+            else:
+                assess_elem = pattern.parent.find_next(['div', 'p', 'ul'])
+            
+            if assess_elem:
+                course_data['assessment'] = assess_elem.get_text(strip=True)
+                break
+    course_data['detail_url'] = url
+    course_data['scraped_from_detail_page'] = True
+    return course_data
+
+
+def cached_pages(cache_dir: str) -> List[Tuple[str, bytes]]:
+    index_path = os.path.join(cache_dir, "index.sqlite")
+    if not os.path.exists(index_path):
+        return []
+    db = sqlite3.connect(index_path)
+    rows = db.execute("SELECT url, blob FROM entries WHERE url LIKE '%/course/%'").fetchall()
+    db.close()
+    pages = []
+    for url, digest in rows:
+        path = os.path.join(cache_dir, "blobs", digest[:2], digest)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                pages.append((url, f.read()))
+    return pages
+
+
+def synthetic_pages(n: int, seed: int = 7) -> List[Tuple[str, bytes]]:
+    rng = random.Random(seed)
+    words = "data systems design analysis learning network security software computing theory".split()
+    nav = "".join(f'<li class="menu-item"><a href="/page/{i}">Link {i}</a></li>' for i in range(120))
+    footer = "".join(f"<p class='footer-note'>Footer paragraph {i} about the university.</p>" for i in range(40))
+    pages = []
+    for i in range(n):
+        code = f"50.{i % 1000:03d}"
+        para = lambda k: " ".join(rng.choice(words) for _ in range(k)).capitalize() + "."
+        blocks = [f"<h1>{code} {para(3)}</h1>"]
+        style = i % 4
+        if style == 0:
+            blocks.append(f'<div class="course-description"><p>{para(40)}</p></div>')
+            blocks.append(f"<dl><dt>Instructor</dt><dd>Prof Alice Tan</dd>"
+                          f"<dt>Prerequisites</dt><dd>{code} {para(4)}</dd></dl>")
+            blocks.append(f"<p>Credits: {rng.choice([12, 8, 4])} credits</p><p>Terms: Term 4, Term {rng.randint(5, 8)}</p>")
+        elif style == 1:
+            blocks.append(f"<section><p>{para(30)}</p><p>{para(30)}</p></section>")
+            blocks.append(f'<div class="faculty-list"><span>Bob Lim</span></div>')
+            blocks.append(f"<strong>Prerequisite</strong><p>{para(6)}</p>")
+            blocks.append(f"<div class='credits'>{rng.choice([12, 8])} Credits</div>")
+        elif style == 2:
+            blocks.append(f"<article><p>{para(20)}</p><p>{para(25)}</p></article>")
+            blocks.append(f"<p>Learning Outcomes:</p><ul><li>{para(8)}</li><li>{para(8)}</li></ul>")
+            blocks.append(f"<p>Assessment:</p><div>{para(10)}</div>")
+            blocks.append(f"<span class='term-info'>Offered in Term {rng.randint(1, 8)}</span>")
+        else:
+            blocks.append(f"<div class='content'>{para(50)}</div>")
+            blocks.append(f"<p>Course Objectives:</p><ol><li>{para(6)}</li></ol>")
+            blocks.append(f"<p>Grading:</p><p>{para(6)}</p>")
+            blocks.append(f"<div class='assessment-breakdown'><p>{para(5)}</p></div>")
+        html = (f"<html><head><script>var x = '{para(20)}';</script><style>.a{{color:red}}</style></head>"
+                f"<body><nav><ul>{nav}</ul></nav><main>{''.join(blocks)}</main><footer>{footer}</footer></body></html>")
+        pages.append((f"https://www.sutd.edu.sg/course/{code.replace('.', '-')}-synthetic", html.encode("utf-8")))
+    return pages
+
+
+def encoded_pages() -> List[Tuple[str, bytes]]:
+    """Non-UTF-8 detail pages: a declared windows-1252 page, one with no charset,
+    and one declaring a charset Python does not know (used to abort the lxml backend)"""
+    body = ("<h1>50.777 Café Systems – Naïve Design</h1>"
+            "<div class='course-description'><p>Résumé-driven design, façades and “smart” quotes.</p></div>"
+            "<dl><dt>Instructor</dt><dd>Prof Alice Tan</dd></dl><p>Credits: 12 credits</p>")
+    pages = []
+    for label, head in (("declared", '<meta charset="windows-1252">'),
+                        ("undeclared", ""),
+                        ("unknown", '<meta charset="x-mac-latin2-unknown">')):
+        html = f"<html><head>{head}</head><body><main>{body}</main></body></html>"
+        pages.append((f"https://www.sutd.edu.sg/course/50-777-{label}", html.encode("cp1252")))
+    return pages
+
+
+def course_code_from_url(url: str):
+    m = re.search(r'/course/(\d+-\d+)', url)
+    return m.group(1).replace('-', '.') if m else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the course detail-page extractor")
+    parser.add_argument("--cache-dir", default=".http_cache")
+    parser.add_argument("--synthetic", type=int, default=200, help="Synthetic pages to use when the cache is empty")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--region", default="main", help="Content region for the restricted backends")
+    args = parser.parse_args()
+
+    pages = cached_pages(args.cache_dir)
+    source = f"cache {args.cache_dir}"
+    if not pages:
+        pages = synthetic_pages(args.synthetic)
+        source = "synthetic"
+    soups = [(url, BeautifulSoup(body, "lxml")) for url, body in pages]
+    print(f"{len(soups)} detail pages ({source})")
+
+    scraper = SUTDCourseScraper(cache_dir=None)
+    mismatches = 0
+    for url, soup in soups:
+        code = course_code_from_url(url)
+        old = legacy_parse(soup, url, code)
+        new = scraper.parse_course_detail_page(soup, url, code)
+        if old != new:
+            mismatches += 1
+            if mismatches <= 5:
+                diff = {k: (old.get(k), new.get(k)) for k in set(old) | set(new) if old.get(k) != new.get(k)}
+                print(f"  mismatch {url}: {diff}")
+    print(f"  field-for-field mismatches: {mismatches}")
+
+    for name, fn in (("find() per field", legacy_parse), ("one-pass index", scraper.parse_course_detail_page)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for url, soup in soups:
+                fn(soup, url, course_code_from_url(url))
+        per_page = (time.perf_counter() - start) / (args.repeat * len(soups))
+        print(f"  {name:<17} {per_page * 1000:7.2f} ms/page")
+
+    print("non-UTF-8 pages (every backend must agree with BeautifulSoup):")
+    failures = 0
+    for url, body in encoded_pages():
+        want = legacy_parse(BeautifulSoup(body, "lxml"), url, course_code_from_url(url))
+        for backend in sorted(DETAIL_PARSERS):
+            try:
+                got = scraper.extract_course_detail(DETAIL_PARSERS[backend]().parse(body), url, course_code_from_url(url))
+            except Exception as e:
+                got = {"error": repr(e)}
+            if got != want:
+                failures += 1
+                print(f"  {backend:<6} {url}: {got} != {want}")
+    print(f"  encoding mismatches: {failures}")
+
+    print("parser backends (parse + extract from raw bytes):")
+    expected = {url: legacy_parse(soup, url, course_code_from_url(url)) for url, soup in soups}
+    for backend in sorted(DETAIL_PARSERS):
+        for region in (None, args.region):
+            detail_parser = DETAIL_PARSERS[backend](region=region)
+            label = f"{backend}{' region=' + region if region else ''}"
+            differ = sum(
+                1 for url, body in pages
+                if scraper.extract_course_detail(detail_parser.parse(body), url, course_code_from_url(url)) != expected[url]
+            )
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for url, body in pages:
+                    scraper.extract_course_detail(detail_parser.parse(body), url, course_code_from_url(url))
+            per_page = (time.perf_counter() - start) / (args.repeat * len(pages))
+            peak = 0
+            for url, body in pages[:20]:
+                tracemalloc.start()
+                scraper.extract_course_detail(detail_parser.parse(body), url, course_code_from_url(url))
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            print(f"  {label:<22} {per_page * 1000:7.2f} ms/page  peak {peak / 1024:7.0f} KiB  mismatches {differ}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,25 +22,43 @@ Features:
 - Data completeness tracking
 - Export to JSON and CSV formats
 - Comprehensive error handling and logging
-- Respectful scraping with delays
+- Respectful scraping with per-host rate limiting
 
 Usage:
-    python courses.py
+    python courses.py                 # fetch, caching raw pages under .http_cache/
+    python courses.py --offline       # replay cached pages only (no network)
+    python courses.py --no-cache      # always hit the network
+    python courses.py --resume        # continue an interrupted run from its checkpoint
+    python courses.py --content-region main   # only parse <main> of detail pages
+    python courses.py --parser soup   # BeautifulSoup detail parser instead of direct lxml
 
 Output:
     - sutd_courses_TIMESTAMP.json: Detailed course data in JSON format
     - sutd_courses_TIMESTAMP.csv: Course data in CSV format for analysis
 """
 
+import argparse
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+from bs4.dammit import EncodingDetector
+from lxml import etree
 import json
+import os
 import pandas as pd
+import sys
 import time
 import re
 from typing import List, Dict, Optional
 from urllib.parse import urljoin, urlparse
 import logging
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared scraping helpers (pooled HTTP client, rate limiting) live alongside the LinkedIn scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from checkpoint import CheckpointJournal
+from http_cache import ResponseCache
+from http_client import HttpClient
 
 # Configure logging
 logging.basicConfig(
@@ -49,34 +67,467 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Detail-page patterns, compiled once
+_COURSE_CODE_RE = re.compile(r'50\.\d+')
+_COURSE_CODE_GROUP_RE = re.compile(r'(50\.\d+)')
+_COURSE_NAME_RE = re.compile(r'50\.\d+\s+(.+)')
+_PERSON_NAME_RE = re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+)')
+_CREDITS_VALUE_RE = re.compile(r'(\d+)\s*credits?', re.I)
+_TERM_VALUE_RE = re.compile(r'Term \d+')
+
+_DESCRIPTION_SELECTORS = [
+    ('div', 'course-description'),
+    ('div', 'description'),
+    ('div', 'content'),
+    ('section', 'description'),
+    ('div', 'course-content'),
+]
+
+# Per field, the lookups tried in priority order. Each is one of:
+#   ('text', regex)              first text node matching regex
+#   ('class', regex)             first tag whose class matches regex
+#   ('label', tag_names, regex)  first tag of those names whose .string matches regex
+_DETAIL_FIELD_LOOKUPS = {
+    'professor': [
+        ('text', re.compile(r'Instructor:|Professor:|Faculty:')),
+        ('class', re.compile(r'instructor|professor|faculty', re.I)),
+        ('label', ('dt',), re.compile(r'Instructor|Professor|Faculty')),
+    ],
+    'prerequisites': [
+        ('text', re.compile(r'Prerequisites?:')),
+        ('class', re.compile(r'prerequisite', re.I)),
+        ('label', ('dt', 'strong', 'b'), re.compile(r'Prerequisites?', re.I)),
+    ],
+    'credits': [
+        ('text', re.compile(r'Credits?:')),
+        ('text', re.compile(r'\d+\s+credits?')),
+        ('class', re.compile(r'credits?', re.I)),
+    ],
+    'terms': [
+        ('text', re.compile(r'Terms?:')),
+        ('text', re.compile(r'Term \d+')),
+        ('class', re.compile(r'terms?', re.I)),
+    ],
+    'learning_outcomes': [
+        ('text', re.compile(r'Learning Outcomes?:')),
+        ('text', re.compile(r'Course Objectives?:')),
+        ('class', re.compile(r'outcomes?|objectives?', re.I)),
+    ],
+    'assessment': [
+        ('text', re.compile(r'Assessment:')),
+        ('text', re.compile(r'Grading:')),
+        ('class', re.compile(r'assessment|grading', re.I)),
+    ],
+}
+_DETAIL_LOOKUPS = [lookup for lookups in _DETAIL_FIELD_LOOKUPS.values() for lookup in lookups]
+
+
+class DetailPageIndex:
+    """One walk over a parsed page, indexing everything the detail extractor asks for.
+    
+    Records every node's document position (and each tag's subtree end), tags
+    by name and by class token, and the first node satisfying each lookup in
+    _DETAIL_FIELD_LOOKUPS. Lookups then answer from the index instead of
+    re-searching the tree, with the same first-match-in-document-order
+    semantics as BeautifulSoup's find()/find_next().
+    """
+    
+    def __init__(self, soup: BeautifulSoup):
+        self.position: Dict[int, int] = {}
+        self.end: Dict[int, int] = {}
+        self.by_name: Dict[str, List] = {}
+        self.by_class: Dict[str, List] = {}
+        self.first: Dict[int, object] = {}
+        self._walk(soup)
+        self._name_positions = {
+            name: [self.position[id(t)] for t in tags] for name, tags in self.by_name.items()
+        }
+    
+    def _walk(self, soup: BeautifulSoup) -> None:
+        pending = list(enumerate(_DETAIL_LOOKUPS))
+        pos = 0
+        stack = [(child, False) for child in reversed(soup.contents)]
+        while stack:
+            node, leaving = stack.pop()
+            if leaving:
+                self.end[id(node)] = pos - 1
+                continue
+            self.position[id(node)] = pos
+            pos += 1
+            is_tag = isinstance(node, Tag)
+            if is_tag:
+                self.by_name.setdefault(node.name, []).append(node)
+                classes = node.get('class') or []
+                for c in classes:
+                    self.by_class.setdefault(c, []).append(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.contents))
+            if not pending:
+                continue
+            still_pending = []
+            for i, lookup in pending:
+                if self._satisfies(node, is_tag, lookup):
+                    self.first[i] = node
+                else:
+                    still_pending.append((i, lookup))
+            pending = still_pending
+    
+    @staticmethod
+    def _satisfies(node, is_tag: bool, lookup) -> bool:
+        kind = lookup[0]
+        if kind == 'text':
+            return not is_tag and isinstance(node, NavigableString) and lookup[1].search(node) is not None
+        if not is_tag:
+            return False
+        if kind == 'class':
+            classes = node.get('class')
+            if not classes:
+                return False
+            if isinstance(classes, str):
+                classes = [classes]
+            regex = lookup[1]
+            return any(regex.search(c) for c in classes) or regex.search(' '.join(classes)) is not None
+        if node.name not in lookup[1]:
+            return False
+        text = node.string
+        return text is not None and lookup[2].search(text) is not None
+    
+    def candidates(self, field: str) -> List:
+        """First match of each lookup for a field, in priority order (misses skipped)"""
+        offset = 0
+        for name, lookups in _DETAIL_FIELD_LOOKUPS.items():
+            if name == field:
+                found = [self.first.get(offset + i) for i in range(len(lookups))]
+                return [node for node in found if node is not None]
+            offset += len(lookups)
+        raise KeyError(field)
+    
+    def first_tag(self, name: str):
+        tags = self.by_name.get(name)
+        return tags[0] if tags else None
+    
+    def tags_named(self, names) -> List:
+        tags = [t for name in names for t in self.by_name.get(name, [])]
+        tags.sort(key=lambda t: self.position[id(t)])
+        return tags
+    
+    def first_tag_with_string(self, names, regex):
+        for tag in self.tags_named(names):
+            text = tag.string
+            if text is not None and regex.search(text):
+                return tag
+        return None
+    
+    def first_with_class(self, name: str, class_name: str):
+        for tag in self.by_class.get(class_name, []):
+            if tag.name == name:
+                return tag
+        return None
+    
+    def descendants_named(self, tag, name: str) -> List:
+        """Descendant tags of a given name, from the subtree's position range"""
+        positions = self._name_positions.get(name)
+        if not positions:
+            return []
+        lo = bisect_right(positions, self.position[id(tag)])
+        hi = bisect_right(positions, self.end[id(tag)])
+        return self.by_name[name][lo:hi]
+    
+    def find_next(self, node, names):
+        """First tag with one of `names` after `node` in document order (like PageElement.find_next)"""
+        pos = self.position[id(node)]
+        best = None
+        best_pos = None
+        for name in names:
+            positions = self._name_positions.get(name)
+            if not positions:
+                continue
+            i = bisect_right(positions, pos)
+            if i < len(positions) and (best_pos is None or positions[i] < best_pos):
+                best_pos = positions[i]
+                best = self.by_name[name][i]
+        return best
+    
+    def text(self, tag, strip: bool = False) -> str:
+        return tag.get_text(strip=strip)
+
+
+# BeautifulSoup (html builders) types the strings inside these tags specially and
+# leaves them out of an ancestor's get_text(); it also collapses whitespace-only
+# strings to ' ' or '\n' except inside whitespace-preserving tags
+_STRING_CONTAINER_TAGS = frozenset({'rt', 'rp', 'style', 'script', 'template'})
+_PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+class _TextNode(str):
+    """A text run of an lxml tree; `kind` mirrors the NavigableString subclass bs4 would use"""
+    kind = 'text'
+
+
+class LxmlDetailPageIndex(DetailPageIndex):
+    """DetailPageIndex over an lxml tree, without building BeautifulSoup objects.
+    
+    lxml keeps text in element .text/.tail; the walk turns those (and comments)
+    into string nodes typed and whitespace-collapsed the way BeautifulSoup's
+    lxml builder would, so positions, .string and get_text() -- and with them
+    every extracted field -- come out identical to the BeautifulSoup path.
+    """
+    
+    def __init__(self, roots: List):
+        self.children: Dict[int, List] = {}
+        self.strings: List[_TextNode] = []
+        self._context: Dict[int, tuple] = {}
+        super().__init__(roots)
+        self.strings.sort(key=lambda s: self.position[id(s)])
+        self._string_positions = [self.position[id(s)] for s in self.strings]
+    
+    def _new_string(self, value: str, kind: str, container: Optional[str], preserve: bool) -> _TextNode:
+        if not preserve and not value.strip(_ASCII_SPACES):
+            value = '\n' if '\n' in value else ' '
+        node = _TextNode(value)
+        node.kind = container if kind == 'text' and container else kind
+        self.strings.append(node)
+        return node
+    
+    def _contents(self, el) -> List:
+        """Children of `el` as bs4 would list them: tags and string nodes interleaved"""
+        contents = self.children.get(id(el))
+        if contents is not None:
+            return contents
+        container, preserve = self._context.get(id(el), (None, False))
+        if el.tag in _STRING_CONTAINER_TAGS:
+            container = el.tag
+        preserve = preserve or el.tag in _PRESERVE_WHITESPACE_TAGS
+        contents = []
+        if el.text:
+            contents.append(self._new_string(el.text, 'text', container, preserve))
+        for child in el:
+            tag = child.tag
+            if isinstance(tag, str):
+                self._context[id(child)] = (container, preserve)
+                contents.append(child)
+            elif tag is etree.Comment:
+                contents.append(self._new_string(child.text or '', 'comment', container, preserve))
+            elif tag is etree.PI:
+                contents.append(self._new_string(f"{child.target} {child.text or ''}", 'pi', container, preserve))
+            if child.tail:
+                contents.append(self._new_string(child.tail, 'text', container, preserve))
+        self.children[id(el)] = contents
+        return contents
+    
+    def _walk(self, roots: List) -> None:
+        pending = list(enumerate(_DETAIL_LOOKUPS))
+        pos = 0
+        top = []
+        for root in roots:
+            if isinstance(root.tag, str):
+                top.append(root)
+            elif root.tag is etree.Comment:
+                top.append(self._new_string(root.text or '', 'comment', None, False))
+        stack = [(node, False) for node in reversed(top)]
+        while stack:
+            node, leaving = stack.pop()
+            if leaving:
+                self.end[id(node)] = pos - 1
+                continue
+            self.position[id(node)] = pos
+            pos += 1
+            is_tag = not isinstance(node, _TextNode)
+            if is_tag:
+                self.by_name.setdefault(node.tag, []).append(node)
+                for c in (node.get('class') or '').split():
+                    self.by_class.setdefault(c, []).append(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(self._contents(node)))
+            if not pending:
+                continue
+            still_pending = []
+            for i, lookup in pending:
+                if self._satisfies(node, is_tag, lookup):
+                    self.first[i] = node
+                else:
+                    still_pending.append((i, lookup))
+            pending = still_pending
+    
+    def _satisfies(self, node, is_tag: bool, lookup) -> bool:
+        kind = lookup[0]
+        if kind == 'text':
+            return not is_tag and lookup[1].search(node) is not None
+        if not is_tag:
+            return False
+        if kind == 'class':
+            classes = (node.get('class') or '').split()
+            if not classes:
+                return False
+            regex = lookup[1]
+            return any(regex.search(c) for c in classes) or regex.search(' '.join(classes)) is not None
+        if node.tag not in lookup[1]:
+            return False
+        text = self.string(node)
+        return text is not None and lookup[2].search(text) is not None
+    
+    def string(self, tag) -> Optional[str]:
+        """Equivalent of Tag.string: the only child string, recursing through single children"""
+        while True:
+            contents = self._contents(tag)
+            if len(contents) != 1:
+                return None
+            tag = contents[0]
+            if isinstance(tag, _TextNode):
+                return tag
+    
+    def first_tag_with_string(self, names, regex):
+        for tag in self.tags_named(names):
+            text = self.string(tag)
+            if text is not None and regex.search(text):
+                return tag
+        return None
+    
+    def first_with_class(self, name: str, class_name: str):
+        for tag in self.by_class.get(class_name, []):
+            if tag.tag == name:
+                return tag
+        return None
+    
+    def text(self, tag, strip: bool = False) -> str:
+        """Equivalent of Tag.get_text(strip=strip) from the string positions inside the subtree"""
+        wanted = tag.tag if tag.tag in _STRING_CONTAINER_TAGS else 'text'
+        lo = bisect_right(self._string_positions, self.position[id(tag)])
+        hi = bisect_right(self._string_positions, self.end[id(tag)])
+        parts = []
+        for s in self.strings[lo:hi]:
+            if s.kind != wanted:
+                continue
+            if strip:
+                s = s.strip()
+                if not s:
+                    continue
+            parts.append(s)
+        return ''.join(parts)
+
+
+def _parse_region(region: str):
+    """'main', 'div.content', 'div#main', '.content' -> (tag name or None, class or None, id or None)"""
+    m = re.fullmatch(r'([A-Za-z][\w-]*)?(?:\.([\w-]+))?(?:#([\w-]+))?', region.strip())
+    if not m or not any(m.groups()):
+        raise ValueError(f"Unsupported content region {region!r}; use tag, tag.class or tag#id")
+    return m.group(1), m.group(2), m.group(3)
+
+
+class SoupDetailParser:
+    """BeautifulSoup backend. With a region, a SoupStrainer keeps only that element's subtree."""
+    
+    name = 'soup'
+    
+    def __init__(self, region: Optional[str] = None, features: str = 'lxml'):
+        self.features = features
+        self.strainer = None
+        if region:
+            tag, class_name, id_ = _parse_region(region)
+            attrs = {}
+            if class_name:
+                attrs['class'] = class_name
+            if id_:
+                attrs['id'] = id_
+            self.strainer = SoupStrainer(tag, attrs)
+    
+    def parse(self, content: bytes) -> DetailPageIndex:
+        return DetailPageIndex(BeautifulSoup(content, self.features, parse_only=self.strainer))
+
+
+class LxmlDetailParser:
+    """Direct lxml backend: libxml2's tree is indexed as-is; a region is selected with XPath."""
+    
+    name = 'lxml'
+    
+    def __init__(self, region: Optional[str] = None):
+        self.region_xpath = None
+        if region:
+            tag, class_name, id_ = _parse_region(region)
+            conds = []
+            if class_name:
+                conds.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')")
+            if id_:
+                conds.append(f"@id = '{id_}'")
+            step = (tag or '*') + ''.join(f'[{c}]' for c in conds)
+            # Outermost matches only, like a SoupStrainer
+            self.region_xpath = etree.XPath(f"//{step}[not(ancestor::{step})]")
+    
+    def parse(self, content: bytes) -> LxmlDetailPageIndex:
+        return LxmlDetailPageIndex(self._roots(self._parse_tree(content)))
+    
+    @staticmethod
+    def _parse_tree(content: bytes):
+        # Same encoding candidates, in the same order, as bs4's lxml builder
+        detector = EncodingDetector(content, is_html=True)
+        for encoding in detector.encodings:
+            try:
+                # Unknown declared charsets raise LookupError here, before any feeding
+                parser = etree.HTMLParser(recover=True, encoding=encoding)
+                parser.feed(detector.markup)
+                return parser.close()
+            except (UnicodeDecodeError, LookupError, etree.ParserError):
+                continue
+            except etree.XMLSyntaxError:
+                return None
+        return None
+    
+    def _roots(self, root) -> List:
+        if root is None:
+            return []
+        if self.region_xpath is not None:
+            return self.region_xpath(root)
+        return list(reversed(list(root.itersiblings(preceding=True)))) + [root] + list(root.itersiblings())
+
+
+DETAIL_PARSERS = {'lxml': LxmlDetailParser, 'soup': SoupDetailParser}
+
+
 class SUTDCourseScraper:
     """Scraper for SUTD ISTD course information"""
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 10, cache_dir: Optional[str] = '.http_cache',
+                 cache_ttl: float = 7 * 24 * 3600, offline: bool = False,
+                 checkpoint_path: Optional[str] = None, resume: bool = False,
+                 max_workers: int = 4, parser_backend: str = 'lxml',
+                 content_region: Optional[str] = None):
         self.base_url = "https://www.sutd.edu.sg"
         self.courses_url = "https://www.sutd.edu.sg/course/10-013-modelling-and-analysis/"
         self.course_detail_base_url = "https://www.sutd.edu.sg/course/"
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Raw pages are cached on disk and revalidated with conditional GETs
+        cache = ResponseCache(cache_dir, ttl=cache_ttl, offline=offline) if cache_dir else None
+        # Keep-alive pool with retries; per-host rate limiting replaces fixed sleeps
+        self.http = HttpClient(pool_size=max(pool_size, max_workers), cache=cache, headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        self.session = self.http.session
+        # Finished listing/detail pages are journaled so an interrupted run can resume
+        self.journal = CheckpointJournal(checkpoint_path, resume=resume) if checkpoint_path else None
+        self.max_workers = max(1, max_workers)
+        # Detail pages (the bulk of the work) go through a pluggable parser backend;
+        # listing and curriculum pages always get a full BeautifulSoup tree
+        self.detail_parser = DETAIL_PARSERS[parser_backend](region=content_region)
         self.courses_data = []
         
-    def get_page(self, url: str, params: Optional[Dict] = None) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page"""
+    def fetch_page(self, url: str, params: Optional[Dict] = None) -> Optional[bytes]:
+        """Fetch a web page's raw body"""
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30)
             response.raise_for_status()
-            
-            # Add delay to be respectful to the server
-            time.sleep(1)
-            
-            return BeautifulSoup(response.content, 'lxml')
+            return response.content
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
+    def get_page(self, url: str, params: Optional[Dict] = None) -> Optional[BeautifulSoup]:
+        """Fetch and parse a web page"""
+        content = self.fetch_page(url, params)
+        if content is None:
+            return None
+        return BeautifulSoup(content, 'lxml')
+    
     def extract_course_details(self, course_element) -> Optional[Dict]:
         """Extract detailed information from a course element"""
         try:
@@ -279,175 +730,136 @@ class SUTDCourseScraper:
     
     def scrape_course_detail_page(self, url: str, course_code: str = None) -> Optional[Dict]:
         """Scrape detailed information from individual course page"""
-        soup = self.get_page(url)
-        if not soup:
+        content = self.fetch_page(url)
+        if content is None:
             return None
         
         try:
-            course_data = {}
-            
-            # Extract course code and title from page
-            title_elem = soup.find('h1') or soup.find(['h2', 'h3'], string=re.compile(r'50\.\d+'))
-            if title_elem:
-                title_text = title_elem.get_text(strip=True)
-                code_match = re.search(r'(50\.\d+)', title_text)
-                if code_match:
-                    course_data['course_code'] = code_match.group(1)
-                    # Extract name after the code
-                    name_match = re.search(r'50\.\d+\s+(.+)', title_text)
-                    if name_match:
-                        course_data['course_name'] = name_match.group(1).strip()
-            
-            # Use provided course code as fallback
-            if not course_data.get('course_code') and course_code:
-                course_data['course_code'] = course_code
-            
-            # Extract detailed description
-            desc_selectors = [
-                'div.course-description',
-                'div.description', 
-                'div.content',
-                'section.description',
-                'div.course-content'
-            ]
-            
-            description = ""
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    description = desc_elem.get_text(strip=True)
-                    break
-            
-            # Fallback: look for paragraphs with substantial content
-            if not description:
-                content_divs = soup.find_all(['div', 'section', 'article'])
-                for div in content_divs:
-                    paragraphs = div.find_all('p')
-                    if len(paragraphs) >= 2:  # Section with multiple paragraphs likely contains description
-                        full_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-                        if len(full_text) > 100:  # Substantial content
-                            description = full_text
-                            break
-            
-            course_data['description'] = description
-            
-            # Extract professor/instructor
-            prof_patterns = [
-                soup.find(text=re.compile(r'Instructor:|Professor:|Faculty:')),
-                soup.find(class_=re.compile(r'instructor|professor|faculty', re.I)),
-                soup.find('dt', string=re.compile(r'Instructor|Professor|Faculty'))
-            ]
-            
-            for pattern in prof_patterns:
-                if pattern:
-                    if hasattr(pattern, 'find_next'):
-                        prof_elem = pattern.find_next(['dd', 'span', 'div', 'p'])
-                    else:
-                        prof_elem = pattern.parent.find_next(['span', 'div', 'p'])
-                    
-                    if prof_elem:
-                        prof_text = prof_elem.get_text(strip=True)
-                        # Extract actual name (skip labels)
-                        prof_match = re.search(r'([A-Z][a-z]+\s+[A-Z][a-z]+)', prof_text)
-                        if prof_match:
-                            course_data['professor'] = prof_match.group(1)
-                            break
-            
-            # Extract prerequisites
-            prereq_patterns = [
-                soup.find(text=re.compile(r'Prerequisites?:')),
-                soup.find(class_=re.compile(r'prerequisite', re.I)),
-                soup.find(['dt', 'strong', 'b'], string=re.compile(r'Prerequisites?', re.I))
-            ]
-            
-            for pattern in prereq_patterns:
-                if pattern:
-                    if hasattr(pattern, 'find_next'):
-                        prereq_elem = pattern.find_next(['dd', 'div', 'p', 'ul'])
-                    else:
-                        prereq_elem = pattern.parent.find_next(['div', 'p', 'ul'])
-                    
-                    if prereq_elem:
-                        course_data['prerequisites'] = prereq_elem.get_text(strip=True)
-                        break
-            
-            # Extract credits
-            credits_patterns = [
-                soup.find(text=re.compile(r'Credits?:')),
-                soup.find(text=re.compile(r'\d+\s+credits?')),
-                soup.find(class_=re.compile(r'credits?', re.I))
-            ]
-            
-            for pattern in credits_patterns:
-                if pattern:
-                    credits_text = pattern if isinstance(pattern, str) else pattern.get_text()
-                    credits_match = re.search(r'(\d+)\s*credits?', credits_text, re.I)
-                    if credits_match:
-                        course_data['credits'] = int(credits_match.group(1))
-                        break
-            
-            # Extract terms offered
-            term_patterns = [
-                soup.find(text=re.compile(r'Terms?:')),
-                soup.find(text=re.compile(r'Term \d+')),
-                soup.find(class_=re.compile(r'terms?', re.I))
-            ]
-            
-            for pattern in term_patterns:
-                if pattern:
-                    term_text = pattern if isinstance(pattern, str) else pattern.get_text()
-                    # Extract term numbers
-                    term_matches = re.findall(r'Term \d+', term_text)
-                    if term_matches:
-                        course_data['terms_offered'] = ', '.join(term_matches)
-                        break
-            
-            # Extract learning outcomes
-            outcomes_patterns = [
-                soup.find(text=re.compile(r'Learning Outcomes?:')),
-                soup.find(text=re.compile(r'Course Objectives?:')),
-                soup.find(class_=re.compile(r'outcomes?|objectives?', re.I))
-            ]
-            
-            for pattern in outcomes_patterns:
-                if pattern:
-                    if hasattr(pattern, 'find_next'):
-                        outcomes_elem = pattern.find_next(['ul', 'ol', 'div', 'p'])
-                    else:
-                        outcomes_elem = pattern.parent.find_next(['ul', 'ol', 'div', 'p'])
-                    
-                    if outcomes_elem:
-                        course_data['learning_outcomes'] = outcomes_elem.get_text(strip=True)
-                        break
-            
-            # Extract assessment methods
-            assessment_patterns = [
-                soup.find(text=re.compile(r'Assessment:')),
-                soup.find(text=re.compile(r'Grading:')),
-                soup.find(class_=re.compile(r'assessment|grading', re.I))
-            ]
-            
-            for pattern in assessment_patterns:
-                if pattern:
-                    if hasattr(pattern, 'find_next'):
-                        assess_elem = pattern.find_next(['div', 'p', 'ul'])
-                    else:
-                        assess_elem = pattern.parent.find_next(['div', 'p', 'ul'])
-                    
-                    if assess_elem:
-                        course_data['assessment'] = assess_elem.get_text(strip=True)
-                        break
-            
-            # Add source URL
-            course_data['detail_url'] = url
-            course_data['scraped_from_detail_page'] = True
-            
-            return course_data
-            
+            index = self.detail_parser.parse(content)
+            return self.extract_course_detail(index, url, course_code)
         except Exception as e:
             logger.error(f"Error scraping course detail page {url}: {e}")
             return None
     
+    def parse_course_detail_page(self, soup: BeautifulSoup, url: str, course_code: str = None) -> Dict:
+        """Extract course fields from a parsed detail page using a one-pass DOM index"""
+        return self.extract_course_detail(DetailPageIndex(soup), url, course_code)
+    
+    def extract_course_detail(self, index: DetailPageIndex, url: str, course_code: str = None) -> Dict:
+        """Extract course fields from a detail page index (either parser backend)"""
+        course_data = {}
+        
+        # Extract course code and title from page
+        title_elem = index.first_tag('h1')
+        if title_elem is None:
+            title_elem = index.first_tag_with_string(('h2', 'h3'), _COURSE_CODE_RE)
+        if title_elem is not None:
+            title_text = index.text(title_elem, strip=True)
+            code_match = _COURSE_CODE_GROUP_RE.search(title_text)
+            if code_match:
+                course_data['course_code'] = code_match.group(1)
+                # Extract name after the code
+                name_match = _COURSE_NAME_RE.search(title_text)
+                if name_match:
+                    course_data['course_name'] = name_match.group(1).strip()
+        
+        # Use provided course code as fallback
+        if not course_data.get('course_code') and course_code:
+            course_data['course_code'] = course_code
+        
+        # Extract detailed description
+        description = ""
+        for tag_name, class_name in _DESCRIPTION_SELECTORS:
+            desc_elem = index.first_with_class(tag_name, class_name)
+            if desc_elem is not None:
+                description = index.text(desc_elem, strip=True)
+                break
+        
+        # Fallback: look for paragraphs with substantial content
+        if not description:
+            for div in index.tags_named(('div', 'section', 'article')):
+                paragraphs = index.descendants_named(div, 'p')
+                if len(paragraphs) >= 2:  # Section with multiple paragraphs likely contains description
+                    full_text = ' '.join([index.text(p, strip=True) for p in paragraphs])
+                    if len(full_text) > 100:  # Substantial content
+                        description = full_text
+                        break
+        
+        course_data['description'] = description
+        
+        # Extract professor/instructor
+        for pattern in index.candidates('professor'):
+            prof_elem = index.find_next(pattern, ('dd', 'span', 'div', 'p'))
+            if prof_elem is not None:
+                prof_text = index.text(prof_elem, strip=True)
+                # Extract actual name (skip labels)
+                prof_match = _PERSON_NAME_RE.search(prof_text)
+                if prof_match:
+                    course_data['professor'] = prof_match.group(1)
+                    break
+        
+        # Extract prerequisites
+        for pattern in index.candidates('prerequisites'):
+            prereq_elem = index.find_next(pattern, ('dd', 'div', 'p', 'ul'))
+            if prereq_elem is not None:
+                course_data['prerequisites'] = index.text(prereq_elem, strip=True)
+                break
+        
+        # Extract credits
+        for pattern in index.candidates('credits'):
+            credits_text = pattern if isinstance(pattern, str) else index.text(pattern)
+            credits_match = _CREDITS_VALUE_RE.search(credits_text)
+            if credits_match:
+                course_data['credits'] = int(credits_match.group(1))
+                break
+        
+        # Extract terms offered
+        for pattern in index.candidates('terms'):
+            term_text = pattern if isinstance(pattern, str) else index.text(pattern)
+            term_matches = _TERM_VALUE_RE.findall(term_text)
+            if term_matches:
+                course_data['terms_offered'] = ', '.join(term_matches)
+                break
+        
+        # Extract learning outcomes
+        for pattern in index.candidates('learning_outcomes'):
+            outcomes_elem = index.find_next(pattern, ('ul', 'ol', 'div', 'p'))
+            if outcomes_elem is not None:
+                course_data['learning_outcomes'] = index.text(outcomes_elem, strip=True)
+                break
+        
+        # Extract assessment methods
+        for pattern in index.candidates('assessment'):
+            assess_elem = index.find_next(pattern, ('div', 'p', 'ul'))
+            if assess_elem is not None:
+                course_data['assessment'] = index.text(assess_elem, strip=True)
+                break
+        
+        # Add source URL
+        course_data['detail_url'] = url
+        course_data['scraped_from_detail_page'] = True
+        
+        return course_data
+    
+    def _scrape_detail_checkpointed(self, url: str) -> Optional[Dict]:
+        """Scrape one detail page, reusing the checkpoint journal when resuming"""
+        if self.journal and self.journal.is_done('detail', url):
+            return self.journal.get('detail', url)
+        
+        logger.info(f"Scraping detail page: {url}")
+        
+        # Extract course code from URL for matching
+        course_code_match = re.search(r'/course/(\d+-\d+)', url)
+        course_code = None
+        if course_code_match:
+            course_code = course_code_match.group(1).replace('-', '.')
+        
+        detail_data = self.scrape_course_detail_page(url, course_code)
+        # Failed pages are not journaled so a resumed run retries them
+        if self.journal and detail_data:
+            self.journal.record('detail', url, detail_data)
+        return detail_data
+    
     def enhance_course_data(self, courses: List[Dict]) -> List[Dict]:
         """Enhance course data with additional information"""
         enhanced_courses = []
@@ -540,10 +952,23 @@ class SUTDCourseScraper:
         logger.info("Starting SUTD ISTD course scraping...")
         
         # Scrape courses from main courses page
-        courses, detail_urls = self.scrape_courses_page(course_type)
+        listing_key = course_type or 'all'
+        if self.journal and self.journal.is_done('listing', listing_key):
+            listing = self.journal.get('listing', listing_key)
+            courses, detail_urls = listing['courses'], listing['detail_urls']
+            logger.info(f"Resumed listing data: {len(courses)} courses, {len(detail_urls)} detail URLs")
+        else:
+            courses, detail_urls = self.scrape_courses_page(course_type)
+            if self.journal and detail_urls:
+                self.journal.record('listing', listing_key, {'courses': courses, 'detail_urls': detail_urls})
         
         # Scrape additional info from curriculum page
-        curriculum_courses = self.scrape_curriculum_page()
+        if self.journal and self.journal.is_done('curriculum', 'curriculum'):
+            curriculum_courses = self.journal.get('curriculum', 'curriculum')
+        else:
+            curriculum_courses = self.scrape_curriculum_page()
+            if self.journal and curriculum_courses:
+                self.journal.record('curriculum', 'curriculum', curriculum_courses)
         
         # Merge listing page data
         all_courses = courses + curriculum_courses
@@ -567,19 +992,17 @@ class SUTDCourseScraper:
         # Scrape individual course detail pages if requested
         detailed_courses = {}
         if scrape_detail_pages and detail_urls:
-            logger.info(f"Starting detailed scraping of {len(detail_urls)} course pages...")
+            # Sorted so runs (and resumed runs) visit and merge pages in the same order
+            detail_urls = sorted(detail_urls)
+            logger.info(f"Starting detailed scraping of {len(detail_urls)} course pages "
+                        f"with {self.max_workers} workers...")
             
-            for i, url in enumerate(detail_urls, 1):
-                logger.info(f"Scraping detail page {i}/{len(detail_urls)}: {url}")
-                
-                # Extract course code from URL for matching
-                course_code_match = re.search(r'/course/(\d+-\d+)', url)
-                course_code = None
-                if course_code_match:
-                    course_code = course_code_match.group(1).replace('-', '.')
-                
-                detail_data = self.scrape_course_detail_page(url, course_code)
-                
+            # Pages are fetched and parsed concurrently (the per-host rate limiter still
+            # paces requests), then merged in URL order so completion order doesn't matter
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(self._scrape_detail_checkpointed, detail_urls))
+            
+            for url, detail_data in zip(detail_urls, results):
                 if detail_data and detail_data.get('course_code'):
                     code = detail_data['course_code']
                     detailed_courses[code] = detail_data
@@ -590,9 +1013,6 @@ class SUTDCourseScraper:
                     logger.info(f"Scraped course detail (no code found): {url}")
                 else:
                     logger.warning(f"Failed to scrape detail page: {url}")
-                
-                # Add small delay between requests
-                time.sleep(0.5)
         
         # Merge listing data with detailed data
         final_courses = {}
@@ -635,9 +1055,44 @@ class SUTDCourseScraper:
         return enhanced_courses
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape SUTD ISTD course information")
+    parser.add_argument('--cache-dir', default='.http_cache', help="On-disk HTTP cache directory")
+    parser.add_argument('--cache-ttl', type=float, default=7 * 24 * 3600,
+                        help="Seconds before cached pages are revalidated")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the HTTP cache")
+    parser.add_argument('--offline', action='store_true',
+                        help="Replay pages from the cache only; never touch the network")
+    parser.add_argument('--checkpoint', default='.courses_checkpoint.sqlite',
+                        help="Journal of finished listing and detail pages")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip pages already recorded in --checkpoint")
+    parser.add_argument('--max-workers', type=int, default=4,
+                        help="Detail pages fetched and parsed concurrently")
+    parser.add_argument('--parser', choices=sorted(DETAIL_PARSERS), default='lxml',
+                        help="Detail-page parser backend: direct lxml tree or BeautifulSoup")
+    parser.add_argument('--content-region', default=None,
+                        help="Only parse this element of detail pages (tag, tag.class or tag#id, "
+                             "e.g. main); every field must live inside it")
+    args = parser.parse_args()
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the HTTP cache; drop --no-cache")
+    return args
+
+
 def main():
     """Main function"""
-    scraper = SUTDCourseScraper()
+    args = parse_args()
+    scraper = SUTDCourseScraper(
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        offline=args.offline,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        max_workers=args.max_workers,
+        parser_backend=args.parser,
+        content_region=args.content_region,
+    )
     
     # Scrape all course types with detail pages
     courses = scraper.run(scrape_detail_pages=True)
@@ -0,0 +1,108 @@
+"""
+Benchmark for the TF-IDF profile <-> job similarity engine.
+
+Generates N synthetic job postings (Zipf-distributed filler vocabulary plus
+role-specific skill terms, ~200 words each) and M synthetic profiles, builds
+the index, saves and memory-maps it, then times single-profile top-k and batch
+scoring. A --check sample of profiles is also scored by brute force (a
+dict-of-weights cosine against every job, recomputed from the same tokens)
+and compared with the sparse scores.
+
+    python scripts/bench_job_similarity.py [--jobs 100000] [--profiles 1000] [--check 20]
+"""
+
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from job_similarity import TfidfIndex, tokenize
+
+
+def synthetic_corpus(num_jobs: int, num_profiles: int, seed: int = 11):
+    rng = random.Random(seed)
+    filler = [f"w{i}" for i in range(30000)]
+    weights = [1 / (i + 1) for i in range(len(filler))]
+    roles = [[f"skill{r}x{i}" for i in range(40)] for r in range(50)]
+
+    def text(words: int, role: List[str], skills: int) -> str:
+        return " ".join(rng.choices(filler, weights, k=words) + rng.choices(role, k=skills))
+
+    jobs = [text(180, rng.choice(roles), 20) for _ in range(num_jobs)]
+    profiles = [text(60, rng.choice(roles), 10) for _ in range(num_profiles)]
+    return jobs, profiles
+
+
+def brute_force(jobs: List[str], profile: str, max_df: float) -> np.ndarray:
+    """Cosine scores recomputed with plain dicts, independently of the CSR layout."""
+    docs = [Counter(tokenize(j)) for j in jobs]
+    df: Counter = Counter(t for d in docs for t in d)
+    n = len(docs)
+    idf = {t: math.log((1 + n) / (1 + c)) + 1 for t, c in df.items() if c <= max(1.0, max_df * n)}
+
+    def vec(counts: Counter) -> Dict[str, float]:
+        v = {t: (1 + math.log(c)) * idf[t] for t, c in counts.items() if t in idf}
+        norm = math.sqrt(sum(x * x for x in v.values())) or 1.0
+        return {t: x / norm for t, x in v.items()}
+
+    q = vec(Counter(tokenize(profile)))
+    return np.asarray([sum(w * q.get(t, 0.0) for t, w in vec(d).items()) for d in docs])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TF-IDF profile <-> job similarity")
+    parser.add_argument("--jobs", type=int, default=100_000, help="Synthetic jobs to index")
+    parser.add_argument("--profiles", type=int, default=1000, help="Synthetic profiles to score")
+    parser.add_argument("--top", type=int, default=10, help="k for top-k retrieval")
+    parser.add_argument("--check", type=int, default=20, help="Profiles checked against brute force on a 2000-job index (0 skips it)")
+    args = parser.parse_args()
+
+    if args.check:
+        jobs, profiles = synthetic_corpus(2000, args.check, seed=5)
+        small = TfidfIndex.fit(jobs, list(range(1, len(jobs) + 1)))
+        worst = max(float(np.abs(small.score(p) - brute_force(jobs, p, 0.5)).max()) for p in profiles)
+        print(f"check: {args.check} profiles x {len(jobs)} jobs, max |sparse - brute force| = {worst:.2e}")
+
+    jobs, profiles = synthetic_corpus(args.jobs, args.profiles)
+    t0 = time.perf_counter()
+    index = TfidfIndex.fit(jobs, list(range(1, len(jobs) + 1)))
+    m = index.meta
+    print(f"fit: {m['docs']} jobs, {m['terms']} terms, {m['nonzeros']} nonzeros in {time.perf_counter() - t0:.1f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tfidf.npz")
+        t0 = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index = TfidfIndex.load(path)
+        print(f"save {saved:.2f}s ({os.path.getsize(path) / 1e6:.0f} MB), mmap load {time.perf_counter() - t0:.2f}s")
+
+        index.top_k(profiles[0], args.top)
+        latencies = []
+        for p in profiles[:200]:
+            t0 = time.perf_counter()
+            index.top_k(p, args.top)
+            latencies.append(time.perf_counter() - t0)
+        latencies.sort()
+        print(f"top_k: median {latencies[len(latencies) // 2] * 1000:.1f}ms, p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f}ms per profile")
+
+        t0 = time.perf_counter()
+        batch = index.score_batch(profiles, args.top)
+        elapsed = time.perf_counter() - t0
+        print(f"score_batch: {len(profiles)} profiles in {elapsed:.2f}s ({len(profiles) / elapsed:.0f} profiles/s)")
+        same = sum(
+            [r["job_id"] for r in b] == [r["job_id"] for r in index.top_k(p, args.top)]
+            for p, b in zip(profiles[:50], batch[:50])
+        )
+        print(f"batch vs single top-{args.top}: {same}/50 identical")
+
+
+if __name__ == "__main__":
+    main()
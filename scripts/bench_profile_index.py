@@ -0,0 +1,225 @@
+"""
+Benchmark for SerpAPI profile parsing with PayloadIndex.
+
+Compares parse_serpapi_profile (one indexed walk per response) against the
+previous parser, which re-walked the whole payload for every field lookup and
+again for every experience / education / course item. Payloads are the
+linkedin_profile responses recorded in an --http-cache directory, plus
+synthetic profiles with many nested sections (--synthetic N, --items M).
+Every payload is also checked for identical output.
+
+    python scripts/bench_profile_index.py [--http-cache .http_cache] [--synthetic 20 --items 400]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from http_cache import ResponseCache
+from linkedin_scraper import parse_serpapi_profile
+
+
+def recorded_payloads(cache_dir: str) -> List[Dict[str, Any]]:
+    index = os.path.join(cache_dir, "index.sqlite")
+    if not os.path.exists(index):
+        return []
+    with sqlite3.connect(index) as db:
+        keys = [k for (k,) in db.execute(
+            "SELECT key FROM entries WHERE url LIKE '%serpapi.com/search.json%engine=linkedin_profile%'"
+        )]
+    cache = ResponseCache(cache_dir, ttl=float("inf"), offline=True)
+    payloads = []
+    for key in keys:
+        entry = cache.lookup(key)
+        try:
+            data = json.loads(entry["body"]) if entry else None
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            payloads.append(data)
+    cache.close()
+    return payloads
+
+
+def synthetic_payload(rng: random.Random, items: int) -> Dict[str, Any]:
+    def words(n: int) -> str:
+        return " ".join(rng.choice(("data", "python", "cloud", "team", "model", "sql", "lead")) for _ in range(n))
+
+    def text_field() -> Any:
+        return rng.choice((words(6), {"text": words(8)}, {"summary": "  "}, "", None))
+
+    experiences = [
+        {
+            "title": rng.choice((words(2), None)),
+            "role": {"position_title": text_field()},
+            "company_info": rng.choice((None, {"company_name": text_field(), "location": text_field()})),
+            "details": {"summary": text_field(), "skills": [words(1) for _ in range(5)]},
+            "start_date": "2020-01",
+            "location": rng.choice((None, "Singapore")),
+        }
+        for _ in range(items)
+    ]
+    education = [
+        {"institution": {"school_name": text_field()}, "degree": rng.choice((None, words(2))), "program": {"field": text_field()}}
+        for _ in range(items // 4)
+    ]
+    return {
+        "search_metadata": {"id": "x", "status": "Success"},
+        "person": {"name": words(2), "summary": text_field(), "location": text_field()},
+        "about": text_field(),
+        "skills": [{"name": words(1)} for _ in range(50)],
+        "experience": rng.choice((experiences, {"items": experiences})),
+        "education": {"list": education},
+        "certifications": [{"title": rng.choice((None, words(3))), "issuer": {"name": text_field()}} for _ in range(items // 4)],
+        "similar_profiles": [{"name": words(2), "headline": words(5), "location": "SG"} for _ in range(items // 2)],
+    }
+
+
+# Previous lookups: a full pre-order walk of the payload per call
+def _iter_dicts(obj):
+    if isinstance(obj, dict):
+        yield obj
+        for v in obj.values():
+            yield from _iter_dicts(v)
+    elif isinstance(obj, list):
+        for it in obj:
+            yield from _iter_dicts(it)
+
+
+def _first_text(data: Any, keys: List[str]) -> Optional[str]:
+    for d in _iter_dicts(data):
+        for k in keys:
+            if k in d:
+                v = d.get(k)
+                if isinstance(v, str) and v.strip():
+                    return v.strip()
+                if isinstance(v, dict):
+                    t = v.get("text") or v.get("summary") or v.get("content")
+                    if isinstance(t, str) and t.strip():
+                        return t.strip()
+    return None
+
+
+def _collect_list_items(data: Any, keys: List[str]) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    for d in _iter_dicts(data):
+        for k in keys:
+            v = d.get(k)
+            if isinstance(v, list):
+                items.extend([it for it in v if isinstance(it, dict)])
+            if isinstance(v, dict):
+                inner = v.get("items") or v.get("list")
+                if isinstance(inner, list):
+                    items.extend([it for it in inner if isinstance(it, dict)])
+    return items
+
+
+def legacy_parse(data: Dict[str, Any], profile_url: str) -> Dict[str, Any]:
+    about = _first_text(data, ["about", "summary", "bio"]) or None
+    headline = _first_text(data, ["headline", "title"]) or data.get("headline")
+    name = (
+        data.get("name")
+        or data.get("full_name")
+        or (data.get("person") or {}).get("name")
+        or _first_text(data, ["name", "full_name"])
+    )
+    location = _first_text(data, ["location", "country", "city", "region"]) or (data.get("person") or {}).get("location")
+    skills_field = data.get("skills")
+    if isinstance(skills_field, list):
+        skills = [s if isinstance(s, str) else (s.get("title") or s.get("name")) for s in skills_field]
+        skills = [s for s in skills if s]
+    else:
+        skills = data.get("skills_list") if isinstance(data.get("skills_list"), list) else None
+    experience_sections: List[str] = []
+    experiences_raw: List[Dict[str, Any]] = []
+    for e in _collect_list_items(data, ["experience", "experiences", "positions", "work_experience", "work"]):
+        title = (e or {}).get("title") or (e or {}).get("position_title") or _first_text(e, ["title", "position_title"]) or None
+        company = (e or {}).get("company") or (e or {}).get("company_name") or _first_text(e, ["company", "company_name"]) or None
+        desc = (e or {}).get("description") or _first_text(e, ["description", "summary", "details"]) or None
+        parts = [p for p in [title, company, desc] if p]
+        if parts:
+            experience_sections.append(" - ".join(parts))
+        experiences_raw.append({
+            "title": title,
+            "company": company,
+            "description": desc,
+            "start_date": (e or {}).get("start_date"),
+            "end_date": (e or {}).get("end_date"),
+            "location": (e or {}).get("location") or _first_text(e, ["location", "region", "city"]) or None,
+        })
+    education_raw: List[Dict[str, Any]] = []
+    for ed in _collect_list_items(data, ["education", "educations", "schools", "education_list", "education_history"]):
+        education_raw.append({
+            "school": (ed or {}).get("school") or (ed or {}).get("school_name") or _first_text(ed, ["school", "school_name"]),
+            "degree": (ed or {}).get("degree_name") or (ed or {}).get("degree") or _first_text(ed, ["degree_name", "degree"]),
+            "field": (ed or {}).get("field_of_study") or (ed or {}).get("field") or _first_text(ed, ["field_of_study", "field"]),
+            "start_date": (ed or {}).get("start_date"),
+            "end_date": (ed or {}).get("end_date"),
+            "grade": (ed or {}).get("grade"),
+            "activities": (ed or {}).get("activities_and_societies") or (ed or {}).get("activities"),
+        })
+    courses_raw: List[str] = []
+    for c in _collect_list_items(data, ["courses", "course_list", "certifications", "licenses"]):
+        if isinstance(c, dict):
+            title = c.get("title") or c.get("name") or _first_text(c, ["title", "name"]) or None
+            if title:
+                courses_raw.append(title)
+    return {
+        "name": name,
+        "headline": headline,
+        "about": about,
+        "skills": skills,
+        "location": location,
+        "experience_text": "\n".join(experience_sections) if experience_sections else None,
+        "experiences": experiences_raw or None,
+        "education": education_raw or None,
+        "courses": courses_raw or None,
+        "url": profile_url,
+    }
+
+
+def bench(fn, payloads: List[Dict[str, Any]], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in payloads:
+            fn(data, "https://www.linkedin.com/in/example")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SerpAPI profile parsing")
+    parser.add_argument("--http-cache", default=".http_cache", help="Cache directory with recorded profile responses")
+    parser.add_argument("--synthetic", type=int, default=20, help="Number of synthetic payloads")
+    parser.add_argument("--items", type=int, default=400, help="Experience entries per synthetic payload")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    recorded = recorded_payloads(args.http_cache)
+    rng = random.Random(args.seed)
+    synthetic = [synthetic_payload(rng, args.items) for _ in range(args.synthetic)]
+    for label, payloads in (("recorded", recorded), ("synthetic", synthetic)):
+        if not payloads:
+            print(f"{label}: no payloads")
+            continue
+        size = sum(len(json.dumps(p)) for p in payloads) / len(payloads)
+        print(f"{label}: {len(payloads)} payloads, {size / 1024:.0f} KiB avg x {args.repeat} repeats")
+        timings = {}
+        for name, fn in (("per-lookup walks", legacy_parse), ("PayloadIndex", parse_serpapi_profile)):
+            timings[name] = bench(fn, payloads, args.repeat)
+            per = timings[name] * 1000 / (len(payloads) * args.repeat)
+            print(f"  {name:<17} {per:9.2f} ms/payload")
+        mismatches = sum(
+            1 for p in payloads
+            if legacy_parse(p, "u") != parse_serpapi_profile(p, "u")
+        )
+        speedup = timings["per-lookup walks"] / timings["PayloadIndex"]
+        print(f"  speedup {speedup:.1f}x, outputs differing: {mismatches}/{len(payloads)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark for the vectorized skill benchmark aggregation.
+
+Builds N synthetic benchmark records (skill / job title / level / region drawn
+from skewed vocabularies, a share of them without a usable level), encodes
+them once, then times skill_benchmark.aggregate per skill and per skill x
+role x level x region against a plain per-group Python pass (dict of lists,
+sorted, statistics.mean). Every group of the smaller --check sample is also
+compared against numpy.percentile / numpy.mean, and against the same sample
+round-tripped through the columnar .npz format (benchmark_columnar.py).
+
+    python scripts/bench_skill_benchmark.py [--records 1000000] [--check 50000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from benchmark_columnar import ColumnarBenchmark, write_columnar
+from skill_benchmark import GROUP_COLUMNS, LEVEL_SCORES, PERCENTILES, BenchmarkColumns, aggregate
+
+
+LEVELS = list(LEVEL_SCORES) + ["unknown"]
+REGIONS = ["Singapore", "Malaysia", "Indonesia", "Vietnam", "Philippines", "Thailand"]
+
+
+def synthetic_records(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    skills = [f"Skill {i}" for i in range(2000)]
+    titles = [f"Role {i}" for i in range(150)]
+    weights = [1 / (i + 1) for i in range(len(skills))]
+    picked = rng.choices(skills, weights=weights, k=n)
+    return [
+        {
+            "job_title": rng.choice(titles),
+            "experience_level": rng.choice(LEVELS),
+            "region": rng.choice(REGIONS),
+            "skill_name": s,
+            "skill_score": rng.uniform(0, 100) if rng.random() < 0.3 else None,
+        }
+        for s in picked
+    ]
+
+
+def python_aggregate(cols: BenchmarkColumns, by: Sequence[str]) -> Dict[Tuple[int, ...], Tuple[int, Any, Any, Any]]:
+    """Baseline: group rows in a dict, then sort and reduce each group in Python."""
+    groups: Dict[Tuple[int, ...], List[float]] = {}
+    keys = zip(*([cols.codes["skill"].tolist()] + [cols.codes[c].tolist() for c in by]))
+    for key, score in zip(keys, cols.score.tolist()):
+        groups.setdefault(key, []).append(score)
+    out = {}
+    for key, values in groups.items():
+        scored = sorted(v for v in values if v == v)
+        row: List[Any] = [len(values), statistics.fmean(scored) if scored else None]
+        for q in PERCENTILES:
+            if not scored:
+                row.append(None)
+                continue
+            pos = (len(scored) - 1) * q / 100
+            lo, hi = int(pos), min(int(pos) + 1, len(scored) - 1)
+            row.append(scored[lo] + (scored[hi] - scored[lo]) * (pos - lo))
+        out[key] = tuple(row)
+    return out
+
+
+def check(cols: BenchmarkColumns, by: Sequence[str]) -> int:
+    """Groups whose vectorized stats differ from numpy.percentile / numpy.mean."""
+    stats = aggregate(cols, by)
+    keys = np.stack([cols.codes["skill"]] + [cols.codes[c] for c in by], axis=1)
+    mismatches = 0
+    for g in range(len(stats["skill"])):
+        want = (stats["skill"][g],) + tuple(stats[c][g] for c in by)
+        mask = np.all(keys == np.asarray(want), axis=1)
+        values = cols.score[mask]
+        scored = values[~np.isnan(values)]
+        expect = [len(values), np.mean(scored) if len(scored) else np.nan]
+        expect += [np.percentile(scored, q) if len(scored) else np.nan for q in PERCENTILES]
+        got = [stats["sample_size"][g], stats["avg_skill_score"][g]] + [stats[f"percentile_{q}"][g] for q in PERCENTILES]
+        if not np.allclose(got, expect, equal_nan=True):
+            mismatches += 1
+    return mismatches
+
+
+def check_columnar(records: List[Dict[str, Any]], by: Sequence[str]) -> int:
+    """Groups whose stats change when the records go through the columnar format (scores are stored as float32)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample.npz")
+        write_columnar(path, records)
+        direct = aggregate(BenchmarkColumns.from_records(records), by)
+        mapped = aggregate(BenchmarkColumns.from_columnar(ColumnarBenchmark(path, mmap_arrays=False)), by)
+    if len(direct["skill"]) != len(mapped["skill"]):
+        return abs(len(direct["skill"]) - len(mapped["skill"]))
+    mismatches = 0
+    for name in ["skill", "sample_size", "scored", "avg_skill_score"] + [f"percentile_{q}" for q in PERCENTILES] + list(by):
+        mismatches += int(np.sum(~np.isclose(direct[name], mapped[name], rtol=1e-6, equal_nan=True)))
+    return mismatches
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized skill benchmark aggregation")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Synthetic records to aggregate")
+    parser.add_argument("--check", type=int, default=50_000, help="Records in the equivalence check sample (0 skips it)")
+    args = parser.parse_args()
+
+    if args.check:
+        sample_records = synthetic_records(args.check, seed=3)
+        sample = BenchmarkColumns.from_records(sample_records)
+        for by in ((), ("experience_level",)):
+            print(f"check by skill{''.join(' x ' + c for c in by)}: {check(sample, by)} mismatching groups, "
+                  f"{check_columnar(sample_records, by)} differing after the columnar round trip")
+
+    records = synthetic_records(args.records)
+    t0 = time.perf_counter()
+    cols = BenchmarkColumns.from_records(records)
+    print(f"{len(cols)} records encoded in {time.perf_counter() - t0:.2f}s "
+          f"({len(cols.vocab['skill'])} skills, {len(cols.vocab['job_title'])} titles)")
+
+    for by in ((), tuple(GROUP_COLUMNS)):
+        label = "skill" + "".join(" x " + c for c in by)
+        groups = len(aggregate(cols, by)["skill"])
+        vec = timed(lambda: aggregate(cols, by))
+        py = timed(lambda: python_aggregate(cols, by), repeat=1)
+        print(f"{label}: {groups} groups, numpy {vec:.3f}s, python {py:.2f}s ({py / vec:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Micro-benchmark for categorize_skill_heuristic.
+
+Compares the compiled whole-word matcher against the previous per-keyword
+substring loop over every skill found in prisma/data/job_description_cleaned, and checks a
+fixed set of skills whose category must not change (compound names, plurals and
+version suffixes the whole-word boundaries could otherwise miss).
+
+    python scripts/bench_skill_categorizer.py [--repeat 20]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import List
+
+from linkedin_scraper import categorize_skill_heuristic
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prisma", "data", "job_description_cleaned")
+
+
+def load_skills(data_dir: str) -> List[str]:
+    skills: List[str] = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "*_classified.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            for job in json.load(f).get("jobs", []):
+                for key in ("skills", "hard_skills", "soft_skills"):
+                    skills.extend(s for s in (job.get(key) or []) if isinstance(s, str))
+    return skills
+
+
+# Keyword table as it was before the compiled matcher
+LEGACY_KEYWORDS = [
+    ("Programming Languages", ["python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "sql", "r ", " r", "scala", "matlab"]),
+    ("Data & Analytics", ["sql", "excel", "tableau", "power bi", "pandas", "numpy", "matplotlib", "seaborn", "plotly", "data viz", "data visualization", "etl"]),
+    ("Machine Learning & AI", ["machine learning", "deep learning", "pytorch", "tensorflow", "scikit", "ml", "nlp", "computer vision", "xgboost", "catboost"]),
+    ("Cloud & DevOps", ["aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ci/cd"]),
+    ("Web & Backend", ["react", "next.js", "node", "express", "django", "flask", "spring", "rest", "graphql"]),
+    ("Tools", ["git", "github", "jira", "confluence", "linux", "bash", "vim"]),
+    ("Soft Skills", ["communication", "teamwork", "leadership", "problem solving", "critical thinking", "collaboration"]),
+]
+
+
+# Skills the matcher must keep categorizing this way
+EXPECTED = {
+    "Python": "Programming Languages",
+    "Python3": "Programming Languages",
+    "Java 8": "Programming Languages",
+    "C++17": "Programming Languages",
+    "R": "Programming Languages",
+    "R&D Skills": "Other",
+    "MySQL": "Programming Languages",
+    "MSSQL": "Programming Languages",
+    "PostgreSQL": "Programming Languages",
+    "NoSQL": "Programming Languages",
+    "Google Cloud": "Cloud & DevOps",
+    "GitLab": "Tools",
+    "Gitlab Ci": "Tools",
+    "ReactJS": "Web & Backend",
+    "Node.js": "Web & Backend",
+    "MLOps": "Machine Learning & AI",
+    "HTML": "Other",
+    "Power BI": "Data & Analytics",
+    "Critical Thinking": "Soft Skills",
+    # Plurals
+    "Communications": "Soft Skills",
+    "Databases": "Data & Analytics",
+    "Vector Databases": "Data & Analytics",
+    "Microservices With Docker Containers": "Cloud & DevOps",
+    "Kubernetes Clusters": "Cloud & DevOps",
+}
+
+
+def substring_loop(skill: str) -> str:
+    # Previous implementation: first substring hit in taxonomy order
+    s = skill.lower()
+    for category, keywords in LEGACY_KEYWORDS:
+        for kw in keywords:
+            if kw in s:
+                return category
+    return "Other"
+
+
+def bench(fn, skills: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for s in skills:
+            fn(s)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark heuristic skill categorization")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    skills = load_skills(args.data_dir)
+    total = len(skills) * args.repeat
+    print(f"{len(skills)} skills ({len(set(skills))} unique) x {args.repeat} repeats")
+    for name, fn in (("substring loop", substring_loop), ("compiled matcher", categorize_skill_heuristic)):
+        elapsed = bench(fn, skills, args.repeat)
+        print(f"  {name:<17} {elapsed * 1000:8.1f} ms  {total / elapsed:12,.0f} skills/s")
+    changed = sum(1 for s in set(skills) if substring_loop(s) != categorize_skill_heuristic(s))
+    print(f"  categories differing from the substring loop: {changed}/{len(set(skills))}")
+    wrong = [(s, c, categorize_skill_heuristic(s)) for s, c in EXPECTED.items() if categorize_skill_heuristic(s) != c]
+    for skill, want, got in wrong:
+        print(f"  MISMATCH {skill!r}: expected {want}, got {got}")
+    if wrong:
+        sys.exit(1)
+    print(f"  expected categories: {len(EXPECTED)}/{len(EXPECTED)} ok")
+
+
+if __name__ == "__main__":
+    main()
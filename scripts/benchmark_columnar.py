@@ -0,0 +1,260 @@
+"""
+Columnar, dictionary-encoded storage for benchmark records.
+
+The long form of `to_benchmark_records` repeats job_title, experience_level,
+region and url once per skill. Here each profile's attributes are stored once,
+as int32 codes into per-column string dictionaries, and its skills as a run of
+int32 skill (and category) codes delimited by `skill_offsets`: the skills of
+profile i are rows skill_offsets[i]:skill_offsets[i + 1]. Records that carry a
+`skill_score` also get a float32 `skill_score` column per skill row (NaN where
+a row has none); it is left out when no record has one. Dictionaries are a
+UTF-8 blob plus int64 offsets, so nothing in the file needs pickling.
+
+The container is an uncompressed .npz (one .npy member per array). Members of
+a stored zip are contiguous, so `ColumnarBenchmark` maps the file once and
+exposes every array as a read-only view into it instead of reading it.
+
+    python scripts/benchmark_columnar.py benchmark.json --out benchmark.npz   # convert
+    python scripts/benchmark_columnar.py benchmark.npz                        # summary
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from record_output import read_records, utc_timestamp
+
+
+FORMAT_VERSION = 1
+PROFILE_COLUMNS = ("job_title", "experience_level", "region", "url")
+SKILL_COLUMNS = ("skill_name", "skill_category")
+# Fixed part of a zip local file header; name and extra field lengths sit at offset 26
+_ZIP_LOCAL_HEADER = 30
+
+
+class StringDictionary:
+    """Insertion-ordered string <-> int32 code mapping (exact match)."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        value = value if isinstance(value, str) else ""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        encoded = [v.encode("utf-8") for v in self.values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return {"strings": np.frombuffer(b"".join(encoded), dtype=np.uint8), "string_offsets": offsets}
+
+
+def _score(record: Dict[str, Any]) -> float:
+    score = record.get("skill_score")
+    return float(score) if isinstance(score, (int, float)) and not isinstance(score, bool) else float("nan")
+
+
+def _profile_runs(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Group records into profiles: compact records as-is, consecutive long-form rows of one profile merged."""
+    current: Optional[Dict[str, Any]] = None
+    for r in records:
+        if isinstance(r.get("skills"), list):
+            if current:
+                yield current
+                current = None
+            score = _score(r)
+            yield {**{c: r.get(c) for c in PROFILE_COLUMNS}, "skills": r["skills"], "categories": None, "scores": [score] * len(r["skills"])}
+            continue
+        header = {c: r.get(c) for c in PROFILE_COLUMNS}
+        if current is None or any(current[c] != header[c] for c in PROFILE_COLUMNS):
+            if current:
+                yield current
+            current = {**header, "skills": [], "categories": [], "scores": []}
+        current["skills"].append(r.get("skill_name"))
+        current["categories"].append(r.get("skill_category"))
+        current["scores"].append(_score(r))
+    if current:
+        yield current
+
+
+def encode_records(records: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Arrays for write_columnar from long-form (one row per skill) or compact (skills array) records."""
+    dicts = {c: StringDictionary() for c in PROFILE_COLUMNS + SKILL_COLUMNS}
+    profile_codes: Dict[str, List[int]] = {c: [] for c in PROFILE_COLUMNS}
+    skill_codes: Dict[str, List[int]] = {c: [] for c in SKILL_COLUMNS}
+    scores: List[float] = []
+    offsets = [0]
+    encode_skill = dicts["skill_name"].encode
+    encode_category = dicts["skill_category"].encode
+    for p in _profile_runs(records):
+        for c in PROFILE_COLUMNS:
+            profile_codes[c].append(dicts[c].encode(p[c]))
+        skills = [s for s in p["skills"] if isinstance(s, str) and s]
+        skill_codes["skill_name"].extend(encode_skill(s) for s in skills)
+        scores.extend(score for s, score in zip(p["skills"], p["scores"]) if isinstance(s, str) and s)
+        if p["categories"] is None:
+            skill_codes["skill_category"].extend([-1] * len(skills))
+        else:
+            pairs = [c for s, c in zip(p["skills"], p["categories"]) if isinstance(s, str) and s]
+            skill_codes["skill_category"].extend(encode_category(c) if c else -1 for c in pairs)
+        offsets.append(len(skill_codes["skill_name"]))
+    arrays: Dict[str, np.ndarray] = {"skill_offsets": np.asarray(offsets, dtype=np.int64)}
+    for c, codes in list(profile_codes.items()) + list(skill_codes.items()):
+        arrays[c] = np.asarray(codes, dtype=np.int32)
+        for suffix, arr in dicts[c].arrays().items():
+            arrays[f"{c}.{suffix}"] = arr
+    score = np.asarray(scores, dtype=np.float32)
+    if not np.isnan(score).all():
+        arrays["skill_score"] = score
+    return arrays
+
+
+def write_columnar(path: str, records: Iterable[Dict[str, Any]], query: Any = None) -> int:
+    """Write records as an uncompressed, memory-mappable .npz; returns the number of skill rows."""
+    arrays = encode_records(records)
+    meta = {"format_version": FORMAT_VERSION, "query": query, "generated_at": utc_timestamp()}
+    arrays["meta"] = np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+    return int(arrays["skill_offsets"][-1])
+
+
+def map_npz(path: str) -> Dict[str, np.ndarray]:
+    """Every member of an uncompressed .npz as a read-only array view into one mmap of the file."""
+    with open(path, "rb") as f:
+        with zipfile.ZipFile(f) as zf:
+            infos = zf.infolist()
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    arrays: Dict[str, np.ndarray] = {}
+    for info in infos:
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"{path}: member {info.filename} is compressed and cannot be memory-mapped")
+        h = info.header_offset
+        name_len, extra_len = struct.unpack("<HH", mm[h + 26:h + _ZIP_LOCAL_HEADER])
+        fp = _MappedReader(mm, h + _ZIP_LOCAL_HEADER + name_len + extra_len)
+        version = np.lib.format.read_magic(fp)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(fp)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(fp)
+        arr = np.frombuffer(mm, dtype=dtype, count=int(np.prod(shape)), offset=fp.pos)
+        name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+        arrays[name] = arr.reshape(shape, order="F" if fortran else "C")
+    return arrays
+
+
+def decode_strings(arrays: Dict[str, np.ndarray], column: str) -> List[str]:
+    """The string dictionary stored by StringDictionary.arrays under `column`."""
+    blob = bytes(arrays[f"{column}.strings"])
+    offsets = arrays[f"{column}.string_offsets"].tolist()
+    return [blob[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+
+class ColumnarBenchmark:
+    """Read-only view of a columnar benchmark file; arrays are memory-mapped unless mmap_arrays=False."""
+
+    def __init__(self, path: str, mmap_arrays: bool = True):
+        self.path = path
+        self.arrays: Dict[str, np.ndarray] = {}
+        if mmap_arrays:
+            self.arrays = map_npz(path)
+        else:
+            with np.load(path) as npz:
+                self.arrays = {name: npz[name] for name in npz.files}
+        self.meta: Dict[str, Any] = json.loads(bytes(self.arrays["meta"]).decode("utf-8"))
+        if self.meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported columnar format version {self.meta.get('format_version')}")
+        self._strings: Dict[str, List[str]] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    @property
+    def num_profiles(self) -> int:
+        return len(self.arrays["skill_offsets"]) - 1
+
+    def __len__(self) -> int:
+        """Number of (profile, skill) rows."""
+        return int(self.arrays["skill_offsets"][-1])
+
+    def strings(self, column: str) -> List[str]:
+        """Decoded dictionary of a column (cached)."""
+        if column not in self._strings:
+            self._strings[column] = decode_strings(self.arrays, column)
+        return self._strings[column]
+
+    def skill_counts(self) -> np.ndarray:
+        """Skills per profile."""
+        return np.diff(self.arrays["skill_offsets"])
+
+    def expanded(self, column: str) -> np.ndarray:
+        """A profile column repeated once per skill row, aligned with skill_name."""
+        return np.repeat(self.arrays[column], self.skill_counts())
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Long-form records, as to_benchmark_records would have produced them."""
+        values = {c: self.strings(c) for c in PROFILE_COLUMNS + SKILL_COLUMNS}
+        codes = {c: self.arrays[c].tolist() for c in PROFILE_COLUMNS + SKILL_COLUMNS}
+        scores = self.arrays["skill_score"].tolist() if "skill_score" in self.arrays else None
+        offsets = self.arrays["skill_offsets"].tolist()
+        for i in range(self.num_profiles):
+            header = {c: values[c][codes[c][i]] for c in PROFILE_COLUMNS}
+            for row in range(offsets[i], offsets[i + 1]):
+                category = codes["skill_category"][row]
+                record = {
+                    "job_title": header["job_title"],
+                    "experience_level": header["experience_level"],
+                    "region": header["region"],
+                    "skill_name": values["skill_name"][codes["skill_name"][row]],
+                    "skill_category": values["skill_category"][category] if category >= 0 else None,
+                    "url": header["url"] or None,
+                }
+                if scores is not None:
+                    record["skill_score"] = scores[row] if scores[row] == scores[row] else None
+                yield record
+
+
+class _MappedReader:
+    """Minimal file-like reader over a mmap, for numpy's .npy header parser."""
+
+    def __init__(self, mm: mmap.mmap, pos: int):
+        self.mm = mm
+        self.pos = pos
+
+    def read(self, n: int = -1) -> bytes:
+        end = len(self.mm) if n < 0 else self.pos + n
+        data = self.mm[self.pos:end]
+        self.pos += len(data)
+        return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert benchmark records to / inspect the columnar .npz format")
+    parser.add_argument("path", help="Benchmark records (.json / .ndjson) to convert, or a .npz to summarize")
+    parser.add_argument("--out", type=str, default=None, help="Columnar .npz to write when converting")
+    args = parser.parse_args()
+
+    if args.path.endswith(".npz"):
+        data = ColumnarBenchmark(args.path)
+        print(f"{data.num_profiles} profiles, {len(data)} skill rows, {len(data.strings('skill_name'))} distinct skills")
+        print(json.dumps(data.meta, ensure_ascii=False))
+        return
+    if not args.out:
+        parser.error("--out is required when converting")
+    rows = write_columnar(args.out, read_records(args.path), query={"source": args.path})
+    print(f"Saved {rows} skill rows to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Checkpoint journal for long scrapes.
+
+Completed units of work (a search query's results, a job URL, a profile, a
+course detail page) are recorded with their extracted record in a SQLite
+file, one transaction per unit, so a killed run never leaves a half-written
+journal behind. A resumed run asks `get()` before doing any network or LLM
+work and reuses the stored record instead.
+
+A unit can be recorded with `record=None` to mark it done without output
+(e.g. a job dropped by the region filter) so it is skipped on resume too.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class CheckpointJournal:
+    def __init__(self, path: str, resume: bool = False):
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL + full sync: each commit is durable and atomic even on kill -9
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=FULL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS units ("
+            " scope TEXT, key TEXT, record TEXT, done_at REAL,"
+            " PRIMARY KEY (scope, key))"
+        )
+        if not resume:
+            self.db.execute("DELETE FROM units")
+        self.reused = 0
+
+    def get(self, scope: str, key: str, default: Any = _MISSING) -> Any:
+        """Return the stored record for a finished unit; `default` (or KeyError) if not finished."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT record FROM units WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone()
+        if row is None:
+            if default is _MISSING:
+                raise KeyError((scope, key))
+            return default
+        self.reused += 1
+        return json.loads(row[0]) if row[0] is not None else None
+
+    def is_done(self, scope: str, key: str) -> bool:
+        with self.lock:
+            return self.db.execute(
+                "SELECT 1 FROM units WHERE scope = ? AND key = ?", (scope, key)
+            ).fetchone() is not None
+
+    def record(self, scope: str, key: str, record: Any) -> None:
+        payload = json.dumps(record, ensure_ascii=False) if record is not None else None
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?)",
+                    (scope, key, payload, time.time()),
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def records(self, scope: str) -> Iterator[Tuple[str, Any]]:
+        """All finished units of a scope in completion order."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT key, record FROM units WHERE scope = ? ORDER BY rowid", (scope,)
+            ).fetchall()
+        for key, payload in rows:
+            yield key, (json.loads(payload) if payload is not None else None)
+
+    def count(self, scope: Optional[str] = None) -> int:
+        with self.lock:
+            if scope is None:
+                return self.db.execute("SELECT COUNT(*) FROM units").fetchone()[0]
+            return self.db.execute("SELECT COUNT(*) FROM units WHERE scope = ?", (scope,)).fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,317 @@
+"""
+Bulk loader for scraped courses and job descriptions.
+
+Maps SUTDCourseScraper output (fetch-data/sutd_courses_*.json) onto the
+`courses` table and `--jobs` output (wrapped JSON, NDJSON or the
+`*_classified.json` files) onto `job_description`, with the same column
+mapping and id assignment as the Prisma seeds: ids count up from --start-id
+over every record in input order, and the classified job files are read in
+the seed's fixed order (SEED_JOB_FILES, software engineer first) whatever
+order they are given in; nothing is deduplicated, as the seeds do not either.
+Reloading therefore updates rows in place (upsert on the id) instead of
+deleting them -- rows referenced by other tables stay valid -- and rows with
+an id past the last one loaded are deleted in the same transaction, so a
+shorter input leaves no stale rows behind (--no-prune keeps them).
+
+Everything goes over one connection, one transaction per table, in one of two ways:
+
+- copy (Postgres): rows are streamed in COPY text format into a temporary
+  table, then merged with a single INSERT ... SELECT ... ON CONFLICT. This
+  path has not been run against a live Postgres server yet; use
+  --method upsert if it misbehaves.
+- upsert: multi-row INSERT ... ON CONFLICT DO UPDATE statements of
+  --batch-size rows. This is also what runs against SQLite, which stands in
+  for Postgres in local checks (--create-tables creates the two tables there).
+
+    python scripts/db_load.py --database-url postgresql://... --courses fetch-data/sutd_courses_*.json --jobs prisma/data/job_description_cleaned/*.json
+    python scripts/db_load.py --database-url sqlite:///local.db --create-tables --courses ... --jobs ...
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from record_output import read_records
+
+
+# SQLite builds before 3.32 allow at most 999 bound parameters per statement
+SQLITE_MAX_PARAMS = 999
+# File order of prisma/seeds/job-descriptions.ts, which job ids follow
+SEED_JOB_FILES = (
+    "jobs_sg_software_engineer_developer_classified.json",
+    "jobs_sg_cybersecurity_specialist_classified.json",
+    "jobs_sg_data_analyst_scientist_classified.json",
+    "jobs_sg_front_end_classified.json",
+    "jobs_sg_full_stack_engineer_classified.json",
+    "jobs_sg_game_designer_classified.json",
+    "jobs_sg_product_manager_classified.json",
+    "jobs_sg_research_officer_engineer_classified.json",
+)
+
+
+class Table:
+    def __init__(self, name: str, key: str, columns: Sequence[str], ddl: str):
+        self.name = name
+        self.key = key
+        self.columns = tuple(columns)
+        self.ddl = ddl
+
+
+COURSES = Table(
+    "courses",
+    "course_id",
+    ("course_id", "course_code", "course_name", "course_desc", "course_full_desc", "ai_tagged_skill", "course_link"),
+    "CREATE TABLE IF NOT EXISTS courses (course_id INTEGER PRIMARY KEY, course_code TEXT NOT NULL, "
+    "course_name TEXT NOT NULL, course_desc TEXT NOT NULL, course_full_desc TEXT NOT NULL, "
+    "ai_tagged_skill TEXT NOT NULL, course_link TEXT)",
+)
+JOB_DESCRIPTION = Table(
+    "job_description",
+    "job_id",
+    ("job_id", "job_url", "job_title", "job_description", "job_hard_skills", "job_soft_skills"),
+    "CREATE TABLE IF NOT EXISTS job_description (job_id INTEGER PRIMARY KEY, job_url TEXT NOT NULL, "
+    "job_title TEXT NOT NULL, job_description TEXT NOT NULL, job_hard_skills TEXT NOT NULL, "
+    "job_soft_skills TEXT NOT NULL)",
+)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n".join(str(v) for v in value if v is not None)
+    return str(value)
+
+
+def _skills(value: Any) -> str:
+    if isinstance(value, list):
+        return ", ".join(str(v).strip() for v in value if v is not None and str(v).strip())
+    return _text(value)
+
+
+def course_rows(courses: Iterable[Dict[str, Any]], start_id: int = 1) -> Iterator[Tuple[Any, ...]]:
+    """`courses` rows from SUTDCourseScraper records, as prisma/seeds/courses.ts maps them."""
+    for course_id, c in enumerate(courses, start=start_id):
+        yield (
+            course_id,
+            _text(c.get("course_code")),
+            _text(c.get("course_name")),
+            _text(c.get("description")),
+            _text(c.get("full_description")),
+            _text(c.get("course_type")) or "Unknown",
+            c.get("detail_url") or None,
+        )
+
+
+def job_rows(jobs: Iterable[Dict[str, Any]], start_id: int = 1) -> Iterator[Tuple[Any, ...]]:
+    """`job_description` rows from --jobs / classified records, as prisma/seeds/job-descriptions.ts maps them."""
+    for job_id, j in enumerate(jobs, start=start_id):
+        yield (
+            job_id,
+            _text(j.get("url")).strip(),
+            _text(j.get("title")),
+            _text(j.get("job_description")),
+            _skills(j.get("hard_skills")),
+            _skills(j.get("soft_skills")),
+        )
+
+
+def _copy_field(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    return (
+        str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    )
+
+
+def copy_lines(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """Rows as COPY text-format lines (tab separated, \\N for NULL, backslash escapes)."""
+    for row in rows:
+        yield "\t".join(_copy_field(v) for v in row) + "\n"
+
+
+class CopyStream:
+    """File-like reader over COPY lines, for cursor.copy_expert; counts the rows it hands out."""
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self.lines = copy_lines(rows)
+        self.buffer = b""
+        self.rows = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self.buffer) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buffer += line.encode("utf-8")
+            self.rows += 1
+        if size < 0:
+            size = len(self.buffer)
+        out, self.buffer = self.buffer[:size], self.buffer[size:]
+        return out
+
+
+def upsert_sql(table: Table, num_rows: int, placeholder: str, source: Optional[str] = None) -> str:
+    """INSERT ... ON CONFLICT (key) DO UPDATE for num_rows VALUES tuples, or from SELECT-ing `source`."""
+    cols = ", ".join(table.columns)
+    if source:
+        body = f"SELECT {cols} FROM {source}"
+    else:
+        one = "(" + ", ".join([placeholder] * len(table.columns)) + ")"
+        body = "VALUES " + ", ".join([one] * num_rows)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in table.columns if c != table.key)
+    return f"INSERT INTO {table.name} ({cols}) {body} ON CONFLICT ({table.key}) DO UPDATE SET {updates}"
+
+
+def _postgres_dsn(url: str) -> Tuple[str, Optional[str]]:
+    """Drop Prisma's `schema` query parameter (libpq rejects it); return (dsn, schema)."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    schema = next((v for k, v in query if k == "schema"), None)
+    query = [(k, v) for k, v in query if k != "schema"]
+    return urlunsplit(parts._replace(query=urlencode(query))), schema
+
+
+class Loader:
+    """One database connection; each load() runs in its own transaction."""
+
+    def __init__(self, url: str):
+        self.url = url
+        if url.startswith(("sqlite:", "file:")):
+            # sqlite:///relative.db, sqlite:////absolute.db, or Prisma's file:./dev.db; sqlite:// is in-memory
+            path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url[len("file:"):] if url.startswith("file:") else ""
+            self.kind = "sqlite"
+            self.placeholder = "?"
+            self.conn = sqlite3.connect(path or ":memory:")
+        elif url.startswith(("postgres://", "postgresql://")):
+            try:
+                import psycopg2
+            except ImportError:
+                raise SystemExit("Postgres loading needs psycopg2: pip install psycopg2-binary")
+            dsn, schema = _postgres_dsn(url)
+            self.kind = "postgres"
+            self.placeholder = "%s"
+            self.conn = psycopg2.connect(dsn)
+            if schema:
+                with self.conn.cursor() as cur:
+                    cur.execute("SET search_path TO " + ", ".join(f'"{s}"' for s in schema.split(",")))
+                self.conn.commit()
+        else:
+            raise ValueError(f"unsupported database URL: {url}")
+
+    def create_tables(self, tables: Iterable[Table]) -> None:
+        cur = self.conn.cursor()
+        for table in tables:
+            cur.execute(table.ddl)
+        self.conn.commit()
+
+    def load(
+        self,
+        table: Table,
+        rows: Iterable[Sequence[Any]],
+        method: str = "copy",
+        batch_size: int = 500,
+        first_id: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """Upsert rows into table; with the first_id of the rows, also delete the rows keyed past
+        the last one loaded. Returns (rows sent, rows deleted)."""
+        if method == "copy" and self.kind != "postgres":
+            method = "upsert"
+        try:
+            count = self._copy(table, rows) if method == "copy" else self._upsert(table, rows, batch_size)
+            deleted = 0
+            # An empty input is more likely a wrong path than a request to empty the table
+            if first_id is not None and count:
+                cur = self.conn.cursor()
+                cur.execute(f"DELETE FROM {table.name} WHERE {table.key} >= {self.placeholder}", (first_id + count,))
+                deleted = cur.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return count, deleted
+
+    def _copy(self, table: Table, rows: Iterable[Sequence[Any]]) -> int:
+        staging = f"_load_{table.name}"
+        cols = ", ".join(table.columns)
+        stream = CopyStream(rows)
+        with self.conn.cursor() as cur:
+            cur.execute(f"CREATE TEMP TABLE {staging} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP")
+            cur.copy_expert(f"COPY {staging} ({cols}) FROM STDIN", stream)
+            cur.execute(upsert_sql(table, 0, self.placeholder, source=staging))
+        return stream.rows
+
+    def _upsert(self, table: Table, rows: Iterable[Sequence[Any]], batch_size: int) -> int:
+        if self.kind == "sqlite":
+            batch_size = min(batch_size, SQLITE_MAX_PARAMS // len(table.columns))
+        batch_size = max(1, batch_size)
+        cur = self.conn.cursor()
+        statements: Dict[int, str] = {}
+        count = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            sql = statements.get(len(batch))
+            if sql is None:
+                sql = statements[len(batch)] = upsert_sql(table, len(batch), self.placeholder)
+            cur.execute(sql, [v for row in batch for v in row])
+            count += len(batch)
+        return count
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _expand(patterns: Sequence[str]) -> List[str]:
+    return [path for pattern in patterns for path in (sorted(glob.glob(pattern)) or [pattern])]
+
+
+def job_files(patterns: Sequence[str]) -> List[str]:
+    """Expanded job files with the seed's files first, in SEED_JOB_FILES order; others keep their order after them."""
+    rank = {name: i for i, name in enumerate(SEED_JOB_FILES)}
+    return sorted(_expand(patterns), key=lambda path: rank.get(os.path.basename(path), len(rank)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load scraped courses and jobs into the database")
+    parser.add_argument("--database-url", type=str, default=os.getenv("DATABASE_URL"), help="postgresql://..., sqlite:///path or file:path (default: $DATABASE_URL)")
+    parser.add_argument("--courses", nargs="*", default=[], help="SUTDCourseScraper JSON files (or globs)")
+    parser.add_argument("--jobs", nargs="*", default=[], help="--jobs output / *_classified.json files (or globs); the seed's files load in seed order")
+    parser.add_argument("--method", choices=["copy", "upsert"], default="copy", help="copy: COPY into a staging table then merge (Postgres only); upsert: batched multi-row upserts")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per multi-row upsert statement")
+    parser.add_argument("--start-id", type=int, default=1, help="First course_id / job_id to assign")
+    parser.add_argument("--no-prune", action="store_true", help="Keep rows whose id is past the last one loaded")
+    parser.add_argument("--create-tables", action="store_true", help="Create the tables if missing (for a local SQLite stand-in)")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    loader = Loader(args.database_url)
+    prune = None if args.no_prune else args.start_id
+    try:
+        if args.create_tables:
+            loader.create_tables([COURSES, JOB_DESCRIPTION])
+        if args.courses:
+            t0 = time.perf_counter()
+            courses = (c for path in _expand(args.courses) for c in read_records(path, keys=("courses",)))
+            n, deleted = loader.load(COURSES, course_rows(courses, args.start_id), args.method, args.batch_size, prune)
+            print(f"[load] courses: {n} rows, {deleted} stale rows deleted in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+        if args.jobs:
+            t0 = time.perf_counter()
+            jobs = (j for path in job_files(args.jobs) for j in read_records(path, keys=("jobs",)))
+            n, deleted = loader.load(JOB_DESCRIPTION, job_rows(jobs, args.start_id), args.method, args.batch_size, prune)
+            print(f"[load] job_description: {n} rows, {deleted} stale rows deleted in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+    finally:
+        loader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Streaming HTML-to-text extraction.
+
+`HTMLTextStream` is an incremental tokenizer: feed it decoded chunks as they
+arrive and it emits visible text (tags replaced by a space, whitespace
+collapsed, entities unescaped), skipping <script>/<style> bodies and
+comments. Scanning is done with str.find and anchored regexes, so each byte
+is looked at a bounded number of times -- no backtracking over large inline
+scripts. Once `max_chars` of text has been produced it reports `done` and the
+caller can stop reading the response.
+"""
+
+import codecs
+import html
+import re
+from typing import Iterable, List, Optional
+
+
+_WS_RE = re.compile(r"\s+")
+_SKIP_OPEN_RE = re.compile(r"<(script|style)\b", re.IGNORECASE)
+_SKIP_CLOSE_RES = {
+    "script": re.compile(r"</script\s*>", re.IGNORECASE),
+    "style": re.compile(r"</style\s*>", re.IGNORECASE),
+}
+# Bytes of an unfinished closing tag / entity kept between chunks
+_CARRY = 64
+
+
+class HTMLTextStream:
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self.done = False
+        self.length = 0
+        self._parts: List[str] = []
+        self._buf = ""
+        self._skip_close = None
+        self._space = True  # last emitted char was a space (or nothing emitted yet)
+
+    def _emit(self, text: str) -> None:
+        if "&" in text:
+            text = html.unescape(text)
+        text = _WS_RE.sub(" ", text)
+        if self._space and text[:1] == " ":
+            text = text[1:]
+        if not text:
+            return
+        self._parts.append(text)
+        self.length += len(text)
+        self._space = text[-1] == " "
+        if self.max_chars is not None and self.length >= self.max_chars:
+            self.done = True
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of markup; returns True once enough text has been collected."""
+        if self.done:
+            return True
+        buf = self._buf + chunk
+        n = len(buf)
+        pos = 0
+        while pos < n and not self.done:
+            if self._skip_close is not None:
+                m = self._skip_close.search(buf, pos)
+                if not m:
+                    pos = max(pos, n - _CARRY)
+                    break
+                self._skip_close = None
+                self._emit(" ")
+                pos = m.end()
+                continue
+            lt = buf.find("<", pos)
+            if lt < 0:
+                # Hold back a trailing entity that may continue in the next chunk
+                amp = buf.rfind("&", max(pos, n - _CARRY))
+                end = amp if amp >= 0 and ";" not in buf[amp:] else n
+                self._emit(buf[pos:end])
+                pos = end
+                break
+            if lt > pos:
+                self._emit(buf[pos:lt])
+            if lt + 1 >= n:
+                pos = lt
+                break
+            nxt = buf[lt + 1]
+            if not (nxt.isalpha() or nxt in "/!?"):
+                self._emit("<")
+                pos = lt + 1
+                continue
+            if buf.startswith("<!--", lt):
+                end = buf.find("-->", lt + 4)
+                if end < 0:
+                    pos = lt
+                    break
+                self._emit(" ")
+                pos = end + 3
+                continue
+            gt = buf.find(">", lt + 1)
+            if gt < 0:
+                pos = lt
+                break
+            m = _SKIP_OPEN_RE.match(buf, lt)
+            if m and buf[gt - 1] != "/":
+                self._skip_close = _SKIP_CLOSE_RES[m.group(1).lower()]
+            self._emit(" ")
+            pos = gt + 1
+        self._buf = buf[pos:]
+        return self.done
+
+    def text(self) -> str:
+        """Visible text collected so far (flushing any trailing text), capped at max_chars."""
+        if self._buf and self._skip_close is None and not self.done and not self._buf.startswith("<"):
+            self._emit(self._buf)
+            self._buf = ""
+        out = "".join(self._parts).strip()
+        return out[: self.max_chars] if self.max_chars is not None else out
+
+
+def html_to_text(markup: str, max_chars: Optional[int] = None) -> str:
+    stream = HTMLTextStream(max_chars)
+    stream.feed(markup)
+    return stream.text()
+
+
+def stream_html_text(
+    chunks: Iterable[bytes],
+    encoding: str = "utf-8",
+    max_chars: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> tuple:
+    """Decode and extract from raw byte chunks, stopping at max_chars of text or max_bytes read.
+
+    Returns (text, bytes_read).
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stream = HTMLTextStream(max_chars)
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        if stream.feed(decoder.decode(chunk)):
+            break
+        if max_bytes is not None and read >= max_bytes:
+            break
+    else:
+        stream.feed(decoder.decode(b"", final=True))
+    return stream.text(), read
@@ -0,0 +1,205 @@
+"""
+Persistent on-disk HTTP response cache.
+
+Bodies are stored content-addressed (`blobs/<sha256>`) and indexed in a small
+SQLite table keyed by a hash of (method, url, params). Entries remember their
+ETag / Last-Modified so stale entries are revalidated with a conditional GET;
+a 304 refreshes the entry without re-downloading the body. Entries expire
+after `ttl` seconds and the cache is trimmed least-recently-used first once
+it grows past `max_bytes`.
+
+In offline mode the network is never touched: hits are replayed from disk and
+misses raise, which makes it possible to iterate on parsers against a fixed
+corpus of cached pages.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# Query params that never change the response (credentials) are left out of the key
+DEFAULT_IGNORED_PARAMS = frozenset({"key", "api_key"})
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Encoding")
+
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 24 * 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        offline: bool = False,
+        ignored_params: Iterable[str] = DEFAULT_IGNORED_PARAMS,
+    ):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.ignored_params = frozenset(ignored_params)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT,"
+            " blob TEXT, size INTEGER, stored_at REAL, accessed_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        # Indexes written before URLs were redacted may still hold credentials in plaintext
+        for key, url in self.db.execute("SELECT key, url FROM entries WHERE url LIKE '%key=%'").fetchall():
+            self.db.execute("UPDATE entries SET url = ? WHERE key = ?", (self.redact_url(url), key))
+        self.db.commit()
+
+    # -- keys and blobs -------------------------------------------------
+
+    def key(self, method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        items = sorted(
+            (str(k), str(v)) for k, v in (params or {}).items() if k not in self.ignored_params
+        )
+        raw = json.dumps([method.upper(), url, items], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def redact_url(self, url: Optional[str]) -> Optional[str]:
+        """url without the ignored (credential) query params, as written to the index."""
+        if not url:
+            return url
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in self.ignored_params]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _write_blob(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        return digest
+
+    # -- entries --------------------------------------------------------
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, status, headers, blob, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            try:
+                with open(self._blob_path(row[3]), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        return {
+            "url": row[0],
+            "status": row[1],
+            "headers": json.loads(row[2]),
+            "body": body,
+            "stored_at": row[4],
+        }
+
+    def is_fresh(self, entry: Mapping[str, Any]) -> bool:
+        return (time.time() - entry["stored_at"]) < self.ttl
+
+    def store(self, key: str, resp: requests.Response) -> None:
+        body = resp.content
+        headers = {h: resp.headers[h] for h in STORED_HEADERS if h in resp.headers}
+        # requests has already decoded the transfer encoding
+        headers.pop("Content-Encoding", None)
+        digest = self._write_blob(body)
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, self.redact_url(resp.url), resp.status_code, json.dumps(headers), digest, len(body), now, now),
+            )
+            self.db.commit()
+            self._evict()
+
+    def refresh(self, key: str, resp: requests.Response) -> None:
+        """Record a 304 revalidation: the stored body is current again."""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT headers FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return
+            headers = json.loads(row[0])
+            for h in ("ETag", "Last-Modified"):
+                if h in resp.headers:
+                    headers[h] = resp.headers[h]
+            self.db.execute(
+                "UPDATE entries SET headers = ?, stored_at = ?, accessed_at = ? WHERE key = ?",
+                (json.dumps(headers), now, now, key),
+            )
+            self.db.commit()
+
+    def _evict(self) -> None:
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, digest, size in self.db.execute(
+            "SELECT key, blob, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            still_used = self.db.execute("SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (digest,)).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+            total -= size
+        self.db.commit()
+
+    # -- request helpers ------------------------------------------------
+
+    @staticmethod
+    def conditional_headers(entry: Mapping[str, Any]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    @staticmethod
+    def to_response(entry: Mapping[str, Any]) -> requests.Response:
+        """Rebuild a `requests.Response` from a cached entry."""
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp.headers["X-Cache"] = "HIT"
+        resp._content = entry["body"]
+        resp._content_consumed = True
+        resp.url = entry["url"]
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        return resp
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
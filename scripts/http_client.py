@@ -0,0 +1,154 @@
+"""
+Shared HTTP client for the scrapers.
+
+One `requests.Session` per client with a keep-alive connection pool per host,
+urllib3 retries with jittered exponential backoff for transient 5xx/connection
+errors, gzip negotiation, and the per-host rate limiter from `rate_limiter`.
+Throttling responses (429/503) are left to the rate limiter, which pauses the
+host and re-issues the request. GETs can optionally go through an on-disk
+`ResponseCache` with conditional revalidation; streamed GETs are served from
+it but never stored, since storing would read the whole body.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import OfflineCacheMiss, ResponseCache
+from rate_limiter import RATE_LIMITER, HostRateLimiter
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_HEADERS: Dict[str, str] = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+def _build_retry(retries: int, backoff: float, jitter: float) -> Retry:
+    kwargs = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=jitter, **kwargs)
+    except TypeError:
+        # urllib3 < 2 has no backoff_jitter; plain exponential backoff
+        return Retry(**kwargs)
+
+
+class HttpClient:
+    """Pooled, retrying, rate-limited HTTP client."""
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = 3,
+        backoff: float = 0.5,
+        jitter: float = 0.5,
+        throttle_retries: int = 3,
+        rate_limiter: Optional[HostRateLimiter] = RATE_LIMITER,
+        headers: Optional[Dict[str, str]] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.throttle_retries = throttle_retries
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+        # pool_connections = number of per-host pools kept, pool_maxsize = sockets per host
+        adapter = HTTPAdapter(
+            pool_connections=max(16, pool_size),
+            pool_maxsize=max(1, pool_size),
+            max_retries=_build_retry(retries, backoff, jitter),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, going through the response cache for GETs.
+
+        A `stream=True` response is returned unread and not stored: caching it
+        would download the full body and defeat the caller's early stop (e.g.
+        fetch_job_page's byte cap). Cached entries still answer streamed GETs.
+        """
+        cache = self.cache if method.upper() == "GET" else None
+        if cache is None:
+            return self._send(method, url, **kwargs)
+        key = cache.key(method, url, kwargs.get("params"))
+        entry = cache.lookup(key)
+        if cache.offline:
+            if entry is None:
+                raise OfflineCacheMiss(f"offline mode: no cached response for {url}")
+            return cache.to_response(entry)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                return cache.to_response(entry)
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(cache.conditional_headers(entry))
+            kwargs["headers"] = headers
+        resp = self._send(method, url, **kwargs)
+        if entry is not None and resp.status_code == 304:
+            cache.refresh(key, resp)
+            return cache.to_response(entry)
+        if resp.status_code == 200 and not kwargs.get("stream"):
+            cache.store(key, resp)
+        return resp
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        for attempt in range(self.throttle_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.wait(url)
+            resp = self.session.request(method, url, **kwargs)
+            if not self.rate_limiter:
+                break
+            throttled = self.rate_limiter.observe(url, resp.status_code, resp.headers)
+            if not throttled or attempt == self.throttle_retries:
+                break
+            resp.close()
+        return resp
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def configure_client(**kwargs) -> HttpClient:
+    """Replace the shared client (e.g. to change the pool size from CLI flags)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(**kwargs)
+        return _client
+
+
+def get_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,114 @@
+"""
+Ordered multi-stage pipeline for the jobs scrape.
+
+A pipeline is a list of named stages applied to each record in turn. A stage
+returns the (possibly updated) record to pass it on, None to drop it, or
+`Finished(value)` to skip the remaining stages and emit `value` as-is (e.g. a
+job replayed from the checkpoint). Stages tagged with a pool name run on that
+bounded worker pool; consecutive stages on the same pool run back to back in
+one worker. Putting the cheap filters on the fetch pool right after the fetch
+means only records that survive them are ever queued for the LLM pool.
+
+Results are yielded in input order, each as soon as it and everything before
+it are done. Per-stage counters (records seen, dropped, finished early) are
+kept across runs for the end-of-run summary.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class Finished:
+    """Stage result that short-circuits the remaining stages."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[Any], Any], pool: Optional[str] = None):
+        self.name = name
+        self.fn = fn
+        self.pool = pool
+
+
+class Pipeline:
+    def __init__(self, stages: Iterable[Stage], pool_sizes: Dict[str, int]):
+        self.stages: List[Stage] = []
+        self.pool_sizes = dict(pool_sizes)
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.received = 0
+        self.emitted = 0
+        self.lock = threading.Lock()
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage: Stage, before: Optional[str] = None) -> None:
+        """Append a stage, or insert it ahead of the stage named `before`."""
+        if stage.name in self.counts:
+            raise ValueError(f"duplicate stage name: {stage.name}")
+        if stage.pool is not None and stage.pool not in self.pool_sizes:
+            raise ValueError(f"stage {stage.name} uses unknown pool {stage.pool}")
+        index = len(self.stages)
+        if before is not None:
+            index = [s.name for s in self.stages].index(before)
+        self.stages.insert(index, stage)
+        self.counts[stage.name] = {"in": 0, "dropped": 0, "finished": 0}
+
+    def _count(self, name: str, what: str) -> None:
+        with self.lock:
+            self.counts[name][what] += 1
+
+    def _advance(self, pools: Dict[str, ThreadPoolExecutor], index: int, record: Any, on_pool: Optional[str]) -> Any:
+        while index < len(self.stages):
+            stage = self.stages[index]
+            if stage.pool is not None and stage.pool != on_pool:
+                # Hand the record to the stage's pool; the caller gets a Future back immediately
+                return pools[stage.pool].submit(self._advance, pools, index, record, stage.pool)
+            self._count(stage.name, "in")
+            record = stage.fn(record)
+            if record is None:
+                self._count(stage.name, "dropped")
+                return None
+            if isinstance(record, Finished):
+                self._count(stage.name, "finished")
+                return record.value
+            index += 1
+        return record
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Push items through every stage; yield the surviving results in input order."""
+        items = list(items)
+        if not items:
+            return
+        with ExitStack() as stack:
+            pools = {
+                name: stack.enter_context(ThreadPoolExecutor(max_workers=max(1, size)))
+                for name, size in self.pool_sizes.items()
+            }
+            with self.lock:
+                self.received += len(items)
+            # Leading stages without a pool run here; everything else is queued on the pools
+            pending = [self._advance(pools, 0, item, None) for item in items]
+            for result in pending:
+                while isinstance(result, Future):
+                    result = result.result()
+                if result is not None:
+                    with self.lock:
+                        self.emitted += 1
+                    yield result
+
+    def summary(self) -> str:
+        parts = [f"{self.received} discovered"]
+        for stage in self.stages:
+            c = self.counts[stage.name]
+            if c["dropped"]:
+                parts.append(f"{stage.name} dropped {c['dropped']}")
+            if c["finished"]:
+                parts.append(f"{stage.name} finished {c['finished']}")
+        parts.append(f"{self.emitted} emitted")
+        return ", ".join(parts)
@@ -0,0 +1,157 @@
+"""
+Deterministic "About the job" extraction from LinkedIn job-view markup.
+
+LinkedIn's public job pages wrap the posting body in a
+`show-more-less-html__markup` div and list title, company, location and the
+job criteria (seniority, employment type) in the top card. `linkedin_job_sections`
+pulls those out without an LLM and splits the body on its headings
+("About us", "Responsibilities", "Requirements", ...) into the
+about_us / job_description / job_requirements fields the scraper emits.
+
+When both a responsibilities and a requirements heading are found the split is
+considered reliable (`complete`) and the scraper skips the extraction prompt;
+otherwise only the description block is sent to the LLM instead of the whole
+page. `estimate_tokens` is a chars/4 approximation used to report the saving.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+from html_text import html_to_text
+
+
+_DESCRIPTION_OPEN_RES = [
+    re.compile(r'<div\b[^>]*class="[^"]*\bshow-more-less-html__markup\b[^"]*"[^>]*>', re.I),
+    re.compile(r'<div\b[^>]*class="[^"]*\bdescription__text\b[^"]*"[^>]*>', re.I),
+]
+_DIV_TOKEN_RE = re.compile(r"<(/?)div\b[^>]*>", re.I)
+_TITLE_RE = re.compile(r'<h[12]\b[^>]*class="[^"]*\b(?:top-card-layout__title|topcard__title)\b[^"]*"[^>]*>(.*?)</h[12]>', re.I | re.S)
+_COMPANY_RE = re.compile(r'<a\b[^>]*class="[^"]*\btopcard__org-name-link\b[^"]*"[^>]*>(.*?)</a>', re.I | re.S)
+_LOCATION_RE = re.compile(r'<span\b[^>]*class="[^"]*\btopcard__flavor--bullet\b[^"]*"[^>]*>(.*?)</span>', re.I | re.S)
+_CRITERIA_RE = re.compile(
+    r'<h3\b[^>]*class="[^"]*\bdescription__job-criteria-subheader\b[^"]*"[^>]*>(.*?)</h3>\s*'
+    r'<span\b[^>]*class="[^"]*\bdescription__job-criteria-text\b[^"]*"[^>]*>(.*?)</span>',
+    re.I | re.S,
+)
+_CRITERIA_FIELDS = {"seniority level": "experience_level", "employment type": "employment_type"}
+
+# Block-level tags (and bold runs, which LinkedIn uses for headings) start a new line
+_LINE_BREAK_RE = re.compile(r"<(?:br|/?(?:p|div|li|ul|ol|h[1-6]|strong|b|u))\b[^>]*>", re.I)
+
+# Checked in order, so "About the role" is a job_description heading, not about_us
+_HEADINGS = [
+    ("job_description", re.compile(
+        r"((key |main |your |job |primary )?(responsibilities|duties)|job (description|summary|scope|overview)"
+        r"|(about )?the (role|job|position|opportunity)|role (description|overview|summary)|what you('|’)?ll (do|be doing)"
+        r"|your (role|mission|impact)|scope of work)", re.I)),
+    ("job_requirements", re.compile(
+        r"((job |key |minimum |basic |preferred )?(requirements?|qualifications?)|what (you('|’)?ll|you will) (need|bring)"
+        r"|what we('|’)?re looking for|what we look for|who you are|about you|(skills|experience)( (and|&) (experience|qualifications|skills))?"
+        r"|must[- ]haves?|nice[- ]to[- ]haves?|you (have|bring|should have)|ideal candidate|your profile)", re.I)),
+    ("about_us", re.compile(
+        r"(about (us|[\w&.' -]{1,40})|who we are|company (overview|description|profile)"
+        r"|overview|our company|the company)", re.I)),
+]
+_MAX_HEADING_WORDS = 8
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def _clean(fragment: str) -> str:
+    return html_to_text(fragment)
+
+
+def _element_inner(markup: str, open_match: "re.Match") -> Optional[str]:
+    """Inner HTML of the div opened at open_match, or None if it is never closed (truncated page)."""
+    depth = 1
+    for m in _DIV_TOKEN_RE.finditer(markup, open_match.end()):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            return markup[open_match.end():m.start()]
+    return None
+
+
+def description_block(markup: str) -> Optional[str]:
+    for regex in _DESCRIPTION_OPEN_RES:
+        m = regex.search(markup)
+        if m:
+            inner = _element_inner(markup, m)
+            if inner is not None:
+                return inner
+    return None
+
+
+def _heading_kind(line: str) -> Optional[str]:
+    label = line.strip().rstrip(":：").strip()
+    if not label or len(label.split()) > _MAX_HEADING_WORDS:
+        return None
+    for kind, regex in _HEADINGS:
+        if regex.fullmatch(label):
+            return kind
+    return None
+
+
+def split_sections(block_html: str) -> Dict[str, Any]:
+    """Split a description block on its headings. Each section keeps its heading, like the LLM output."""
+    lines: List[str] = []
+    for piece in _LINE_BREAK_RE.split(block_html):
+        text = _clean(piece)
+        if text:
+            lines.append(text)
+    sections: Dict[str, List[str]] = {}
+    preamble: List[str] = []
+    current: Optional[str] = None
+    for line in lines:
+        kind = _heading_kind(line)
+        if kind:
+            current = kind
+        if current is None:
+            preamble.append(line)
+        else:
+            sections.setdefault(current, []).append(line)
+    if preamble:
+        # Text before the first heading is usually the company / role intro
+        target = "about_us" if "about_us" not in sections else "job_description"
+        sections[target] = preamble + sections.get(target, [])
+    out: Dict[str, Any] = {k: " ".join(v) for k, v in sections.items()}
+    out["complete"] = "job_description" in sections and "job_requirements" in sections
+    return out
+
+
+def linkedin_job_sections(markup: str) -> Optional[Dict[str, Any]]:
+    """Top-card fields plus the split description block; None when the page has no description block."""
+    block = description_block(markup)
+    if block is None:
+        return None
+    result: Dict[str, Any] = {"description_text": _clean(block)}
+    if not result["description_text"]:
+        return None
+    for field, regex in (("title", _TITLE_RE), ("company", _COMPANY_RE), ("location", _LOCATION_RE)):
+        m = regex.search(markup)
+        if m:
+            result[field] = _clean(m.group(1)) or None
+    for m in _CRITERIA_RE.finditer(markup):
+        field = _CRITERIA_FIELDS.get(_clean(m.group(1)).lower())
+        if field:
+            result[field] = _clean(m.group(2)) or None
+    result.update(split_sections(block))
+    return result
+
+
+def llm_input(sections: Dict[str, Any]) -> str:
+    """The reduced page text sent to the LLM: top-card lines plus the description block."""
+    header = [
+        f"{label}: {sections[field]}"
+        for field, label in (
+            ("title", "Title"),
+            ("company", "Company"),
+            ("location", "Location"),
+            ("employment_type", "Employment type"),
+            ("experience_level", "Seniority level"),
+        )
+        if sections.get(field)
+    ]
+    return "\n".join(header + ["About the job:", sections["description_text"]])
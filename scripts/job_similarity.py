@@ -0,0 +1,265 @@
+"""
+TF-IDF similarity between LinkedIn profiles and job postings.
+
+The job corpus (title, about_us, job_description, job_requirements, skills)
+is tokenized once into a TF-IDF matrix: sublinear term frequency, smoothed
+idf, every job row L2-normalized, stop words and terms in more than --max-df
+of the jobs dropped. The matrix is kept term-major -- for every term, the
+sorted job positions that contain it and their weights, in the same CSR
+layout as skill_index.py -- so scoring a profile (headline, about,
+experience_text, skills) against all jobs is one sparse matrix-vector
+product: gather the postings of the profile's terms and accumulate
+weight x query weight per job with a bincount. Scores are cosine
+similarities. Batch scoring does the same for a chunk of profiles at once
+into a (profiles x jobs) block and takes the top k of every row.
+
+The matrix is saved as an uncompressed .npz and memory-mapped on load.
+
+    python scripts/job_similarity.py --jobs "prisma/data/job_description_cleaned/*.json" --out job_tfidf.npz
+    python scripts/job_similarity.py --index job_tfidf.npz --profiles profiles.json [--top 10]
+    python scripts/job_similarity.py --index job_tfidf.npz --text "python sql dashboards stakeholder reporting"
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmark_columnar import StringDictionary, decode_strings, map_npz
+from record_output import read_records, utc_timestamp
+from skill_index import csr_positions, load_jobs
+
+
+# Bumped when tokenization changes: queries must be tokenized like the indexed jobs
+INDEX_VERSION = 2
+# Words plus the symbols that matter in skill names: c++, c#, node.js, and a leading
+# dot before a letter when it does not follow a word (.net, but not "end.")
+_TOKEN_RE = re.compile(r"(?<![a-z0-9])\.(?=[a-z])[a-z0-9+#.]*[a-z0-9+#]|[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by for from has have in into is it its of on or our that the their them this "
+    "to was we were will with you your they he she his her who what which when where how all any can do not no so "
+    "than then there these those through up out about over also more most other some such only own same very".split()
+)
+JOB_TEXT_KEYS = ("title", "about_us", "job_description", "job_requirements", "skills")
+PROFILE_TEXT_KEYS = ("headline", "about", "experience_text", "skills")
+# Profiles per sparse product in score_batch. The cost is dominated by the postings
+# touched, which batching does not reduce; larger blocks only add memory traffic
+BATCH_CHUNK = 4
+
+
+def record_text(record: Dict[str, Any], keys: Sequence[str]) -> str:
+    parts = []
+    for key in keys:
+        value = record.get(key)
+        if isinstance(value, list):
+            value = "\n".join(str(v) for v in value if v is not None)
+        if isinstance(value, str) and value.strip():
+            parts.append(value.strip())
+    return "\n".join(parts)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class TfidfIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.meta: Dict[str, Any] = json.loads(bytes(arrays["meta"]).decode("utf-8"))
+        if self.meta.get("index_version") != INDEX_VERSION:
+            raise ValueError(f"unsupported TF-IDF index version {self.meta.get('index_version')}")
+        self.terms = {t: i for i, t in enumerate(decode_strings(arrays, "term"))}
+        self.job_ids = arrays["job_ids"]
+        self.urls = decode_strings(arrays, "url")
+        self.titles = decode_strings(arrays, "title")
+        self.idf = arrays["idf"]
+        self.offsets = arrays["postings.offsets"]
+        self.docs = arrays["postings.docs"]
+        self.weights = arrays["postings.weights"]
+        self.num_docs = len(self.urls)
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Iterable[str],
+        job_ids: Sequence[int],
+        urls: Optional[Sequence[str]] = None,
+        titles: Optional[Sequence[str]] = None,
+        min_df: int = 1,
+        max_df: float = 0.5,
+    ) -> "TfidfIndex":
+        """Build the term-major TF-IDF matrix of texts (one document per job id)."""
+        vocab: Dict[str, int] = {}
+        term_ids = array("i")
+        doc_ids = array("i")
+        num_docs = 0
+        for doc, text in enumerate(texts):
+            ids = [vocab.setdefault(t, len(vocab)) for t in tokenize(text)]
+            term_ids.extend(ids)
+            doc_ids.extend([doc] * len(ids))
+            num_docs = doc + 1
+        if num_docs != len(job_ids):
+            raise ValueError(f"{num_docs} texts but {len(job_ids)} job ids")
+        vocab_size = max(1, len(vocab))
+        # (doc, term) pairs with their counts in one sort
+        pairs, tf = np.unique(np.frombuffer(doc_ids, np.int32).astype(np.int64) * vocab_size + np.frombuffer(term_ids, np.int32), return_counts=True)
+        doc, term = pairs // vocab_size, pairs % vocab_size
+        df = np.bincount(term, minlength=len(vocab))
+        keep_terms = (df >= min_df) & (df <= max(1.0, max_df * num_docs))
+        new_id = np.cumsum(keep_terms) - 1
+        keep = keep_terms[term]
+        doc, term, tf = doc[keep], new_id[term[keep]], tf[keep]
+        df = df[keep_terms]
+        idf = np.log((1 + num_docs) / (1 + df)) + 1.0
+        weights = (1.0 + np.log(tf)) * idf[term]
+        norms = np.sqrt(np.bincount(doc, weights=weights * weights, minlength=num_docs))
+        weights = weights / np.where(norms > 0, norms, 1.0)[doc]
+        # Term-major (CSC) layout: the postings of term t are offsets[t]:offsets[t + 1], docs ascending
+        order = np.lexsort((doc, term))
+        offsets = np.zeros(len(df) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term, minlength=len(df)), out=offsets[1:])
+
+        kept_terms = StringDictionary()
+        for t, i in vocab.items():
+            if keep_terms[i]:
+                kept_terms.encode(t)
+        arrays: Dict[str, np.ndarray] = {
+            "job_ids": np.asarray(job_ids, dtype=np.int32),
+            "idf": idf.astype(np.float32),
+            "postings.offsets": offsets,
+            "postings.docs": doc[order].astype(np.int32),
+            "postings.weights": weights[order].astype(np.float32),
+        }
+        urls_dict, titles_dict = StringDictionary(), StringDictionary()
+        urls_dict.values.extend(urls if urls is not None else [""] * num_docs)
+        titles_dict.values.extend(titles if titles is not None else [""] * num_docs)
+        for column, d in (("term", kept_terms), ("url", urls_dict), ("title", titles_dict)):
+            for suffix, arr in d.arrays().items():
+                arrays[f"{column}.{suffix}"] = arr
+        meta = {
+            "index_version": INDEX_VERSION,
+            "generated_at": utc_timestamp(),
+            "docs": num_docs,
+            "terms": len(df),
+            "nonzeros": int(len(doc)),
+            "min_df": min_df,
+            "max_df": max_df,
+        }
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        return cls(arrays)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, **self.arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfIndex":
+        return cls(map_npz(path))
+
+    def query_vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(term ids, L2-normalized weights) of text, over the indexed vocabulary."""
+        counts = Counter(self.terms[t] for t in tokenize(text) if t in self.terms)
+        if not counts:
+            return np.zeros(0, np.int64), np.zeros(0)
+        ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        weights = (1.0 + np.log(tf)) * self.idf[ids]
+        return ids, weights / np.linalg.norm(weights)
+
+    def score(self, text: str) -> np.ndarray:
+        """Cosine similarity of text with every job (one sparse matrix-vector product)."""
+        ids, q = self.query_vector(text)
+        pos = csr_positions(self.offsets, ids)
+        lengths = self.offsets[ids + 1] - self.offsets[ids]
+        return np.bincount(self.docs[pos], weights=self.weights[pos] * np.repeat(q, lengths), minlength=self.num_docs)
+
+    def _matches(self, scores: np.ndarray, top: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {"job_id": int(self.job_ids[i]), "url": self.urls[i], "title": self.titles[i], "score": round(float(scores[i]), 4)}
+            for i in top.tolist() if scores[i] > 0
+        ]
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores along the last axis, best first."""
+        k = min(k, scores.shape[-1])
+        if k <= 0:
+            return np.zeros(scores.shape[:-1] + (0,), np.int64)
+        part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(part, order, axis=-1)
+
+    def top_k(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        scores = self.score(text)
+        return self._matches(scores, self._top(scores, k))
+
+    def score_batch(self, texts: Sequence[str], k: int = 10, chunk: int = BATCH_CHUNK) -> List[List[Dict[str, Any]]]:
+        """top_k for many texts, scoring `chunk` of them per sparse product."""
+        results: List[List[Dict[str, Any]]] = []
+        for start in range(0, len(texts), chunk):
+            block = texts[start:start + chunk]
+            vectors = [self.query_vector(t) for t in block]
+            ids = np.concatenate([v[0] for v in vectors])
+            q = np.concatenate([v[1] for v in vectors])
+            rows = np.repeat(np.arange(len(block)), [len(v[0]) for v in vectors])
+            pos = csr_positions(self.offsets, ids)
+            lengths = self.offsets[ids + 1] - self.offsets[ids]
+            flat = np.repeat(rows, lengths) * self.num_docs + self.docs[pos]
+            scores = np.bincount(flat, weights=self.weights[pos] * np.repeat(q, lengths), minlength=len(block) * self.num_docs)
+            scores = scores.reshape(len(block), self.num_docs)
+            top = self._top(scores, k)
+            results.extend(self._matches(scores[r], top[r]) for r in range(len(block)))
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build a TF-IDF job index, or rank jobs for profiles against one")
+    parser.add_argument("--jobs", nargs="*", default=[], help="Job files (or globs) to index: classified JSON or --jobs output")
+    parser.add_argument("--out", type=str, default=None, help="Save the built index here (.npz)")
+    parser.add_argument("--max-df", type=float, default=0.5, help="Drop terms found in more than this share of jobs")
+    parser.add_argument("--min-df", type=int, default=1, help="Drop terms found in fewer jobs than this")
+    parser.add_argument("--index", type=str, default=None, help="Load a saved index instead of building one")
+    parser.add_argument("--profiles", nargs="*", default=[], help="Profile output files (wrapped JSON or NDJSON) to rank jobs for")
+    parser.add_argument("--text", type=str, default=None, help="Rank jobs for this free text")
+    parser.add_argument("--top", type=int, default=10, help="Jobs returned per profile")
+    args = parser.parse_args()
+
+    if args.index:
+        index = TfidfIndex.load(args.index)
+    elif args.jobs:
+        t0 = time.perf_counter()
+        jobs = load_jobs(args.jobs)
+        index = TfidfIndex.fit(
+            (record_text(job, JOB_TEXT_KEYS) for _, job, _ in jobs),
+            [job_id for job_id, _, _ in jobs],
+            [job.get("url") or "" for _, job, _ in jobs],
+            [job.get("title") or "" for _, job, _ in jobs],
+            min_df=args.min_df,
+            max_df=args.max_df,
+        )
+        m = index.meta
+        print(f"[tfidf] {m['docs']} jobs, {m['terms']} terms, {m['nonzeros']} nonzeros in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+        if args.out:
+            index.save(args.out)
+            print(f"Saved TF-IDF index to {args.out}", file=sys.stderr)
+    else:
+        parser.error("pass --index, or --jobs to build one")
+
+    if args.text:
+        print(json.dumps(index.top_k(args.text, args.top), indent=2, ensure_ascii=False))
+    if args.profiles:
+        profiles = [p for path in args.profiles for p in read_records(path)]
+        t0 = time.perf_counter()
+        ranked = index.score_batch([record_text(p, PROFILE_TEXT_KEYS) for p in profiles], args.top)
+        print(f"[tfidf] scored {len(profiles)} profiles in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+        print(json.dumps([{"url": p.get("url"), "matches": r} for p, r in zip(profiles, ranked)], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
 import os
 import sys
 import json
-import time
 import argparse
 import re
-from typing import Any, Dict, List, Optional, Iterable
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Iterable
 
 import requests
 
+from checkpoint import CheckpointJournal
+from http_cache import ResponseCache
+from html_text import stream_html_text
+from http_client import configure_client, get_client
+from job_pipeline import Finished, Pipeline, Stage
+from job_sections import estimate_tokens, linkedin_job_sections, llm_input
+from llm_cache import LLMCache, prompt_key
+from llm_schema import Field, describe, extract_structured
+from near_dup import NearDuplicateIndex
+from record_output import NDJSONWriter, compact_ndjson, write_wrapped_json
+from seen_jobs import SeenJobs, canonical_job_key
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -31,6 +45,39 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Path to save JSON output (prints to stdout if omitted)",
     )
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["json", "ndjson", "npz"],
+        default="json",
+        help=(
+            "json: one wrapped payload at the end; ndjson: stream one record per line as it completes; "
+            "npz: with --benchmark and --out, dictionary-encoded columnar file (needs numpy, see benchmark_columnar.py)"
+        ),
+    )
+    parser.add_argument(
+        "--json-out",
+        type=str,
+        default=None,
+        help="With --format ndjson and --out, also compact the stream into the wrapped JSON payload at this path",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=1,
+        help="Flush the NDJSON stream every N records",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=".linkedin_checkpoint.sqlite",
+        help="Journal of finished searches, jobs and profiles used by --resume",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip work already recorded in --checkpoint and merge it into this run's output",
+    )
     parser.add_argument(
         "--ai",
         action="store_true",
@@ -87,6 +134,29 @@ def parse_args() -> argparse.Namespace:
         default='Singapore',
         help="Region/country filter for jobs (e.g., 'Singapore')",
     )
+    parser.add_argument(
+        "--seen-jobs",
+        type=str,
+        default=None,
+        help="SQLite file of jobs processed by earlier runs (keyed by canonical job ID); those are skipped before fetching",
+    )
+    parser.add_argument(
+        "--near-dup-threshold",
+        type=float,
+        default=0.85,
+        help="Jobs whose description is at least this similar (MinHash Jaccard) to an earlier one reuse its extraction; 0 disables",
+    )
+    parser.add_argument(
+        "--near-dup-index",
+        type=str,
+        default=None,
+        help="JSON file keeping the near-duplicate index (and cluster extractions) across runs",
+    )
+    parser.add_argument(
+        "--no-local-sections",
+        action="store_true",
+        help="Send the whole job page to the LLM instead of the locally extracted LinkedIn 'About the job' block",
+    )
     parser.add_argument(
         "--jobs-literal",
         action="store_true",
@@ -103,6 +173,76 @@ def parse_args() -> argparse.Namespace:
         default=5,
         help="Number of jobs to fetch per role when --jobs-balanced is enabled",
     )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=4,
+        help="Max concurrent job page fetches in --jobs mode",
+    )
+    parser.add_argument(
+        "--llm-workers",
+        type=int,
+        default=4,
+        help="Max concurrent OpenAI extraction calls in --jobs mode",
+    )
+    parser.add_argument(
+        "--categorize-batch",
+        type=int,
+        default=50,
+        help="Skills per OpenAI request when categorizing benchmark skills with --ai (ndjson output holds profiles back until a batch is full)",
+    )
+    parser.add_argument(
+        "--skill-taxonomy",
+        type=str,
+        default=None,
+        help="JSON file of category -> keywords (priority order) for heuristic skill categorization",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Keep-alive connections to keep open per host",
+    )
+    parser.add_argument(
+        "--http-cache",
+        type=str,
+        default=None,
+        help="Directory for the on-disk HTTP response cache (search results and job pages)",
+    )
+    parser.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=24 * 3600,
+        help="Seconds before a cached response is revalidated with a conditional GET",
+    )
+    parser.add_argument(
+        "--http-cache-max-mb",
+        type=int,
+        default=512,
+        help="Size limit of the HTTP cache; least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Replay responses from --http-cache only; never touch the network",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        type=str,
+        default=".llm_cache.sqlite",
+        help="SQLite file caching OpenAI completions by prompt hash",
+    )
+    parser.add_argument(
+        "--llm-cache-max-entries",
+        type=int,
+        default=100_000,
+        help="Least recently used completions beyond this count are evicted",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call OpenAI, bypassing the completion cache",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -111,46 +251,85 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _iter_dicts(obj):
-    if isinstance(obj, dict):
-        yield obj
-        for v in obj.values():
-            yield from _iter_dicts(v)
-    elif isinstance(obj, list):
-        for it in obj:
-            yield from _iter_dicts(it)
-
-
-def _first_text(data: Dict[str, Any], keys: List[str]) -> Optional[str]:
-    for d in _iter_dicts(data):
-        for k in keys:
-            if k in d:
-                v = d.get(k)
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-                if isinstance(v, dict):
-                    t = v.get("text") or v.get("summary") or v.get("content")
-                    if isinstance(t, str) and t.strip():
-                        return t.strip()
-    return None
+def http_request(method: str, url: str, **kwargs) -> requests.Response:
+    """Issue a request through the shared pooled, rate-limited client."""
+    return get_client().request(method, url, **kwargs)
+
 
+class PayloadIndex:
+    """Key index over a nested JSON payload, built in one pre-order walk.
 
-def _collect_list_items(data: Dict[str, Any], candidate_keys: List[str]) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    for d in _iter_dicts(data):
-        for k in candidate_keys:
-            v = d.get(k)
-            if isinstance(v, list):
-                for it in v:
-                    if isinstance(it, dict):
-                        items.append(it)
-            if isinstance(v, dict):
+    Answers the two lookups the profile parser needs -- the first usable text
+    under any of some keys (optionally within one sub-dict) and all dict items
+    of list-valued keys -- with the same dict visiting order (a dict, then its
+    values depth-first) and key priority as walking the payload per lookup.
+    """
+
+    def __init__(self, data: Any):
+        self.span: Dict[int, tuple] = {}
+        self.text: Dict[str, List[tuple]] = {}
+        self.lists: Dict[str, List[tuple]] = {}
+        self._order = 0
+        self._visit(data)
+        self._text_orders = {k: [o for o, _ in entries] for k, entries in self.text.items()}
+
+    def _visit(self, obj: Any) -> None:
+        if isinstance(obj, list):
+            for it in obj:
+                if isinstance(it, (dict, list)):
+                    self._visit(it)
+            return
+        if not isinstance(obj, dict):
+            return
+        order = self._order
+        self._order += 1
+        children = []
+        # Index every key of this dict before descending, so per-key entries stay in visiting order
+        for k, v in obj.items():
+            if isinstance(v, str):
+                if v.strip():
+                    self.text.setdefault(k, []).append((order, v.strip()))
+            elif isinstance(v, dict):
+                t = v.get("text") or v.get("summary") or v.get("content")
+                if isinstance(t, str) and t.strip():
+                    self.text.setdefault(k, []).append((order, t.strip()))
                 inner = v.get("items") or v.get("list")
                 if isinstance(inner, list):
-                    for it in inner:
-                        if isinstance(it, dict):
-                            items.append(it)
-    return items
+                    self.lists.setdefault(k, []).append((order, inner))
+                children.append(v)
+            elif isinstance(v, list):
+                self.lists.setdefault(k, []).append((order, v))
+                children.append(v)
+        for child in children:
+            self._visit(child)
+        self.span[id(obj)] = (order, self._order - 1)
+
+    def first_text(self, keys: List[str], within: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """First non-blank text under any of `keys`: earliest dict wins, then earlier key."""
+        lo, hi = self.span[id(within)] if within is not None else (0, float("inf"))
+        best = None
+        value = None
+        for rank, k in enumerate(keys):
+            orders = self._text_orders.get(k)
+            if not orders:
+                continue
+            i = bisect_left(orders, lo)
+            if i < len(orders) and orders[i] <= hi and (best is None or (orders[i], rank) < best):
+                best = (orders[i], rank)
+                value = self.text[k][i][1]
+        return value
+
+    def list_items(self, keys: List[str]) -> List[Dict[str, Any]]:
+        """Dict items of every list under `keys` (or their items/list wrapper), in visiting order."""
+        found = sorted(
+            (order, rank, seq)
+            for rank, k in enumerate(keys)
+            for seq, (order, _) in enumerate(self.lists.get(k, []))
+        )
+        items: List[Dict[str, Any]] = []
+        for _, rank, seq in found:
+            items.extend(it for it in self.lists[keys[rank]][seq][1] if isinstance(it, dict))
+        return items
 
 
 def serp_search_google(api_key: str, query: str, num: int, debug: bool = False) -> List[Dict[str, Any]]:
@@ -162,7 +341,7 @@ def serp_search_google(api_key: str, query: str, num: int, debug: bool = False)
         "hl": "en",
         "gl": "us",
     }
-    resp = requests.get("https://serpapi.com/search.json", params=params, timeout=30)
+    resp = http_request("GET", "https://serpapi.com/search.json", params=params, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     if debug:
@@ -182,11 +361,65 @@ def serp_search_google(api_key: str, query: str, num: int, debug: bool = False)
     return results
 
 
+CSE_URL = "https://www.googleapis.com/customsearch/v1"
+# Google CSE returns at most 10 results per request and serves start=1..91
+CSE_PAGE_SIZE = 10
+CSE_MAX_PAGES = 10
+# Matches the googleapis.com burst in rate_limiter.DEFAULT_HOST_LIMITS
+CSE_MAX_IN_FLIGHT = 4
+
+
+def _cse_page(params: Dict[str, Any], debug: bool) -> Optional[List[Dict[str, Any]]]:
+    """One CSE request; its items, or None when the request failed."""
+    try:
+        resp = http_request("GET", CSE_URL, params=params, timeout=30)
+        if resp.status_code == 429 and debug:
+            print("[debug] Google CSE rate-limited", file=sys.stderr)
+        if resp.status_code >= 400:
+            if debug:
+                print(f"[debug] Google CSE error {resp.status_code} for q={params.get('q')!r} start={params.get('start')}: {resp.text[:200]}", file=sys.stderr)
+            return None
+        return (resp.json() or {}).get("items") or []
+    except (requests.RequestException, ValueError) as e:
+        if debug:
+            print(f"[debug] Google CSE request failed for q={params.get('q')!r} start={params.get('start')}: {e}", file=sys.stderr)
+        return None
+
+
+def fetch_cse_pages(pages: List[Dict[str, Any]], debug: bool = False) -> Iterator[Optional[List[Dict[str, Any]]]]:
+    """Request CSE pages concurrently and yield their items (None for a failed page) in page order.
+
+    The per-host rate limiter still paces the requests. When the caller stops
+    iterating (enough results, or an empty page), pages not yet sent are cancelled.
+    """
+    if not pages:
+        return
+    with ThreadPoolExecutor(max_workers=min(CSE_MAX_IN_FLIGHT, len(pages))) as pool:
+        futs = [pool.submit(_cse_page, params, debug) for params in pages]
+        try:
+            for fut in futs:
+                yield fut.result()
+        finally:
+            for fut in futs:
+                fut.cancel()
+
+
+def _cse_offsets(num: int) -> List[tuple]:
+    """(start, page size) for the pages covering the first `num` results (capped at 50)."""
+    remaining = max(1, min(num, 50))
+    offsets = []
+    start = 1
+    while remaining > 0 and start <= 1 + CSE_PAGE_SIZE * (CSE_MAX_PAGES - 1):
+        offsets.append((start, min(CSE_PAGE_SIZE, remaining)))
+        remaining -= CSE_PAGE_SIZE
+        start += CSE_PAGE_SIZE
+    return offsets
+
+
 def google_search_jobs(api_key: str, cse_id: str, query: str, num: int, debug: bool = False) -> List[Dict[str, Any]]:
     """Search for job listings using Google CSE with job-specific queries"""
     results: List[Dict[str, Any]] = []
-    remaining = max(1, min(num, 50))
-    start = 1
+    num = max(1, min(num, 50))
 
     # Ensure Singapore hint is present
     region_hint = " Singapore" if "singapore" not in query.lower() else ""
@@ -198,52 +431,44 @@ def google_search_jobs(api_key: str, cse_id: str, query: str, num: int, debug: b
         f'"{query}{region_hint}" hiring',
         f'"{query}{region_hint}" position',
     ]
-
-    for pattern in job_patterns:
-        if len(results) >= num:
-            break
-
-        params = {
+    # Look for job-related URLs including SG portals
+    allowed_domains = [
+        "linkedin.com/jobs",
+        "sg.linkedin.com/jobs",
+        "indeed.com",
+        "indeed.com.sg",
+        "glassdoor.com",
+        "glassdoor.com.sg",
+        "greenhouse.io",
+        "lever.co",
+        "ziprecruiter.com",
+        "monster.com",
+        "mycareersfuture.gov.sg",
+        "jobsdb.com",
+        "jobstreet.com",
+        "jobstreet.com.sg",
+        "jobscentral.com.sg",
+    ]
+    pages = [
+        {
             "key": api_key,
             "cx": cse_id,
             "q": pattern,
-            "num": min(10, remaining),
-            "start": start,
+            "num": min(CSE_PAGE_SIZE, num),
+            "start": 1 + CSE_PAGE_SIZE * i,
             "hl": "en",
             "gl": "sg",  # bias to Singapore
             "cr": "countrySG",  # restrict country
         }
-
-        try:
-            resp = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=30)
-            if resp.status_code >= 400:
-                if debug:
-                    print(f"[debug] Google CSE error {resp.status_code} for pattern: {pattern}", file=sys.stderr)
-                continue
-
-            data = resp.json() or {}
-            items = data.get("items", [])
-
-            for item in items:
+        for i, pattern in enumerate(job_patterns)
+    ]
+    # Later patterns are only a fallback: each wave sends as many as are still needed if every page is full
+    while pages and len(results) < num:
+        needed = -(-(num - len(results)) // CSE_PAGE_SIZE)
+        wave, pages = pages[:needed], pages[needed:]
+        for items in fetch_cse_pages(wave, debug=debug):
+            for item in items or []:
                 link = item.get("link", "").lower()
-                # Look for job-related URLs including SG portals
-                allowed_domains = [
-                    "linkedin.com/jobs",
-                    "sg.linkedin.com/jobs",
-                    "indeed.com",
-                    "indeed.com.sg",
-                    "glassdoor.com",
-                    "glassdoor.com.sg",
-                    "greenhouse.io",
-                    "lever.co",
-                    "ziprecruiter.com",
-                    "monster.com",
-                    "mycareersfuture.gov.sg",
-                    "jobsdb.com",
-                    "jobstreet.com",
-                    "jobstreet.com.sg",
-                    "jobscentral.com.sg",
-                ]
                 if any(domain in link for domain in allowed_domains):
                     results.append({
                         "title": item.get("title"),
@@ -252,25 +477,16 @@ def google_search_jobs(api_key: str, cse_id: str, query: str, num: int, debug: b
                     })
                     if len(results) >= num:
                         break
-
-        except Exception as e:
-            if debug:
-                print(f"[debug] Error searching pattern '{pattern}': {e}", file=sys.stderr)
-
-        start += 10
-        remaining = num - len(results)
+            if len(results) >= num:
+                break
 
     return results[:num]
 
 
 def google_cse_search(api_key: str, cse_id: str, query: str, num: int, debug: bool = False) -> List[Dict[str, Any]]:
-    # Google Custom Search returns at most 10 results per request; paginate with start
-    results: List[Dict[str, Any]] = []
-    remaining = max(1, min(num, 50))  # cap to 50 to be safe
-    start = 1
-    while remaining > 0 and start <= 91:  # start can be 1..91 for 10/page
-        page_size = min(10, remaining)
-        params = {
+    # Google Custom Search returns at most 10 results per request; all pages are fetched at once
+    pages = [
+        {
             "key": api_key,
             "cx": cse_id,
             "q": f"site:linkedin.com/in {query}",
@@ -279,15 +495,13 @@ def google_cse_search(api_key: str, cse_id: str, query: str, num: int, debug: bo
             "hl": "en",
             "gl": "us",
         }
-        resp = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=30)
-        if resp.status_code == 429 and debug:
-            print("[debug] Google CSE rate-limited", file=sys.stderr)
-        if resp.status_code >= 400:
-            if debug:
-                print(f"[debug] Google CSE error {resp.status_code}: {resp.text[:200]}", file=sys.stderr)
+        for start, page_size in _cse_offsets(num)
+    ]
+    results: List[Dict[str, Any]] = []
+    for items in fetch_cse_pages(pages, debug=debug):
+        # An empty or failed page ends the result list; later pages are dropped
+        if not items:
             break
-        data = resp.json() or {}
-        items = data.get("items") or []
         for it in items:
             link = it.get("link")
             if link and "linkedin.com/in/" in link:
@@ -296,21 +510,13 @@ def google_cse_search(api_key: str, cse_id: str, query: str, num: int, debug: bo
                     "link": link,
                     "snippet": (it.get("snippet") or it.get("title") or ""),
                 })
-        remaining -= len(items)
-        start += 10
-        if not items:
-            break
     return results
 
 
 def google_cse_query(api_key: str, cse_id: str, query: str, num: int, debug: bool = False) -> List[Dict[str, Any]]:
-    """Single Google CSE call with the provided query, minimal processing, return items as results."""
-    results: List[Dict[str, Any]] = []
-    remaining = max(1, min(num, 50))
-    start = 1
-    while remaining > 0 and start <= 91:
-        page_size = min(10, remaining)
-        params = {
+    """Google CSE with the provided query, minimal processing, return items as results."""
+    pages = [
+        {
             "key": api_key,
             "cx": cse_id,
             "q": query,
@@ -318,13 +524,12 @@ def google_cse_query(api_key: str, cse_id: str, query: str, num: int, debug: boo
             "start": start,
             "hl": "en",
         }
-        resp = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=30)
-        if resp.status_code >= 400:
-            if debug:
-                print(f"[debug] Google CSE error {resp.status_code}: {resp.text[:200]}", file=sys.stderr)
+        for start, page_size in _cse_offsets(num)
+    ]
+    results: List[Dict[str, Any]] = []
+    for items in fetch_cse_pages(pages, debug=debug):
+        if not items:
             break
-        data = resp.json() or {}
-        items = data.get("items") or []
         for it in items:
             link = it.get("link")
             if not link:
@@ -334,10 +539,6 @@ def google_cse_query(api_key: str, cse_id: str, query: str, num: int, debug: boo
                 "link": link,
                 "snippet": it.get("snippet") or "",
             })
-        remaining -= len(items)
-        start += 10
-        if not items:
-            break
     return results
 
 
@@ -353,71 +554,285 @@ def build_jobs_query(base_q: str, sites_csv: str) -> str:
     return f'({base_q}) {site_expr} ("Singapore" OR "SG")'
 
 
-def fetch_job_page_text(url: str, timeout: int = 30) -> str:
-    # Light-weight fetch; many sites render HTML server-side sufficiently for text extraction
+# ai_extract_job reads at most this much page text, so fetching stops once it is collected
+JOB_PAGE_TEXT_CHARS = 25000
+JOB_PAGE_MAX_BYTES = 4 * 1024 * 1024
+# Pages with less visible text than this are failed/blocked fetches, not postings
+MIN_JOB_PAGE_CHARS = 200
+JOB_HEADER_FIELDS = ("title", "company", "location", "employment_type", "experience_level")
+# Fields derived from the posting body, which near-duplicate pages share
+JOB_BODY_FIELDS = ("about_us", "job_description", "job_requirements", "skills", "hard_skills", "soft_skills")
+
+
+def fetch_job_page(
+    url: str,
+    timeout: int = 30,
+    max_chars: int = JOB_PAGE_TEXT_CHARS,
+    max_bytes: int = JOB_PAGE_MAX_BYTES,
+    local_sections: bool = True,
+) -> Dict[str, Any]:
+    """Fetch a job page once: {"text": visible text, "sections": LinkedIn about-the-job fields or None}."""
+    # Light-weight fetch; many sites render HTML server-side sufficiently for text extraction.
+    # The body is streamed through an incremental tokenizer (script/style dropped) and the
+    # download is abandoned once max_chars of visible text (or max_bytes) has been read.
+    # Streamed responses are not written to the --http-cache, which would read the whole body.
+    page: Dict[str, Any] = {"text": "", "sections": None}
+    keep_markup = local_sections and "linkedin.com/jobs/view" in url
     try:
         headers = {"User-Agent": "Mozilla/5.0 (compatible; JobScraper/1.0)"}
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        resp.raise_for_status()
-        text = resp.text
-        # crude cleanup: strip tags
-        text = re.sub(r"<script[\s\S]*?</script>", " ", text, flags=re.IGNORECASE)
-        text = re.sub(r"<style[\s\S]*?</style>", " ", text, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        resp = http_request("GET", url, headers=headers, timeout=timeout, stream=True)
+        try:
+            resp.raise_for_status()
+            # requests assumes ISO-8859-1 for text/* without a charset; job boards serve UTF-8
+            declared = "charset" in resp.headers.get("Content-Type", "").lower()
+            encoding = resp.encoding if declared and resp.encoding else "utf-8"
+            raw: List[bytes] = []
+            chunks = resp.iter_content(chunk_size=16 * 1024)
+            if keep_markup:
+                chunks = (raw.append(c) or c for c in chunks)
+            page["text"], _ = stream_html_text(chunks, encoding=encoding, max_chars=max_chars, max_bytes=max_bytes)
+        finally:
+            resp.close()
+        if raw:
+            page["sections"] = linkedin_job_sections(b"".join(raw).decode(encoding, errors="replace"))
     except Exception:
-        return ""
+        pass
+    return page
 
 
-def ai_extract_job(openai_api_key: str, model: str, page_text: str, timeout: int = 90) -> Dict[str, Any]:
-    if not page_text:
-        return {}
+def fetch_job_page_text(
+    url: str,
+    timeout: int = 30,
+    max_chars: int = JOB_PAGE_TEXT_CHARS,
+    max_bytes: int = JOB_PAGE_MAX_BYTES,
+) -> str:
+    return fetch_job_page(url, timeout, max_chars, max_bytes, local_sections=False)["text"]
+
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+# Durable prompt-hash cache for chat completions; set up in main()
+LLM_CACHE: Optional[LLMCache] = None
+
+
+def openai_chat(openai_api_key: str, model: str, messages: List[Dict[str, str]], temperature: float, timeout: int) -> str:
+    """Run a chat completion and return the message content, served from LLM_CACHE when possible."""
+    key = prompt_key(model, messages, temperature) if LLM_CACHE else None
+    if key:
+        cached = LLM_CACHE.get(key)
+        if cached is not None:
+            return cached
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    headers = {
+        "Authorization": f"Bearer {openai_api_key}",
+        "Content-Type": "application/json",
+    }
+    resp = http_request("POST", OPENAI_CHAT_URL, headers=headers, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    content = data["choices"][0]["message"]["content"] if data.get("choices") else ""
+    # Cached as received; callers forget_completion() answers they cannot validate
+    if key and content:
+        LLM_CACHE.put(key, model, content)
+    return content
+
+
+def forget_completion(model: str, messages: List[Dict[str, str]], temperature: float) -> None:
+    """Drop a cached completion that failed validation, so the prompt is asked again next time."""
+    if LLM_CACHE:
+        LLM_CACHE.delete(prompt_key(model, messages, temperature))
+
+
+# Extraction schemas: one call per record returns every key, validated by llm_schema
+_SKILL_FIELDS = [
+    Field("hard_skills", "list", description="technical skills: languages, frameworks, tools, platforms, methods"),
+    Field("soft_skills", "list", description="interpersonal / work-style skills stated in the text"),
+    Field("skills", "list", required=True, description="hard_skills followed by soft_skills"),
+]
+JOB_FIELDS = [
+    Field("title"),
+    Field("company"),
+    Field("location"),
+    Field("employment_type"),
+    Field("experience_level"),
+    Field("about_us", description="full text, not summarized"),
+    Field("job_description", description="full text, not summarized"),
+    Field("job_requirements", description="full text, not summarized"),
+] + _SKILL_FIELDS
+PROFILE_FIELDS = [
+    Field("job_title", description="the concise role title shown under the name (e.g. 'Software Engineer Intern')"),
+    Field("experience_level", description="one of intern, junior, mid, senior, unknown, inferred from title/years/keywords"),
+] + _SKILL_FIELDS
+# Repair turns allowed per extraction when the reply does not validate
+LLM_MAX_REPAIRS = 1
+
+
+def split_skills(obj: Dict[str, Any]) -> List[str]:
+    """extract_structured hook: normalize skills and make skills == hard_skills + soft_skills."""
+    hard = unique_merge_skills(obj.get("hard_skills"))
+    soft = unique_merge_skills(obj.get("soft_skills"))
+    known = {s.lower() for s in hard + soft}
+    # Skills the model only listed under `skills` are sorted locally rather than asked again
+    for s in unique_merge_skills(obj.get("skills")):
+        if s.lower() not in known:
+            (soft if categorize_skill_heuristic(s) == "Soft Skills" else hard).append(s)
+    obj["hard_skills"], obj["soft_skills"] = hard, soft
+    obj["skills"] = hard + soft
+    return []
+
+
+def job_extraction_messages(page_text: str) -> List[Dict[str, str]]:
     system_prompt = (
         "You are an expert recruiter. Extract the COMPLETE 'About the job' section from a job posting page text. "
         "IMPORTANT: Extract the FULL, COMPLETE text of these sections - do NOT summarize or shorten them: "
         "'About Us', 'Job Description', 'Job Requirement' (or 'Requirements'). "
         "Return EVERY detail, every bullet point, every requirement exactly as written. "
-        "Return a JSON object with: title, company, location, employment_type, experience_level, about_us, job_description, job_requirements, skills (array)."
+        "Also list the skills the job asks for, split into hard and soft skills. "
+        "Return a JSON object with these keys:\n" + describe(JOB_FIELDS)
     )
     user_prompt = (
-        "Page Text:\n\n" + page_text[:25000] + "\n\n" +
+        "Page Text:\n\n" + page_text[:JOB_PAGE_TEXT_CHARS] + "\n\n" +
         "Extract the COMPLETE 'About the job' section including About Us, Job Description, and Job Requirements. "
         "DO NOT SUMMARIZE - return the FULL TEXT exactly as it appears. Include all bullet points, requirements, and details. "
         "Return format strictly as JSON with all the keys specified."
     )
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.1,
-    }
-    headers = {
-        "Authorization": f"Bearer {openai_api_key}",
-        "Content-Type": "application/json",
-    }
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def job_skill_messages(text: str) -> List[Dict[str, str]]:
+    system_prompt = (
+        "You are an expert HR analyst. List the skills a job posting asks for, deduplicated, "
+        "split into hard (technical) and soft skills. Return ONLY a JSON object with these keys:\n"
+        + describe(_SKILL_FIELDS)
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": "Job posting:\n\n" + text[:JOB_PAGE_TEXT_CHARS]},
+    ]
+
+
+def prompt_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m.get("content") or "") for m in messages)
+
+
+def _chat_fn(openai_api_key: str, model: str, timeout: int) -> Callable[[List[Dict[str, str]]], str]:
+    return lambda messages: openai_chat(openai_api_key, model, messages, 0.1, timeout)
+
+
+def _reject_fn(model: str) -> Callable[[List[Dict[str, str]]], None]:
+    """extract_structured hook: drop replies that failed validation from LLM_CACHE (the _chat_fn temperature)."""
+    return lambda messages: forget_completion(model, messages, 0.1)
+
+
+def ai_extract_job(openai_api_key: str, model: str, page_text: str, timeout: int = 90) -> Dict[str, Any]:
+    """Every JOB_FIELDS key (skills split into hard/soft) from one extraction call; {} on failure."""
+    if not page_text:
+        return {}
     try:
-        resp = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data["choices"][0]["message"]["content"] if data.get("choices") else ""
-        try:
-            parsed = json.loads(content)
-        except Exception:
-            m = re.search(r"\{(?:.|\n)*\}", content)
-            parsed = json.loads(m.group(0)) if m else {}
-        if not isinstance(parsed, dict):
-            return {}
-        # Normalize skills array if present
-        skills = parsed.get("skills") if isinstance(parsed.get("skills"), list) else []
-        parsed["skills"] = [normalize_skill(str(x)) for x in skills if x]
-        return parsed
+        # Repairs quote the previous answer, which already carries the posting text
+        return extract_structured(
+            _chat_fn(openai_api_key, model, timeout), job_extraction_messages(page_text), JOB_FIELDS,
+            postprocess=split_skills, max_repairs=LLM_MAX_REPAIRS, reject=_reject_fn(model),
+        )
+    except Exception:
+        return {}
+
+
+def ai_extract_job_skills(openai_api_key: str, model: str, text: str, timeout: int = 60) -> Dict[str, Any]:
+    """hard_skills / soft_skills / skills for a posting whose sections were extracted locally; {} on failure."""
+    if not text or not text.strip():
+        return {}
+    try:
+        return extract_structured(
+            _chat_fn(openai_api_key, model, timeout), job_skill_messages(text), _SKILL_FIELDS,
+            postprocess=split_skills, context=text, max_repairs=LLM_MAX_REPAIRS, reject=_reject_fn(model),
+        )
     except Exception:
         return {}
 
 
+def parse_serpapi_profile(data: Dict[str, Any], profile_url: str) -> Dict[str, Any]:
+    """Normalize a SerpAPI linkedin_profile response into the scraper's profile shape."""
+    # One walk over the response; every field lookup below queries the index
+    index = PayloadIndex(data)
+    about = index.first_text(["about", "summary", "bio"]) or None
+    headline: Optional[str] = index.first_text(["headline", "title"]) or data.get("headline")
+    name: Optional[str] = (
+        data.get("name")
+        or data.get("full_name")
+        or (data.get("person") or {}).get("name")
+        or index.first_text(["name", "full_name"])
+    )
+    location: Optional[str] = (
+        index.first_text(["location", "country", "city", "region"]) or (data.get("person") or {}).get("location")
+    )
+    skills_field = data.get("skills")
+    if isinstance(skills_field, list):
+        skills = [s if isinstance(s, str) else (s.get("title") or s.get("name")) for s in skills_field]
+        skills = [s for s in skills if s]
+    else:
+        skills = data.get("skills_list") if isinstance(data.get("skills_list"), list) else None
+    # Collect experiences from multiple possible nests
+    experience_sections: List[str] = []
+    experiences_raw: List[Dict[str, Any]] = []
+    exp_items = index.list_items(["experience", "experiences", "positions", "work_experience", "work"])
+    for e in exp_items:
+        title = (e or {}).get("title") or (e or {}).get("position_title") or index.first_text(["title", "position_title"], within=e) or None
+        company = (e or {}).get("company") or (e or {}).get("company_name") or index.first_text(["company", "company_name"], within=e) or None
+        desc = (e or {}).get("description") or index.first_text(["description", "summary", "details"], within=e) or None
+        parts = [p for p in [title, company, desc] if p]
+        if parts:
+            experience_sections.append(" - ".join(parts))
+        experiences_raw.append({
+            "title": title,
+            "company": company,
+            "description": desc,
+            "start_date": (e or {}).get("start_date"),
+            "end_date": (e or {}).get("end_date"),
+            "location": (e or {}).get("location") or index.first_text(["location", "region", "city"], within=e) or None,
+        })
+    # Education
+    education_raw: List[Dict[str, Any]] = []
+    edu_items = index.list_items(["education", "educations", "schools", "education_list", "education_history"])
+    for ed in edu_items:
+        education_raw.append({
+            "school": (ed or {}).get("school") or (ed or {}).get("school_name") or index.first_text(["school", "school_name"], within=ed),
+            "degree": (ed or {}).get("degree_name") or (ed or {}).get("degree") or index.first_text(["degree_name", "degree"], within=ed),
+            "field": (ed or {}).get("field_of_study") or (ed or {}).get("field") or index.first_text(["field_of_study", "field"], within=ed),
+            "start_date": (ed or {}).get("start_date"),
+            "end_date": (ed or {}).get("end_date"),
+            "grade": (ed or {}).get("grade"),
+            "activities": (ed or {}).get("activities_and_societies") or (ed or {}).get("activities"),
+        })
+    # Courses
+    courses_raw: List[str] = []
+    crs_items = index.list_items(["courses", "course_list", "certifications", "licenses"])
+    for c in crs_items:
+        if isinstance(c, dict):
+            title = c.get("title") or c.get("name") or index.first_text(["title", "name"], within=c) or None
+            if title:
+                courses_raw.append(title)
+    return {
+        "name": name,
+        "headline": headline,
+        "about": about,
+        "skills": skills,
+        "location": location,
+        "experience_text": "\n".join(experience_sections) if experience_sections else None,
+        "experiences": experiences_raw or None,
+        "education": education_raw or None,
+        "courses": courses_raw or None,
+        "url": profile_url,
+    }
+
+
 def fetch_linkedin_profile(api_key: str, profile_url: str, debug: bool = False) -> Dict[str, Any]:
     params = {
         "engine": "linkedin_profile",
@@ -425,81 +840,12 @@ def fetch_linkedin_profile(api_key: str, profile_url: str, debug: bool = False)
         "api_key": api_key,
     }
     try:
-        resp = requests.get("https://serpapi.com/search.json", params=params, timeout=30)
+        resp = http_request("GET", "https://serpapi.com/search.json", params=params, timeout=30)
         resp.raise_for_status()
         data = resp.json()
         if debug and data.get("error"):
             print(f"[debug] Profile API error for {profile_url}: {data['error']}", file=sys.stderr)
-        # Use robust finders across nested shapes
-        about = _first_text(data, ["about", "summary", "bio"]) or None
-        headline: Optional[str] = _first_text(data, ["headline", "title"]) or data.get("headline")
-        name: Optional[str] = (
-            data.get("name")
-            or data.get("full_name")
-            or (data.get("person") or {}).get("name")
-            or _first_text(data, ["name", "full_name"])
-        )
-        location: Optional[str] = (
-            _first_text(data, ["location", "country", "city", "region"]) or (data.get("person") or {}).get("location")
-        )
-        skills_field = data.get("skills")
-        if isinstance(skills_field, list):
-            skills = [s if isinstance(s, str) else (s.get("title") or s.get("name")) for s in skills_field]
-            skills = [s for s in skills if s]
-        else:
-            skills = data.get("skills_list") if isinstance(data.get("skills_list"), list) else None
-        # Collect experiences from multiple possible nests
-        experience_sections: List[str] = []
-        experiences_raw: List[Dict[str, Any]] = []
-        exp_items = _collect_list_items(data, ["experience", "experiences", "positions", "work_experience", "work"])
-        for e in exp_items:
-            title = (e or {}).get("title") or (e or {}).get("position_title") or _first_text(e, ["title", "position_title"]) or None
-            company = (e or {}).get("company") or (e or {}).get("company_name") or _first_text(e, ["company", "company_name"]) or None
-            desc = (e or {}).get("description") or _first_text(e, ["description", "summary", "details"]) or None
-            parts = [p for p in [title, company, desc] if p]
-            if parts:
-                experience_sections.append(" - ".join(parts))
-            experiences_raw.append({
-                "title": title,
-                "company": company,
-                "description": desc,
-                "start_date": (e or {}).get("start_date"),
-                "end_date": (e or {}).get("end_date"),
-                "location": (e or {}).get("location") or _first_text(e, ["location", "region", "city"]) or None,
-            })
-        # Education
-        education_raw: List[Dict[str, Any]] = []
-        edu_items = _collect_list_items(data, ["education", "educations", "schools", "education_list", "education_history"])
-        for ed in edu_items:
-            education_raw.append({
-                "school": (ed or {}).get("school") or (ed or {}).get("school_name") or _first_text(ed, ["school", "school_name"]),
-                "degree": (ed or {}).get("degree_name") or (ed or {}).get("degree") or _first_text(ed, ["degree_name", "degree"]),
-                "field": (ed or {}).get("field_of_study") or (ed or {}).get("field") or _first_text(ed, ["field_of_study", "field"]),
-                "start_date": (ed or {}).get("start_date"),
-                "end_date": (ed or {}).get("end_date"),
-                "grade": (ed or {}).get("grade"),
-                "activities": (ed or {}).get("activities_and_societies") or (ed or {}).get("activities"),
-            })
-        # Courses
-        courses_raw: List[str] = []
-        crs_items = _collect_list_items(data, ["courses", "course_list", "certifications", "licenses"])
-        for c in crs_items:
-            if isinstance(c, dict):
-                title = c.get("title") or c.get("name") or _first_text(c, ["title", "name"]) or None
-                if title:
-                    courses_raw.append(title)
-        return {
-            "name": name,
-            "headline": headline,
-            "about": about,
-            "skills": skills,
-            "location": location,
-            "experience_text": "\n".join(experience_sections) if experience_sections else None,
-            "experiences": experiences_raw or None,
-            "education": education_raw or None,
-            "courses": courses_raw or None,
-            "url": profile_url,
-        }
+        return parse_serpapi_profile(data, profile_url)
     except Exception:
         return {"url": profile_url}
 
@@ -512,7 +858,7 @@ def fetch_profile_proxycurl(proxycurl_api_key: str, profile_url: str, debug: boo
             "url": profile_url,
             # minimal fields to keep latency/cost in check; default returns enough
         }
-        resp = requests.get("https://nubela.co/proxycurl/api/v2/linkedin", headers=headers, params=params, timeout=30)
+        resp = http_request("GET", "https://nubela.co/proxycurl/api/v2/linkedin", headers=headers, params=params, timeout=30)
         if resp.status_code == 429 and debug:
             print(f"[debug] Proxycurl rate-limited for {profile_url}", file=sys.stderr)
         resp.raise_for_status()
@@ -563,102 +909,29 @@ def unique_merge_skills(*skill_lists: Iterable[Optional[Iterable[Optional[str]]]
     return merged
 
 
-def ai_extract_skills(openai_api_key: str, model: str, text: str, timeout: int = 60) -> List[str]:
-    if not text or not text.strip():
-        return []
-    system_prompt = (
-        "You are an expert HR analyst. Extract a concise, deduplicated list of skills "
-        "from the provided LinkedIn-like profile text. Focus on technical skills "
-        "(e.g., programming languages, frameworks, libraries, tools, data techniques) "
-        "and relevant soft skills only if clearly stated. Return ONLY a JSON array of strings."
-    )
-    user_prompt = (
-        "Text:\n\n" + text.strip() + "\n\n" +
-        "Return format strictly as JSON array, e.g.: [\"Python\", \"SQL\", \"Data Visualization\"]"
-    )
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.1,
-    }
-    headers = {
-        "Authorization": f"Bearer {openai_api_key}",
-        "Content-Type": "application/json",
-    }
-    try:
-        resp = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data["choices"][0]["message"]["content"] if data.get("choices") else ""
-        # try to parse strict JSON first
-        try:
-            parsed = json.loads(content)
-            if isinstance(parsed, list):
-                return [normalize_skill(str(x)) for x in parsed if x]
-        except Exception:
-            pass
-        # fallback: extract first JSON array from text
-        match = re.search(r"\[(?:.|\n)*?\]", content)
-        if match:
-            try:
-                parsed = json.loads(match.group(0))
-                if isinstance(parsed, list):
-                    return [normalize_skill(str(x)) for x in parsed if x]
-            except Exception:
-                return []
-        return []
-    except Exception:
-        return []
-
-
 def ai_extract_profile(openai_api_key: str, model: str, context_text: str, timeout: int = 60) -> Dict[str, Any]:
-    """Ask AI to extract job_title, experience_level, and skills (array) from combined context."""
+    """Ask AI to extract job_title, experience_level, and skills (array, also split hard/soft) from combined context."""
     if not context_text or not context_text.strip():
         return {}
     system_prompt = (
-        "You are an expert HR analyst. From the provided LinkedIn-like text, extract:\n"
-        "- job_title: the concise role title shown under the name (e.g., 'Software Engineer Intern').\n"
-        "- experience_level: one of [intern, junior, mid, senior, unknown], inferred from title/years/keywords.\n"
-        "- skills: a concise, deduplicated array of skills (technical + explicit soft skills).\n"
-        "Return ONLY a JSON object with keys: job_title, experience_level, skills."
+        "You are an expert HR analyst. From the provided LinkedIn-like text, extract the person's role, "
+        "experience level and a concise, deduplicated list of skills (technical + explicit soft skills).\n"
+        "Return ONLY a JSON object with these keys:\n" + describe(PROFILE_FIELDS)
     )
     user_prompt = (
         "Text:\n\n" + context_text.strip() + "\n\n" +
-        "Return format strictly as JSON object, e.g.: {\"job_title\":\"Junior Data Analyst\",\"experience_level\":\"junior\",\"skills\":[\"Python\",\"SQL\"]}"
+        "Return format strictly as JSON object, e.g.: {\"job_title\":\"Junior Data Analyst\",\"experience_level\":\"junior\","
+        "\"hard_skills\":[\"Python\",\"SQL\"],\"soft_skills\":[\"Communication\"],\"skills\":[\"Python\",\"SQL\",\"Communication\"]}"
     )
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.1,
-    }
-    headers = {
-        "Authorization": f"Bearer {openai_api_key}",
-        "Content-Type": "application/json",
-    }
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
     try:
-        resp = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data["choices"][0]["message"]["content"] if data.get("choices") else ""
-        # parse strict JSON
-        try:
-            parsed = json.loads(content)
-        except Exception:
-            m = re.search(r"\{(?:.|\n)*\}", content)
-            parsed = json.loads(m.group(0)) if m else {}
-        if not isinstance(parsed, dict):
-            return {}
-        job_title = parsed.get("job_title")
-        experience_level = parsed.get("experience_level")
-        skills = parsed.get("skills") if isinstance(parsed.get("skills"), list) else []
-        skills = [normalize_skill(str(x)) for x in skills if x]
-        return {"job_title": job_title, "experience_level": experience_level, "skills": skills}
+        return extract_structured(
+            _chat_fn(openai_api_key, model, timeout), messages, PROFILE_FIELDS,
+            postprocess=split_skills, context=context_text.strip(), max_repairs=LLM_MAX_REPAIRS, reject=_reject_fn(model),
+        )
     except Exception:
         return {}
 
@@ -689,53 +962,139 @@ def extract_job_title_from_headline(headline: Optional[str]) -> Optional[str]:
 
 
 _CATEGORY_KEYWORDS: List[tuple] = [
-    ("Programming Languages", ["python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "sql", "r ", " r", "scala", "matlab"]),
-    ("Data & Analytics", ["sql", "excel", "tableau", "power bi", "pandas", "numpy", "matplotlib", "seaborn", "plotly", "data viz", "data visualization", "etl"]),
-    ("Machine Learning & AI", ["machine learning", "deep learning", "pytorch", "tensorflow", "scikit", "ml", "nlp", "computer vision", "xgboost", "catboost"]),
-    ("Cloud & DevOps", ["aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ci/cd"]),
-    ("Web & Backend", ["react", "next.js", "node", "express", "django", "flask", "spring", "rest", "graphql"]),
-    ("Tools", ["git", "github", "jira", "confluence", "linux", "bash", "vim"]),
+    ("Programming Languages", [
+        "python", "java", "javascript", "typescript", "c++", "c#", "go", "golang", "rust", "sql", "r", "scala", "matlab",
+        # Compound names the substring matcher used to catch through "sql"
+        "mysql", "mssql", "nosql", "postgresql", "postgres", "t-sql", "pl/sql",
+    ]),
+    ("Data & Analytics", ["sql", "database", "excel", "tableau", "power bi", "pandas", "numpy", "matplotlib", "seaborn", "plotly", "data viz", "data visualization", "etl"]),
+    ("Machine Learning & AI", ["machine learning", "deep learning", "pytorch", "tensorflow", "scikit", "scikit-learn", "ml", "mlops", "nlp", "computer vision", "xgboost", "catboost"]),
+    ("Cloud & DevOps", ["aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform", "ci/cd"]),
+    ("Web & Backend", ["react", "reactjs", "react.js", "next.js", "nextjs", "node", "nodejs", "node.js", "express", "expressjs", "django", "flask", "spring", "rest", "restful", "graphql"]),
+    ("Tools", ["git", "github", "gitlab", "jira", "confluence", "linux", "bash", "vim"]),
     ("Soft Skills", ["communication", "teamwork", "leadership", "problem solving", "critical thinking", "collaboration"]),
 ]
 
+SKILL_CATEGORIES = {"Programming Languages", "Data & Analytics", "Machine Learning & AI", "Cloud & DevOps", "Web & Backend", "Tools", "Soft Skills", "Other"}
+
+
+class SkillCategoryMatcher:
+    """All taxonomy keywords compiled into one whole-word regex.
+
+    A single scan over the skill finds every keyword hit; the category listed
+    earliest in the taxonomy wins, so "Google Cloud" no longer matches "go"
+    and "r" only matches the standalone token. A keyword may be followed by a
+    plural "s" ("Communications", "Databases") or a version number
+    ("Python3", "C++17"); compound names such as "MySQL" or "GitLab" have to
+    be listed in the taxonomy themselves.
+    """
+
+    def __init__(self, taxonomy: List[tuple]):
+        self.categories: List[str] = [c for c, _ in taxonomy]
+        self.rank: Dict[str, int] = {}
+        for i, (_, keywords) in enumerate(taxonomy):
+            for kw in keywords:
+                kw = kw.strip().lower()
+                if kw and kw not in self.rank:
+                    self.rank[kw] = i
+        # Longest first so "power bi" beats "bi" at the same position; custom
+        # boundaries because \b fails around symbols as in "c++" or ".net".
+        # Trailing digits are allowed for version suffixes; "&" keeps "R&D" from matching "r".
+        # The optional "s" sits outside the group so group(0) minus it is still the keyword.
+        alternation = "|".join(re.escape(kw) for kw in sorted(self.rank, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<![a-z0-9])({alternation})s?(?![a-z&])") if self.rank else None
+
+    def match(self, skill: str) -> str:
+        if not self.pattern:
+            return "Other"
+        best = len(self.categories)
+        for m in self.pattern.finditer(skill.lower()):
+            r = self.rank[m.group(1)]
+            if r < best:
+                best = r
+                if best == 0:
+                    break
+        return self.categories[best] if best < len(self.categories) else "Other"
+
+
+def load_skill_taxonomy(path: str) -> List[tuple]:
+    """Load a taxonomy JSON file: {"Category": ["kw", ...], ...} or [["Category", ["kw", ...]], ...], in priority order."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    items = data.items() if isinstance(data, dict) else data
+    return [(str(category), [str(kw) for kw in keywords]) for category, keywords in items]
+
+
+def use_skill_taxonomy(taxonomy: List[tuple]) -> None:
+    """Swap the taxonomy used by categorize_skill_heuristic."""
+    global _SKILL_MATCHER
+    _SKILL_MATCHER = SkillCategoryMatcher(taxonomy)
+
+
+_SKILL_MATCHER = SkillCategoryMatcher(_CATEGORY_KEYWORDS)
+
 
 def categorize_skill_heuristic(skill: str) -> str:
-    s = skill.lower()
-    for category, keywords in _CATEGORY_KEYWORDS:
-        for kw in keywords:
-            if kw in s:
-                return category
-    return "Other"
+    return _SKILL_MATCHER.match(skill)
 
 
-def ai_categorize_skill(openai_api_key: str, model: str, skill: str, timeout: int = 30) -> Optional[str]:
+def _ai_categorize_chunk(openai_api_key: str, model: str, skills: List[str], timeout: int) -> Dict[str, str]:
+    system_prompt = (
+        "Categorize each given skill into one high-level category from this set: "
+        "[Programming Languages, Data & Analytics, Machine Learning & AI, Cloud & DevOps, Web & Backend, Tools, Soft Skills, Other]. "
+        "Return ONLY a JSON object mapping every skill exactly as given to its category name."
+    )
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": "Skills:\n" + json.dumps(skills, ensure_ascii=False)},
+    ]
     try:
-        system_prompt = (
-            "Categorize the given skill into one high-level category from this set: "
-            "[Programming Languages, Data & Analytics, Machine Learning & AI, Cloud & DevOps, Web & Backend, Tools, Soft Skills, Other]. "
-            "Reply with ONLY the category name."
-        )
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Skill: {skill}"},
-            ],
-            "temperature": 0,
-        }
-        headers = {
-            "Authorization": f"Bearer {openai_api_key}",
-            "Content-Type": "application/json",
-        }
-        resp = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data["choices"][0]["message"]["content"].strip()
-        # Basic validation
-        allowed = {"Programming Languages", "Data & Analytics", "Machine Learning & AI", "Cloud & DevOps", "Web & Backend", "Tools", "Soft Skills", "Other"}
-        return content if content in allowed else None
+        content = openai_chat(openai_api_key, model, messages, 0, timeout)
     except Exception:
-        return None
+        return {}
+    try:
+        parsed = json.loads(content)
+    except Exception:
+        m = re.search(r"\{(?:.|\n)*\}", content)
+        try:
+            parsed = json.loads(m.group(0)) if m else {}
+        except Exception:
+            parsed = {}
+    # Only keep answers for skills we asked about, in the allowed category set
+    wanted = {s.lower() for s in skills}
+    categories = {
+        str(k).strip().lower(): v.strip()
+        for k, v in (parsed.items() if isinstance(parsed, dict) else ())
+        if isinstance(v, str) and v.strip() in SKILL_CATEGORIES and str(k).strip().lower() in wanted
+    }
+    if not categories:
+        forget_completion(model, messages, 0)
+    return categories
+
+
+def ai_categorize_skills(
+    openai_api_key: str,
+    model: str,
+    skills: Iterable[str],
+    batch_size: int = 50,
+    workers: int = 4,
+    timeout: int = 60,
+) -> Dict[str, str]:
+    """Categorize many skills with one request per batch. Returns lowercased skill -> category."""
+    unique: Dict[str, str] = {}
+    for s in skills:
+        if s and s.lower() not in unique:
+            unique[s.lower()] = s
+    names = list(unique.values())
+    size = max(1, batch_size)
+    chunks = [names[i:i + size] for i in range(0, len(names), size)]
+    categories: Dict[str, str] = {}
+    if not chunks:
+        return categories
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        for result in pool.map(lambda c: _ai_categorize_chunk(openai_api_key, model, c, timeout), chunks):
+            categories.update(result)
+    return categories
 
 
 def to_benchmark_records(
@@ -743,19 +1102,27 @@ def to_benchmark_records(
     ai: bool,
     openai_api_key: Optional[str],
     model: str,
+    batch_size: int = 50,
+    workers: int = 4,
+    category_cache: Optional[Dict[str, str]] = None,
 ) -> List[Dict[str, Any]]:
+    """Long-form benchmark rows, one per (profile, skill).
+
+    Pass the same `category_cache` across calls to reuse AI categories when records are built incrementally.
+    """
     records: List[Dict[str, Any]] = []
+    # One batched categorization pass over the deduplicated skills of all profiles
+    ai_categories: Dict[str, str] = category_cache if category_cache is not None else {}
+    if ai and openai_api_key:
+        all_skills = [s for p in profiles for s in (p.get("skills") or []) if s.lower() not in ai_categories]
+        ai_categories.update(ai_categorize_skills(openai_api_key, model, all_skills, batch_size=batch_size, workers=workers))
     for p in profiles:
         job_title = p.get("job_title_ai") or extract_job_title_from_headline(p.get("headline")) or "Unknown"
         exp = p.get("experience_level_ai") or infer_experience_level(" ".join([p.get("headline") or "", p.get("about") or ""])) or "unknown"
         region = (p.get("location") or "").strip()
         skills = p.get("skills") or []
         for s in skills:
-            category = categorize_skill_heuristic(s)
-            if ai and openai_api_key:
-                cat_ai = ai_categorize_skill(openai_api_key, model, s)
-                if cat_ai:
-                    category = cat_ai
+            category = ai_categories.get(s.lower()) or categorize_skill_heuristic(s)
             records.append({
                 # Required mapping for your benchmark table schema
                 "job_title": job_title,
@@ -768,6 +1135,29 @@ def to_benchmark_records(
     return records
 
 
+def profile_sections(p: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": p.get("headline"),
+        "about": p.get("about"),
+        "experiences": p.get("experiences"),
+        "education": p.get("education"),
+        "skills": p.get("skills"),
+        "courses": p.get("courses"),
+        "url": p.get("url"),
+    }
+
+
+def profile_compact_record(p: Dict[str, Any]) -> Dict[str, Any]:
+    """One benchmark record per profile with the skills array (no categories)."""
+    return {
+        "job_title": p.get("job_title_ai") or extract_job_title_from_headline(p.get("headline")) or "Unknown",
+        "experience_level": p.get("experience_level_ai") or infer_experience_level(" ".join([p.get("headline") or "", p.get("about") or ""])) or "unknown",
+        "region": (p.get("location") or "").strip(),
+        "skills": p.get("skills") or [],
+        "url": p.get("url"),
+    }
+
+
 DEFAULT_ROLES: List[str] = [
     "software engineer",
     "software developer",
@@ -811,10 +1201,45 @@ def _to_text(value: Any) -> str:
 
 
 def main() -> None:
+    global LLM_CACHE
     args = parse_args()
     # Normalize --jobs-q when provided as multiple tokens (nargs='+')
     if isinstance(getattr(args, "jobs_q", None), list):
         args.jobs_q = " ".join(args.jobs_q)
+    if args.json_out and not (args.format == "ndjson" and args.out):
+        print("--json-out requires --format ndjson and --out.", file=sys.stderr)
+        sys.exit(1)
+    if args.format == "npz" and not (args.benchmark and args.out and not args.jobs and not args.sections):
+        print("--format npz requires --benchmark and --out (profiles only).", file=sys.stderr)
+        sys.exit(1)
+    if args.offline and not args.http_cache:
+        print("--offline requires --http-cache.", file=sys.stderr)
+        sys.exit(1)
+    cache = ResponseCache(
+        args.http_cache,
+        ttl=args.http_cache_ttl,
+        max_bytes=args.http_cache_max_mb * 1024 * 1024,
+        offline=args.offline,
+    ) if args.http_cache else None
+    if args.skill_taxonomy:
+        use_skill_taxonomy(load_skill_taxonomy(args.skill_taxonomy))
+    configure_client(pool_size=max(args.pool_size, args.fetch_workers, args.llm_workers), cache=cache)
+    if not args.no_llm_cache:
+        LLM_CACHE = LLMCache(args.llm_cache, max_entries=args.llm_cache_max_entries)
+    journal = CheckpointJournal(args.checkpoint, resume=args.resume)
+    try:
+        run(args, journal)
+    finally:
+        if args.debug:
+            print(f"[debug] checkpoint: reused={journal.reused} units={journal.count()}", file=sys.stderr)
+        journal.close()
+        if LLM_CACHE:
+            if args.debug:
+                print(f"[debug] llm cache: {LLM_CACHE.stats()}", file=sys.stderr)
+            LLM_CACHE.close()
+
+
+def run(args: argparse.Namespace, journal: CheckpointJournal) -> None:
     serpapi_key = os.getenv("SERPAPI_API_KEY")
     google_api_key = os.getenv("GOOGLE_API_KEY")
     google_cse_id = os.getenv("GOOGLE_CSE_ID")
@@ -826,6 +1251,15 @@ def main() -> None:
         print("--ai provided but OPENAI_API_KEY is missing.", file=sys.stderr)
         sys.exit(1)
 
+    def search_checkpointed(key: str, search: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        # Replaying the stored results keeps the URL set (and quota) identical on resume
+        if journal.is_done("search", key):
+            return journal.get("search", key)
+        found = search()
+        if found:
+            journal.record("search", key, found)
+        return found
+
     # Jobs path: run first and return early
     if args.jobs:
         if not (google_api_key and google_cse_id):
@@ -833,51 +1267,232 @@ def main() -> None:
             sys.exit(1)
 
         jobs: List[Dict[str, Any]] = []
+        sink = NDJSONWriter(args.out, args.flush_every) if args.format == "ndjson" else None
+
+        def emit(job: Dict[str, Any]) -> None:
+            if sink:
+                sink.write(job)
+            else:
+                jobs.append(job)
+
+        prompt_savings = {"jobs": 0, "local": 0, "tokens": 0}
+        savings_lock = threading.Lock()
 
-        def discover_and_extract(q_literal: str, take: int) -> List[Dict[str, Any]]:
-            found = google_cse_query(google_api_key, google_cse_id, q_literal, take * 2, debug=args.debug)
+        def record_savings(url: str, page_text: str, sent: List[Dict[str, str]], local: bool) -> None:
+            # Input tokens the full-page prompt would have cost minus what was actually sent
+            saved = prompt_tokens(job_extraction_messages(page_text)) - prompt_tokens(sent)
+            with savings_lock:
+                prompt_savings["jobs"] += 1
+                prompt_savings["local"] += local
+                prompt_savings["tokens"] += saved
             if args.debug:
-                print(f"[debug] role query: {q_literal} results={len(found)}", file=sys.stderr)
-            picked = []
-            for i, r in enumerate(found[:take]):
-                url = r.get("link")
-                if not url:
-                    continue
-                if i > 0:
-                    time.sleep(1.0)
-                page_text = fetch_job_page_text(url)
-                job = {"url": url, "title": None, "company": None, "location": None, "employment_type": None, "experience_level": None, "about_us": None, "job_description": None, "job_requirements": None, "skills": []}
-                if openai_api_key:
-                    ai_job = ai_extract_job(openai_api_key, args.openai_model, page_text)
-                    job.update({k: v for k, v in ai_job.items() if k in job})
-                    # If AI extraction seems incomplete, add raw text as fallback
-                    if not job.get("job_description") or len(_to_text(job.get("job_description"))) < 200:
-                        job["raw_page_text"] = page_text[:5000]
-                    # Fallback: ensure skills are populated
-                    if not job.get("skills"):
-                        combined_text_parts = [
-                            _to_text(job.get("about_us")),
-                            _to_text(job.get("job_description")),
-                            _to_text(job.get("job_requirements")),
-                        ]
-                        combined_text = "\n".join([p for p in combined_text_parts if p]).strip()
-                        if combined_text:
-                            skills_fallback = ai_extract_skills(openai_api_key, args.openai_model, combined_text)
-                            if skills_fallback:
-                                job["skills"] = skills_fallback
+                how = "local sections, skills-only prompt" if local else "description block only"
+                print(f"[debug] job prompt: {how}; ~{saved} input tokens saved -> {url}", file=sys.stderr)
+
+        def extract_job(url: str, page: Dict[str, Any]) -> Dict[str, Any]:
+            page_text = page["text"]
+            sections = page.get("sections")
+            job = {"url": url, "title": None, "company": None, "location": None, "employment_type": None, "experience_level": None, "about_us": None, "job_description": None, "job_requirements": None, "skills": [], "hard_skills": [], "soft_skills": []}
+            # Local LinkedIn extraction: top-card fields are always used (they win over the LLM);
+            # the about/description/requirements split only when it is known to be complete
+            local = {}
+            if sections:
+                body_fields = ("about_us", "job_description", "job_requirements")
+                local = {
+                    k: v for k, v in sections.items()
+                    if k in job and v and (sections["complete"] or k not in body_fields)
+                }
+            fallback_text = sections["description_text"] if sections else page_text
+            if openai_api_key:
+                # Exactly one LLM round trip per job (plus a bounded repair turn if the reply is invalid)
+                if sections and sections["complete"]:
+                    llm_text = llm_input(sections)
+                    record_savings(url, page_text, job_skill_messages(llm_text), local=True)
+                    ai_job = ai_extract_job_skills(openai_api_key, args.openai_model, llm_text)
                 else:
-                    job["job_description"] = page_text[:5000]
-                # Singapore-only filter
-                loc_txt = _to_text(job.get("location")).lower()
-                page_txt_lc = page_text.lower() if isinstance(page_text, str) else ""
-                if args.jobs_region:
-                    want = args.jobs_region.lower()
-                    if (want not in loc_txt) and (want not in page_txt_lc):
-                        if args.debug:
-                            print(f"[debug] skip non-{args.jobs_region}: {job.get('location')} -> {url}", file=sys.stderr)
-                        continue
-                jobs.append(job)
-            return picked
+                    llm_text = llm_input(sections) if sections else page_text
+                    if sections:
+                        record_savings(url, page_text, job_extraction_messages(llm_text), local=False)
+                    ai_job = ai_extract_job(openai_api_key, args.openai_model, llm_text)
+                job.update({k: v for k, v in ai_job.items() if k in job and v})
+                job.update(local)
+                # If AI extraction seems incomplete, add raw text as fallback
+                if not job.get("job_description") or len(_to_text(job.get("job_description"))) < 200:
+                    job["raw_page_text"] = fallback_text[:5000]
+            else:
+                job.update(local)
+                if not (sections and sections["complete"]):
+                    job["job_description"] = fallback_text[:5000]
+            return job
+
+        # Jobs pipeline: each stage returns the record, None to drop it, or Finished(...) to
+        # skip the rest; settle() turns each result into the job emitted. Cheap filters run on
+        # the fetch workers, so the LLM pool only ever sees pages that will be emitted.
+        seen_keys = set()
+        seen_jobs = SeenJobs(args.seen_jobs) if args.seen_jobs else None
+
+        def dedupe(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            # Runs on the calling thread, so one set covers every query (and role) of the run
+            rec["url"] = rec["url"].strip().split("#", 1)[0]
+            rec["key"] = canonical_job_key(rec["url"])
+            if rec["key"] in seen_keys:
+                if args.debug:
+                    print(f"[debug] skip duplicate {rec['key']}: {rec['url']}", file=sys.stderr)
+                return None
+            seen_keys.add(rec["key"])
+            # Position across every query of the run; the near-duplicate stage ranks pages by it
+            rec["seq"] = len(seen_keys)
+            return rec
+
+        def resume(rec: Dict[str, Any]) -> Any:
+            if journal.is_done("job", rec["url"]):
+                return Finished(journal.get("job", rec["url"]))
+            return rec
+
+        def not_seen_before(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if seen_jobs is not None and rec["key"] in seen_jobs:
+                if args.debug:
+                    print(f"[debug] skip {rec['key']} seen in an earlier run: {rec['url']}", file=sys.stderr)
+                return None
+            return rec
+
+        def mark_seen(rec: Dict[str, Any]) -> None:
+            if seen_jobs is not None:
+                seen_jobs.add(rec["key"], rec["url"])
+
+        near_dups: Optional[NearDuplicateIndex] = None
+        if args.near_dup_threshold > 0:
+            if args.near_dup_index and os.path.exists(args.near_dup_index):
+                near_dups = NearDuplicateIndex.load(args.near_dup_index, threshold=args.near_dup_threshold)
+            else:
+                near_dups = NearDuplicateIndex(threshold=args.near_dup_threshold)
+        # Pages fetched so far this run, so a page can spot a near-duplicate ranked ahead of it
+        # whose extraction is still in flight; near_dups itself is only extended in input order
+        fetched_dups = NearDuplicateIndex(near_dups.threshold, near_dups.hasher.num_perm) if near_dups else None
+        fetched_seq: Dict[str, int] = {}
+        fetched_lock = threading.Lock()
+
+        def reuse_near_duplicate(rec: Dict[str, Any]) -> Any:
+            # Never waits: a page matching an earlier cluster, or a page ranked ahead of it, skips
+            # the LLM here and is settled against its cluster's extraction in settle()
+            if near_dups is None:
+                return rec
+            page = rec["page"]
+            rec["signature"] = near_dups.hasher.signature((page.get("sections") or {}).get("description_text") or page["text"])
+            if rec["signature"] is None:
+                return rec
+            for key, _ in near_dups.query_signature(rec["signature"]):
+                rep = near_dups.representative.get(key, key)
+                if rep == rec["key"]:
+                    continue  # this page represented its cluster in an earlier run; extract it again
+                extraction = near_dups.payloads.get(rep)
+                if extraction is not None:
+                    rec["reuse"] = extraction
+                    return Finished(rec)
+            with fetched_lock:
+                ahead = [k for k, _ in fetched_dups.query_signature(rec["signature"]) if fetched_seq[k] < rec["seq"]]
+                fetched_dups.add_signature(rec["key"], rec["signature"])
+                fetched_seq[rec["key"]] = rec["seq"]
+            return Finished(rec) if ahead else rec
+
+        def settle(out: Any) -> Any:
+            """Turn a pipeline result into the job to emit; runs on the calling thread in input order.
+
+            Pages join near_dups here, one at a time in rank order, so a cluster's representative is
+            always its earliest-ranked page whatever order the fetches finished in. A page whose
+            representative has an extraction is emitted as its near-duplicate, even if a race sent
+            it to the LLM too.
+            """
+            if not isinstance(out, dict) or "page" not in out:
+                return out  # replayed from the checkpoint
+            job = out.get("job")
+            rep = near_dups.add_signature(out["key"], out.get("signature")) if near_dups is not None else None
+            extraction = near_dups.payloads.get(rep) if rep not in (None, out["key"]) else None
+            extraction = extraction or out.get("reuse")
+            if extraction is None:
+                if job is None:
+                    # Deferred behind a page whose cluster ended up without an extraction
+                    job = checkpoint(extract(out))["job"]
+                if rep == out["key"]:
+                    near_dups.payloads[rep] = {k: v for k, v in job.items() if k != "raw_page_text"}
+                return job
+            # Same posting body, but the top card (company, title, ...) is this page's own: a
+            # repost by another company must not inherit the first poster's header
+            sections = out["page"].get("sections") or {}
+            dup: Dict[str, Any] = {"url": out["url"]}
+            dup.update({k: sections.get(k) or None for k in JOB_HEADER_FIELDS})
+            dup.update({k: extraction.get(k) for k in JOB_BODY_FIELDS})
+            dup["near_duplicate_of"] = extraction["url"]
+            if args.debug:
+                print(f"[debug] near-duplicate of {extraction['url']}, reusing extraction -> {out['url']}", file=sys.stderr)
+            journal.record("job", out["url"], dup)
+            mark_seen(out)
+            return dup
+
+        def fetch(rec: Dict[str, Any]) -> Dict[str, Any]:
+            rec["page"] = fetch_job_page(rec["url"], local_sections=not args.no_local_sections)
+            return rec
+
+        def long_enough(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            # Failed or blocked fetches are left unrecorded so a resumed run retries them
+            if len(rec["page"]["text"]) < MIN_JOB_PAGE_CHARS:
+                if args.debug:
+                    print(f"[debug] skip short page ({len(rec['page']['text'])} chars): {rec['url']}", file=sys.stderr)
+                return None
+            return rec
+
+        def in_region(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if not args.jobs_region:
+                return rec
+            want = args.jobs_region.lower()
+            page = rec["page"]
+            location = _to_text((page.get("sections") or {}).get("location"))
+            if want in location.lower() or want in page["text"].lower():
+                return rec
+            if args.debug:
+                print(f"[debug] skip non-{args.jobs_region}: {location or '?'} -> {rec['url']}", file=sys.stderr)
+            journal.record("job", rec["url"], None)
+            mark_seen(rec)
+            return None
+
+        def extract(rec: Dict[str, Any]) -> Dict[str, Any]:
+            rec["job"] = extract_job(rec["url"], rec["page"])
+            return rec
+
+        def checkpoint(rec: Dict[str, Any]) -> Dict[str, Any]:
+            journal.record("job", rec["url"], rec["job"])
+            mark_seen(rec)
+            return rec
+
+        pipeline = Pipeline(
+            [
+                Stage("dedupe", dedupe),
+                Stage("resume", resume),
+                Stage("seen", not_seen_before),
+                Stage("fetch", fetch, pool="fetch"),
+                Stage("too-short", long_enough, pool="fetch"),
+                Stage("region", in_region, pool="fetch"),
+                Stage("near-dup", reuse_near_duplicate, pool="fetch"),
+                Stage("llm", extract, pool="llm"),
+                Stage("checkpoint", checkpoint, pool="llm"),
+            ],
+            {"fetch": args.fetch_workers, "llm": args.llm_workers},
+        )
+
+        def discover_and_extract(q_literal: str, take: int, found: Optional[List[Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+            if found is None:
+                found = search_checkpointed(
+                    f"cse:{take * 2}:{q_literal}",
+                    lambda: google_cse_query(google_api_key, google_cse_id, q_literal, take * 2, debug=args.debug),
+                )
+            if args.debug:
+                print(f"[debug] role query: {q_literal} results={len(found)}", file=sys.stderr)
+            records = [{"url": r.get("link")} for r in found[:take] if r.get("link")]
+            # Results keep search rank order
+            for out in pipeline.run(records):
+                job = settle(out)
+                if job:
+                    yield job
 
         if args.jobs_balanced:
             roles = [r for r in DEFAULT_ROLES]
@@ -885,7 +1500,8 @@ def main() -> None:
             for role in roles:
                 # Strict LinkedIn SG literal query per role
                 q_literal = f'({role}) site:linkedin.com/jobs/view/ ("{args.jobs_region}" OR "SG")'
-                jobs.extend(discover_and_extract(q_literal, per_role))
+                for job in discover_and_extract(q_literal, per_role):
+                    emit(job)
         else:
             if args.jobs_literal:
                 q = args.jobs_q
@@ -893,27 +1509,34 @@ def main() -> None:
                 titles_expr = args.jobs_q
                 region_tokens = f'("{args.jobs_region}" OR "SG")' if args.jobs_region else ''
                 q = f'({titles_expr}) {region_tokens}'.strip()
-            found = google_cse_query(google_api_key, google_cse_id, q, args.limit * 2, debug=args.debug)
+            found = search_checkpointed(
+                f"cse:{args.limit * 2}:{q}",
+                lambda: google_cse_query(google_api_key, google_cse_id, q, args.limit * 2, debug=args.debug),
+            )
             if args.debug:
                 print(f"[debug] jobs search_results={len(found)}", file=sys.stderr)
                 print(f"[debug] jobs query: {q}", file=sys.stderr)
                 for i, r in enumerate(found[:5]):
                     print(f"[debug] job[{i}]: {r.get('link')}", file=sys.stderr)
-            jobs.extend(discover_and_extract_queries := discover_and_extract(q, args.limit))
+            for job in discover_and_extract(q, args.limit, found):
+                emit(job)
 
-        payload = {
-            "query": args.jobs_q if not args.jobs_balanced else "balanced",
-            "count": len(jobs),
-            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "jobs": jobs,
-        }
-        output = json.dumps(payload, indent=2, ensure_ascii=False)
-        if args.out:
-            with open(args.out, "w", encoding="utf-8") as f:
-                f.write(output)
-            print(f"Saved {len(jobs)} jobs to {args.out}")
-        else:
-            print(output)
+        print(f"[jobs] pipeline: {pipeline.summary()}", file=sys.stderr)
+        if near_dups is not None and args.near_dup_index:
+            near_dups.save(args.near_dup_index)
+        if seen_jobs is not None:
+            if args.debug:
+                print(f"[debug] seen jobs: {seen_jobs.count()} in {args.seen_jobs}", file=sys.stderr)
+            seen_jobs.close()
+        if prompt_savings["jobs"]:
+            print(
+                f"[jobs] local about-the-job extraction: {prompt_savings['local']}/{prompt_savings['jobs']} jobs "
+                f"skipped the full extraction prompt; ~{prompt_savings['tokens']} input tokens saved "
+                f"(~{prompt_savings['tokens'] // prompt_savings['jobs']} per job)",
+                file=sys.stderr,
+            )
+        query = args.jobs_q if not args.jobs_balanced else "balanced"
+        finish_output(args, sink, query, "jobs", jobs, "jobs")
         return
 
     if args.search == "serpapi":
@@ -926,9 +1549,15 @@ def main() -> None:
             sys.exit(1)
 
     if args.search == "serpapi":
-        search_results = serp_search_google(serpapi_key, args.q, args.limit * 2, debug=args.debug)
+        search_results = search_checkpointed(
+            f"serpapi:{args.limit * 2}:{args.q}",
+            lambda: serp_search_google(serpapi_key, args.q, args.limit * 2, debug=args.debug),
+        )
     else:
-        search_results = google_cse_search(google_api_key, google_cse_id, args.q, args.limit * 2, debug=args.debug)
+        search_results = search_checkpointed(
+            f"google:{args.limit * 2}:{args.q}",
+            lambda: google_cse_search(google_api_key, google_cse_id, args.q, args.limit * 2, debug=args.debug),
+        )
     # de-duplicate links and trim to limit
     seen = set()
     profile_links: List[str] = []
@@ -945,13 +1574,28 @@ def main() -> None:
             print(f"[debug] link[{i}]: {u}", file=sys.stderr)
 
     results: List[Dict[str, Any]] = []
+    # In ndjson mode each profile is written out in its final shape as soon as it is done
+    sink = NDJSONWriter(args.out, args.flush_every) if args.format == "ndjson" else None
+    category_cache: Dict[str, str] = {}
+    # ndjson benchmark rows: profiles are held back until their uncategorized skills fill one
+    # categorization batch, so the LLM sees full batches instead of one profile's few new skills
+    pending: List[Dict[str, Any]] = []
+    pending_skills: set = set()
+
+    def flush_benchmark() -> None:
+        if pending:
+            sink.write_all(to_benchmark_records(
+                pending, args.ai, openai_api_key, args.openai_model,
+                batch_size=args.categorize_batch, workers=args.llm_workers, category_cache=category_cache,
+            ))
+            pending.clear()
+            pending_skills.clear()
+
     # Build a mapping from link to search snippet/title to augment AI context
     link_to_snippet: Dict[str, str] = {r.get("link"): (r.get("snippet") or "") for r in search_results if r.get("link")}
     link_to_title: Dict[str, str] = {r.get("link"): (r.get("title") or "") for r in search_results if r.get("link")}
 
-    for i, link in enumerate(profile_links):
-        if i > 0:
-            time.sleep(1.2)  # gentle pacing to respect API limits
+    def build_profile(link: str) -> Dict[str, Any]:
         prof = fetch_linkedin_profile(serpapi_key or "", link, debug=args.debug)
         # No Proxycurl fallback; rely on AI over expanded text context
         # Build AI context
@@ -967,7 +1611,7 @@ def main() -> None:
         text_blob = "\n".join([p for p in text_parts if p]).strip()
 
         if args.ai:
-            # Full profile extraction (title/experience_level/skills)
+            # Full profile extraction (title/experience_level/skills) in one validated call
             ai_profile = ai_extract_profile(openai_api_key, args.openai_model, text_blob)
             if ai_profile:
                 if args.debug:
@@ -976,94 +1620,89 @@ def main() -> None:
                     prof["job_title_ai"] = ai_profile["job_title"]
                 if ai_profile.get("experience_level"):
                     prof["experience_level_ai"] = ai_profile["experience_level"]
-                prof["skills"] = unique_merge_skills(prof.get("skills") or [], ai_profile.get("skills") or [])
-            else:
-                # Skills-only as fallback
-                ai_skills = ai_extract_skills(openai_api_key, args.openai_model, text_blob)
-                prof["skills"] = unique_merge_skills(prof.get("skills") or [], ai_skills)
+            prof["skills"] = unique_merge_skills(prof.get("skills") or [], ai_profile.get("skills") or [])
             if args.debug:
                 print(f"[debug] merged skills count={len(prof.get('skills') or [])}", file=sys.stderr)
         else:
             prof["skills"] = unique_merge_skills(prof.get("skills") or [])
             # Fallback: if no skills from SerpAPI and OPENAI_API_KEY is available, auto-extract
             if (not prof["skills"]) and openai_api_key:
-                ai_profile = ai_extract_profile(openai_api_key, args.openai_model, text_blob)
-                ai_skills = (ai_profile.get("skills") if ai_profile else None) or ai_extract_skills(openai_api_key, args.openai_model, text_blob)
+                ai_skills = ai_extract_profile(openai_api_key, args.openai_model, text_blob).get("skills") or []
                 merged = unique_merge_skills(prof.get("skills") or [], ai_skills)
                 if args.debug:
                     print(f"[debug] fallback ai skills={len(ai_skills)} merged={len(merged)}", file=sys.stderr)
                 prof["skills"] = merged
-        results.append(prof)
+        return prof
+
+    for link in profile_links:
+        if journal.is_done("profile", link):
+            prof = journal.get("profile", link)
+        else:
+            prof = build_profile(link)
+            # A failed profile fetch only carries the URL; leave it for a resumed run to retry
+            if prof.get("name") or prof.get("headline") or prof.get("about"):
+                journal.record("profile", link, prof)
+        if not sink:
+            results.append(prof)
+        elif args.sections:
+            sink.write(profile_sections(prof))
+        elif args.benchmark and args.compact:
+            sink.write(profile_compact_record(prof))
+        elif args.benchmark:
+            pending.append(prof)
+            pending_skills.update(s.lower() for s in prof.get("skills") or [] if s.lower() not in category_cache)
+            if not (args.ai and openai_api_key) or len(pending_skills) >= args.categorize_batch:
+                flush_benchmark()
+        else:
+            sink.write(prof)
+    if sink and args.benchmark and not args.compact:
+        flush_benchmark()
 
     if args.sections:
         # Emit raw sections per profile
-        payload = {
-            "query": args.q,
-            "count": len(results),
-            "scraped_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "profiles": [
-                {
-                    "title": p.get("headline"),
-                    "about": p.get("about"),
-                    "experiences": p.get("experiences"),
-                    "education": p.get("education"),
-                    "skills": p.get("skills"),
-                    "courses": p.get("courses"),
-                    "url": p.get("url"),
-                }
-                for p in results
-            ],
-        }
-        output = json.dumps(payload, indent=2, ensure_ascii=False)
-        if args.out:
-            with open(args.out, "w", encoding="utf-8") as f:
-                f.write(output)
-            print(f"Saved {len(results)} profiles (sections) to {args.out}")
-        else:
-            print(output)
+        finish_output(args, sink, args.q, "profiles", [profile_sections(p) for p in results], "profiles (sections)", ts_key="scraped_at")
     elif args.benchmark:
         if args.compact:
             # One record per profile with array of skills
-            compact: List[Dict[str, Any]] = []
-            for p in results:
-                compact.append({
-                    "job_title": p.get("job_title_ai") or extract_job_title_from_headline(p.get("headline")) or "Unknown",
-                    "experience_level": p.get("experience_level_ai") or infer_experience_level(" ".join([p.get("headline") or "", p.get("about") or ""])) or "unknown",
-                    "region": (p.get("location") or "").strip(),
-                    "skills": p.get("skills") or [],
-                    "url": p.get("url"),
-                })
-            bench = compact
-        else:
-            bench = to_benchmark_records(results, args.ai, openai_api_key, args.openai_model)
-        payload = {
-            "query": args.q,
-            "count": len(bench),
-            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "records": bench,
-        }
-        output = json.dumps(payload, indent=2, ensure_ascii=False)
-        if args.out:
-            with open(args.out, "w", encoding="utf-8") as f:
-                f.write(output)
-            print(f"Saved {len(bench)} benchmark records to {args.out}")
+            bench = [profile_compact_record(p) for p in results]
         else:
-            print(output)
+            bench = to_benchmark_records(
+                results, args.ai, openai_api_key, args.openai_model,
+                batch_size=args.categorize_batch, workers=args.llm_workers, category_cache=category_cache,
+            )
+        finish_output(args, sink, args.q, "records", bench, "benchmark records")
     else:
-        payload = {
-            "query": args.q,
-            "count": len(results),
-            "scraped_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "results": results,
-        }
-        output = json.dumps(payload, indent=2, ensure_ascii=False)
-        if args.out:
-            with open(args.out, "w", encoding="utf-8") as f:
-                f.write(output)
-            print(f"Saved {len(results)} profiles to {args.out}")
-        else:
-            print(output)
+        finish_output(args, sink, args.q, "results", results, "profiles", ts_key="scraped_at")
+
+
+def finish_output(
+    args: argparse.Namespace,
+    sink: Optional[NDJSONWriter],
+    query: Any,
+    key: str,
+    records: List[Dict[str, Any]],
+    label: str,
+    ts_key: str = "generated_at",
+) -> None:
+    """Close the NDJSON stream (optionally compacting it), or write the wrapped JSON payload."""
+    if sink:
+        sink.close()
+        if args.json_out:
+            count = compact_ndjson(args.out, args.json_out, query, key, ts_key=ts_key)
+            print(f"Saved {count} {label} to {args.out} (compacted to {args.json_out})", file=sys.stderr)
+        elif args.out:
+            print(f"Saved {sink.count} {label} to {args.out}", file=sys.stderr)
+        return
+    if args.format == "npz":
+        # numpy is only needed for columnar output, so the scraper itself keeps running without it
+        from benchmark_columnar import write_columnar
 
+        rows = write_columnar(args.out, records, query=query)
+        print(f"Saved {len(records)} {label} ({rows} skill rows) to {args.out}")
+        return
+    write_wrapped_json(args.out, query, key, records, ts_key=ts_key)
+    if args.out:
+        print(f"Saved {len(records)} {label} to {args.out}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,99 @@
+"""
+Durable cache for OpenAI chat-completion results.
+
+Entries live in a SQLite file keyed by a SHA-256 of (model, system prompt,
+user prompt, temperature), so re-running an extraction over the same page or
+skill string returns the stored completion instead of paying for a new call.
+Counts hits/misses for reporting and evicts least-recently-used entries once
+`max_entries` is exceeded (and optionally anything older than `ttl` seconds).
+Callers `delete` completions that fail their validation, so a malformed answer
+is asked for again next time instead of being replayed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+
+def prompt_key(model: str, messages: List[Mapping[str, Any]], temperature: float) -> str:
+    system = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+    user = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") != "system")
+    raw = json.dumps([model, system, user, float(temperature)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: Optional[float] = None):
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY, model TEXT, content TEXT, created_at REAL, accessed_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed_at)")
+        self.db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT content, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl is not None and time.time() - row[1] > self.ttl:
+                self.db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.db.commit()
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.db.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+            return row[0]
+
+    def put(self, key: str, model: str, content: str) -> None:
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now),
+            )
+            self._evict()
+            self.db.commit()
+
+    def delete(self, key: str) -> None:
+        """Forget a completion, e.g. one the caller could not validate."""
+        with self.lock:
+            self.db.execute("DELETE FROM completions WHERE key = ?", (key,))
+            self.db.commit()
+
+    def _evict(self) -> None:
+        count = self.db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        # Trim a little below the cap so we don't evict on every insert
+        excess += self.max_entries // 20
+        self.db.execute(
+            "DELETE FROM completions WHERE key IN ("
+            " SELECT key FROM completions ORDER BY accessed_at ASC LIMIT ?)",
+            (excess,),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            size = self.db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
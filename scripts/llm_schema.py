@@ -0,0 +1,179 @@
+"""
+Schema validation and bounded self-repair for structured LLM extractions.
+
+An extraction prompt asks for one JSON object. `extract_structured` parses the
+reply, coerces it against a list of `Field`s (strings trimmed, lists of
+strings accepted as comma/newline separated text, missing keys defaulted) and
+runs an optional `postprocess` hook that may fill derived fields and report
+what is still wrong. Only if problems remain does it send a repair turn -- the
+previous answer, the problems and the schema of the fields to fix, plus an
+optional short context -- instead of re-sending the full prompt. The repair
+answer only fills those fields: every other value stays as first extracted,
+so a long description can not be shortened by a repair. The number of repair
+turns is bounded; whatever validated best after the last one is returned.
+
+Problems name their field in single quotes ("'skills' is missing or empty")
+so the repair can be merged field by field; a problem that names no field
+asks for the whole object again.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_OBJECT_RE = re.compile(r"\{(?:.|\n)*\}")
+_LIST_SPLIT_RE = re.compile(r"[,;\n]")
+# Longest source context quoted back in a repair turn (the previous answer is quoted in full)
+REPAIR_QUOTE_CHARS = 6000
+
+
+class Field:
+    def __init__(self, name: str, kind: str = "text", required: bool = False, description: str = ""):
+        if kind not in ("text", "list"):
+            raise ValueError(f"unknown field kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.description = description
+
+
+def describe(fields: List[Field]) -> str:
+    """One line per key, used in prompts."""
+    lines = []
+    for f in fields:
+        kind = "array of strings" if f.kind == "list" else "string or null"
+        extra = f" -- {f.description}" if f.description else ""
+        lines.append(f"- {f.name} ({kind}{', required' if f.required else ''}){extra}")
+    return "\n".join(lines)
+
+
+def parse_object(content: str) -> Optional[Dict[str, Any]]:
+    try:
+        parsed = json.loads(content)
+    except Exception:
+        m = _OBJECT_RE.search(content or "")
+        try:
+            parsed = json.loads(m.group(0)) if m else None
+        except Exception:
+            parsed = None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        value = "\n".join(str(v) for v in value if v is not None)
+    elif isinstance(value, (dict, bool)):
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = _LIST_SPLIT_RE.split(value)
+    if not isinstance(value, list):
+        return []
+    return [str(v).strip() for v in value if v is not None and not isinstance(v, (dict, list)) and str(v).strip()]
+
+
+def missing(obj: Dict[str, Any], fields: List[Field]) -> List[str]:
+    return [f"'{f.name}' is missing or empty" for f in fields if f.required and not obj.get(f.name)]
+
+
+def validate(obj: Dict[str, Any], fields: List[Field]) -> Tuple[Dict[str, Any], List[str]]:
+    """Coerce obj to the schema; returns (clean object with every field, problems)."""
+    clean = {
+        f.name: _as_list(obj.get(f.name)) if f.kind == "list" else _as_text(obj.get(f.name))
+        for f in fields
+    }
+    return clean, missing(clean, fields)
+
+
+def problem_fields(problems: List[str], fields: List[Field]) -> List[str]:
+    """Names of the fields the problems refer to; every field if one of them names none."""
+    names = []
+    for p in problems:
+        named = [f.name for f in fields if f"'{f.name}'" in p]
+        if not named:
+            return [f.name for f in fields]
+        names.extend(n for n in named if n not in names)
+    return names
+
+
+def repair_messages(
+    fields: List[Field],
+    previous: str,
+    problems: List[str],
+    context: Optional[str] = None,
+    keys: Optional[List[str]] = None,
+) -> List[Dict[str, str]]:
+    """Repair turn for the `keys` fields (default: all) of the previous answer, quoted in full."""
+    wanted = [f for f in fields if keys is None or f.name in keys]
+    user = (
+        "Your previous answer did not match the required JSON schema.\n\nProblems:\n"
+        + "\n".join(f"- {p}" for p in problems)
+        + "\n\nKeys to return:\n" + describe(wanted)
+        + "\n\nPrevious answer:\n" + previous
+    )
+    if context:
+        user += "\n\nSource text:\n" + context[:REPAIR_QUOTE_CHARS]
+    user += "\n\nReturn ONLY a JSON object with the corrected values of these keys: " + ", ".join(f.name for f in wanted) + "."
+    return [
+        {"role": "system", "content": "You fix JSON objects so they match a schema. Keep every correct value unchanged."},
+        {"role": "user", "content": user},
+    ]
+
+
+def extract_structured(
+    chat: Callable[[List[Dict[str, str]]], str],
+    messages: List[Dict[str, str]],
+    fields: List[Field],
+    postprocess: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+    context: Optional[str] = None,
+    max_repairs: int = 1,
+    reject: Optional[Callable[[List[Dict[str, str]]], None]] = None,
+) -> Dict[str, Any]:
+    """One extraction call plus at most `max_repairs` repair turns; {} if nothing parseable came back.
+
+    `reject` is called with the messages of every reply that did not parse or
+    still had problems (to drop it from a completion cache).
+    """
+    content = chat(messages)
+    sent = messages
+    best: Dict[str, Any] = {}
+    problems: List[str] = []
+    keys: Optional[List[str]] = None
+    for attempt in range(max_repairs + 1):
+        parsed = parse_object(content)
+        if parsed is not None:
+            # A repair only fills the fields it was asked for; the rest of the first answer is kept
+            candidate = dict(best, **{k: parsed[k] for k in keys if k in parsed}) if best and keys else parsed
+            clean, _ = validate(candidate, fields)
+            # The hook may derive fields (so it runs before the required check) and add its own problems
+            found = postprocess(clean) if postprocess else []
+            found += missing(clean, fields)
+            # Later repairs only replace the result when they validate at least as well
+            if not best or len(found) <= len(problems):
+                best, problems = clean, found
+            if found and reject:
+                reject(sent)
+        else:
+            if reject:
+                reject(sent)
+            if not best:
+                problems = ["the answer is not a JSON object"]
+        if not problems or attempt == max_repairs:
+            break
+        if best:
+            keys = problem_fields(problems, fields)
+            previous = json.dumps(best, ensure_ascii=False)
+        else:
+            keys, previous = None, content or ""
+        sent = repair_messages(fields, previous, problems, context, keys)
+        content = chat(sent)
+    return best
@@ -0,0 +1,219 @@
+"""
+Near-duplicate job descriptions via MinHash + LSH.
+
+Recruiters repost one description under several URLs and companies. Each text
+is reduced to a MinHash signature over its word 5-shingles; signatures are cut
+into bands and every band is hashed into a bucket, so a lookup only compares
+against texts sharing at least one bucket instead of the whole corpus. The
+band layout is chosen so pairs around the Jaccard threshold almost always
+collide; candidates are then confirmed by their estimated Jaccard similarity.
+
+Every indexed text belongs to a cluster named after its first member (the
+representative). The jobs pipeline adds pages in input order, so the
+representative is the earliest-ranked posting, and attaches its extraction to
+the cluster so later near-duplicates reuse it instead of calling the LLM.
+
+Offline batch use over classified job files:
+
+    python scripts/near_dup.py prisma/data/job_description_cleaned/*.json [--threshold 0.85] [--out deduped.json]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+_WORD_RE = re.compile(r"\w+")
+_MERSENNE = (1 << 61) - 1
+SHINGLE_WORDS = 5
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_WORDS) -> List[int]:
+    """Stable 64-bit hashes of the distinct word k-shingles of text (lowercased)."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return []
+    grams = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+    return [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little") for g in grams]
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.coeffs = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of text, or None when it has no words."""
+        hashes = shingle_hashes(text)
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in self.coeffs)
+
+
+def estimated_jaccard(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def lsh_layout(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm whose collision threshold is the highest not above `threshold`."""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, seed: int = 1):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = lsh_layout(num_perm, threshold)
+        self.buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(self.bands)]
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.representative: Dict[str, str] = {}
+        # Per-cluster payload (e.g. the representative's extraction), keyed by representative
+        self.payloads: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+
+    def _band_keys(self, sig: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def _query(self, sig: Tuple[int, ...]) -> List[Tuple[str, float]]:
+        candidates = set()
+        for band, key in self._band_keys(sig):
+            candidates.update(self.buckets[band].get(key, ()))
+        scored = [(k, estimated_jaccard(sig, self.signatures[k])) for k in candidates]
+        return sorted(((k, s) for k, s in scored if s >= self.threshold), key=lambda ks: (-ks[1], ks[0]))
+
+    def query(self, text: str) -> List[Tuple[str, float]]:
+        """Indexed keys whose estimated Jaccard similarity with text is >= threshold, best first."""
+        return self.query_signature(self.hasher.signature(text))
+
+    def query_signature(self, sig: Optional[Tuple[int, ...]]) -> List[Tuple[str, float]]:
+        """query() for a signature already computed with this index's hasher."""
+        if sig is None:
+            return []
+        with self.lock:
+            return self._query(sig)
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """Index text under key; returns its cluster representative (key itself when it starts a new cluster)."""
+        return self.add_signature(key, self.hasher.signature(text))
+
+    def add_signature(self, key: str, sig: Optional[Tuple[int, ...]]) -> Optional[str]:
+        """add() for a signature already computed with this index's hasher."""
+        if sig is None:
+            return None
+        with self.lock:
+            if key in self.representative:
+                return self.representative[key]
+            matches = self._query(sig)
+            rep = self.representative[matches[0][0]] if matches else key
+            self.signatures[key] = sig
+            self.representative[key] = rep
+            for band, band_key in self._band_keys(sig):
+                self.buckets[band].setdefault(band_key, []).append(key)
+            return rep
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Representative -> members (in insertion order), for clusters with more than one member."""
+        out: Dict[str, List[str]] = {}
+        for key, rep in self.representative.items():
+            out.setdefault(rep, []).append(key)
+        return {rep: members for rep, members in out.items() if len(members) > 1}
+
+    def save(self, path: str) -> None:
+        with self.lock:
+            state = {
+                "threshold": self.threshold,
+                "num_perm": self.hasher.num_perm,
+                "entries": [[k, self.representative[k], list(sig)] for k, sig in self.signatures.items()],
+                "payloads": self.payloads,
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, threshold: Optional[float] = None) -> "NearDuplicateIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        index = cls(threshold if threshold is not None else state["threshold"], state["num_perm"])
+        for key, rep, sig in state["entries"]:
+            sig = tuple(sig)
+            index.signatures[key] = sig
+            index.representative[key] = rep
+            for band, band_key in index._band_keys(sig):
+                index.buckets[band].setdefault(band_key, []).append(key)
+        index.payloads = state.get("payloads") or {}
+        return index
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """The posting body used for near-duplicate matching (description + requirements)."""
+    parts = []
+    for field in ("job_description", "job_requirements"):
+        value = job.get(field)
+        if isinstance(value, list):
+            value = "\n".join(str(v) for v in value)
+        if isinstance(value, str) and value.strip():
+            parts.append(value.strip())
+    return "\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find near-duplicate job descriptions in job JSON files")
+    parser.add_argument("paths", nargs="+", help="Wrapped job JSON files ({'jobs': [...]}) or glob patterns")
+    parser.add_argument("--threshold", type=float, default=0.85, help="Estimated Jaccard similarity that counts as a duplicate")
+    parser.add_argument("--out", type=str, default=None, help="Write one job per cluster (with its duplicates' URLs) to this file")
+    args = parser.parse_args()
+
+    jobs: List[Dict[str, Any]] = []
+    for pattern in args.paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with open(path, "r", encoding="utf-8") as f:
+                jobs.extend(j for j in json.load(f).get("jobs", []) if isinstance(j, dict))
+
+    index = NearDuplicateIndex(threshold=args.threshold)
+    keys: List[str] = []
+    for i, job in enumerate(jobs):
+        key = job.get("url") or f"#{i}"
+        index.add(key, job_text(job))
+        keys.append(key)
+    clusters = index.clusters()
+    dupes = sum(len(m) - 1 for m in clusters.values())
+    print(f"{len(jobs)} jobs, {len(clusters)} near-duplicate clusters, {dupes} duplicates", file=sys.stderr)
+    for rep, members in clusters.items():
+        print(f"  {rep}", file=sys.stderr)
+        for m in members[1:]:
+            print(f"    ~ {m}", file=sys.stderr)
+
+    if args.out:
+        kept: List[Dict[str, Any]] = []
+        written = set()
+        for job, key in zip(jobs, keys):
+            if key in written:
+                continue
+            # Jobs without text to sign are never clustered and always kept
+            if index.representative.get(key, key) == key:
+                written.add(key)
+                if key in clusters:
+                    job = dict(job, duplicates=clusters[key][1:])
+                kept.append(job)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"count": len(kept), "jobs": kept}, f, ensure_ascii=False, indent=2)
+        print(f"Saved {len(kept)} jobs to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
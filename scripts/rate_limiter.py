@@ -0,0 +1,147 @@
+"""
+Per-host token-bucket rate limiting shared by the scrapers.
+
+Each remote host gets its own bucket (requests/second + burst size). Callers
+block in `wait(url)` before a request and report the response back through
+`observe(url, status, headers)`. A 429/503 or a `Retry-After` header pauses
+the host and halves its rate; successful responses slowly restore it.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# host suffix -> (requests per second, burst)
+DEFAULT_HOST_LIMITS: Dict[str, Tuple[float, float]] = {
+    "serpapi.com": (1.0, 2.0),
+    "googleapis.com": (2.0, 4.0),
+    "api.openai.com": (5.0, 10.0),
+    "sutd.edu.sg": (1.0, 2.0),
+    "linkedin.com": (1.0, 3.0),
+}
+DEFAULT_LIMIT: Tuple[float, float] = (1.0, 2.0)
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the Retry-After delay in seconds (delta-seconds or HTTP-date form)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Thread-safe token bucket with adaptive (AIMD) rate on throttling."""
+
+    def __init__(self, rate: float, burst: float, min_rate: Optional[float] = None):
+        self.base_rate = max(rate, 1e-6)
+        self.rate = self.base_rate
+        self.min_rate = min_rate if min_rate is not None else self.base_rate / 16
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must sleep before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1.0
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(delay, self.blocked_until - now)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a throttling response: halve the rate and pause the host."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+            self.tokens = min(self.tokens, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def recover(self) -> None:
+        """Additive increase back towards the configured rate after a success."""
+        with self.lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+
+class HostRateLimiter:
+    """Maps request URLs to per-host token buckets."""
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, Tuple[float, float]]] = None,
+        default: Tuple[float, float] = DEFAULT_LIMIT,
+    ):
+        self.limits = dict(DEFAULT_HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def _key(self, url: str) -> str:
+        host = (urlparse(url).hostname or "").lower()
+        for suffix in self.limits:
+            if host == suffix or host.endswith("." + suffix):
+                return suffix
+        return host
+
+    def bucket(self, url: str) -> TokenBucket:
+        key = self._key(url)
+        with self.lock:
+            b = self.buckets.get(key)
+            if b is None:
+                rate, burst = self.limits.get(key, self.default)
+                b = self.buckets[key] = TokenBucket(rate, burst)
+            return b
+
+    def wait(self, url: str) -> None:
+        self.bucket(url).acquire()
+
+    def observe(self, url: str, status: int, headers: Optional[Mapping[str, str]] = None) -> bool:
+        """Feed a response back into the limiter. Returns True when the response was a throttle."""
+        b = self.bucket(url)
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        if status in THROTTLE_STATUSES:
+            b.throttle(retry_after)
+            return True
+        if retry_after:
+            b.pause(retry_after)
+        else:
+            b.recover()
+        return False
+
+
+# Shared process-wide limiter
+RATE_LIMITER = HostRateLimiter()
@@ -0,0 +1,116 @@
+"""
+Record output for the scrapers.
+
+`NDJSONWriter` streams one JSON object per line as soon as a record is ready,
+so a crash late in a run keeps everything written so far and the file can be
+tailed by downstream steps. `compact_ndjson` turns such a file into the
+wrapped, indented JSON payload ({"query", "count", <timestamp>, <key>: [...]})
+without loading it all into memory, and `write_wrapped_json` writes that same
+payload from an in-memory list. `read_records` reads either form back.
+"""
+
+import json
+import sys
+import textwrap
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+
+def utc_timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class NDJSONWriter:
+    """Line-delimited JSON writer; writes to stdout when `path` is None."""
+
+    def __init__(self, path: Optional[str], flush_every: int = 1, append: bool = False):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self.f: TextIO = open(path, "a" if append else "w", encoding="utf-8") if path else sys.stdout
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.f.flush()
+
+    def write_all(self, records: Iterable[Dict[str, Any]]) -> None:
+        for r in records:
+            self.write(r)
+
+    def close(self) -> None:
+        self.f.flush()
+        if self.path:
+            self.f.close()
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield records from an NDJSON file, skipping a truncated final line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _write_wrapped(
+    out: TextIO,
+    query: Any,
+    count: int,
+    ts_key: str,
+    key: str,
+    records: Iterable[Dict[str, Any]],
+) -> None:
+    # Same layout as json.dumps(payload, indent=2), emitted record by record
+    head = json.dumps({"query": query, "count": count, ts_key: utc_timestamp()}, indent=2, ensure_ascii=False)
+    out.write(head[:-2] + ",\n")
+    out.write(f"  {json.dumps(key)}: [")
+    first = True
+    for r in records:
+        out.write("\n" if first else ",\n")
+        out.write(textwrap.indent(json.dumps(r, indent=2, ensure_ascii=False), "    "))
+        first = False
+    out.write("]\n}" if first else "\n  ]\n}")
+
+
+def compact_ndjson(src: str, dst: str, query: Any, key: str, ts_key: str = "generated_at") -> int:
+    """Rewrite an NDJSON file as the wrapped JSON payload. Returns the record count."""
+    count = sum(1 for _ in iter_ndjson(src))
+    with open(dst, "w", encoding="utf-8") as out:
+        _write_wrapped(out, query, count, ts_key, key, iter_ndjson(src))
+    return count
+
+
+def write_wrapped_json(path: Optional[str], query: Any, key: str, records: List[Dict[str, Any]], ts_key: str = "generated_at") -> None:
+    """Write the wrapped JSON payload to `path`, or print it when `path` is None."""
+    payload = {
+        "query": query,
+        "count": len(records),
+        ts_key: utc_timestamp(),
+        key: records,
+    }
+    output = json.dumps(payload, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+def read_records(path: str, keys: Iterable[str] = ("records", "results", "profiles", "jobs")) -> Iterable[Dict[str, Any]]:
+    """Records from an NDJSON file (.ndjson / .jsonl), a bare JSON list, or the first list under `keys` of a wrapped payload."""
+    if path.endswith(".ndjson") or path.endswith(".jsonl"):
+        return iter_ndjson(path)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    for key in keys:
+        if isinstance(data.get(key), list):
+            return data[key]
+    return []
@@ -0,0 +1,82 @@
+"""
+Canonical job keys and a persistent seen-set for the jobs scrape.
+
+The same LinkedIn posting comes back under many URLs: different role
+queries, `sg.` / `www.` hosts, slugs with or without the title, tracking
+query strings (`?refId=...&trackingId=...`), or as `currentJobId=` on a
+search page. `canonical_job_key` maps all of them to `linkedin:<job id>`,
+the numeric id at the end of the `/jobs/view/...-<id>` slug. Other boards
+get a normalized URL (lowercased host without `www.`, no fragment, tracking
+parameters dropped, remaining query sorted).
+
+`SeenJobs` is a small SQLite table of keys already processed by earlier
+runs, checked before any fetch or LLM call. Keys are only added once a job
+has been emitted or filtered out for good, so pages that failed to load
+are tried again next time.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+_LINKEDIN_VIEW_RE = re.compile(r"/jobs/view/(?:[^/?#]*?-)?(\d{6,})(?:[/?#]|$)")
+_LINKEDIN_CURRENT_RE = re.compile(r"[?&]currentJobId=(\d{6,})")
+_TRACKING_PARAMS = frozenset({"trk", "trkinfo", "refid", "trackingid", "ref", "src", "source", "position", "pagenum", "gclid", "fbclid"})
+
+
+def linkedin_job_id(url: str) -> Optional[str]:
+    """Numeric LinkedIn job id of a job-view (or currentJobId) URL, else None."""
+    if "linkedin.com" not in url.lower():
+        return None
+    m = _LINKEDIN_VIEW_RE.search(url) or _LINKEDIN_CURRENT_RE.search(url)
+    return m.group(1) if m else None
+
+
+def canonical_job_key(url: str) -> str:
+    url = url.strip()
+    job_id = linkedin_job_id(url)
+    if job_id:
+        return f"linkedin:{job_id}"
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return "url:" + urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+class SeenJobs:
+    def __init__(self, path: str):
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, url TEXT, seen_at REAL)")
+        self.db.commit()
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            return self.db.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def add(self, key: str, url: str) -> None:
+        with self.lock:
+            self.db.execute("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)", (key, url, time.time()))
+            self.db.commit()
+
+    def count(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,212 @@
+"""
+Skill benchmark aggregation for the `linkedin_benchmark` table.
+
+Loads the long-form records written by `linkedin_scraper.py --benchmark` (one
+row per profile x skill; compact records with a `skills` array are exploded),
+or maps a columnar .npz from `--format npz` without parsing any JSON,
+into dictionary-encoded NumPy columns -- integer codes for skill, job title,
+experience level and region plus a float score -- and computes, per skill and
+optionally per role / level / region, the sample size, mean score and the
+75th / 90th percentiles in a few vectorized passes: one sort by (group, score),
+then reduceat over the group boundaries. Percentiles interpolate linearly,
+like numpy.percentile.
+
+A record's score is its `skill_score` when present, otherwise its experience
+level on a 0-100 scale (LEVEL_SCORES). Records with neither count towards
+sample_size but not towards the score statistics. Groups with no scored record
+at all have no score to report; the linkedin_benchmark score columns are
+non-null, so those groups are left out unless --keep-unscored asks for them
+(with null scores, for inspection rather than loading).
+
+    python scripts/skill_benchmark.py benchmark.json|benchmark.npz [--by job_title,experience_level,region] [--keep-unscored] [--out linkedin_benchmark.json]
+"""
+
+import argparse
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from benchmark_columnar import ColumnarBenchmark
+from record_output import read_records, write_wrapped_json
+
+
+LEVEL_SCORES: Dict[str, float] = {"intern": 25.0, "junior": 50.0, "mid": 75.0, "senior": 100.0}
+GROUP_COLUMNS = ("job_title", "experience_level", "region")
+PERCENTILES = (75, 90)
+
+
+class Vocabulary:
+    """Value <-> integer code, case-insensitive; the first spelling seen is kept for output."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        value = (value or "").strip()
+        key = value.lower()
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class BenchmarkColumns:
+    """Dictionary-encoded benchmark records: int32 code arrays per column plus a float64 score."""
+
+    def __init__(self):
+        self.vocab: Dict[str, Vocabulary] = {c: Vocabulary() for c in ("skill",) + GROUP_COLUMNS}
+        self.codes: Dict[str, np.ndarray] = {}
+        self.score = np.empty(0)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "BenchmarkColumns":
+        cols = cls()
+        lists: Dict[str, List[int]] = {c: [] for c in cols.vocab}
+        scores: List[float] = []
+        encoders = {c: v.encode for c, v in cols.vocab.items()}
+        for r in records:
+            skills = r["skills"] if isinstance(r.get("skills"), list) else [r.get("skill_name")]
+            score = r.get("skill_score")
+            if not isinstance(score, (int, float)):
+                score = LEVEL_SCORES.get((r.get("experience_level") or "").strip().lower(), np.nan)
+            groups = [(c, encoders[c](r.get(c))) for c in GROUP_COLUMNS]
+            for s in skills:
+                if not s:
+                    continue
+                lists["skill"].append(encoders["skill"](s))
+                for c, code in groups:
+                    lists[c].append(code)
+                scores.append(score)
+        cols.codes = {c: np.asarray(v, dtype=np.int32) for c, v in lists.items()}
+        cols.score = np.asarray(scores, dtype=np.float64)
+        return cols
+
+    @classmethod
+    def from_columnar(cls, data: ColumnarBenchmark) -> "BenchmarkColumns":
+        """Re-key a columnar file's dictionaries onto this encoding; per-row work stays in NumPy."""
+        cols = cls()
+        sources = {"skill": ("skill_name", False)}
+        sources.update((c, (c, True)) for c in GROUP_COLUMNS)
+        for c, (column, per_profile) in sources.items():
+            remap = np.asarray([cols.vocab[c].encode(v) for v in data.strings(column)], dtype=np.int32)
+            codes = data.expanded(column) if per_profile else data[column]
+            cols.codes[c] = remap[codes] if len(remap) else np.asarray(codes, dtype=np.int32)
+        levels = np.asarray([LEVEL_SCORES.get(v.lower(), np.nan) for v in cols.vocab["experience_level"].values])
+        cols.score = levels[cols.codes["experience_level"]] if len(levels) else np.empty(0)
+        if "skill_score" in data.arrays:
+            explicit = data["skill_score"].astype(np.float64)
+            cols.score = np.where(np.isnan(explicit), cols.score, explicit)
+        return cols
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+
+def group_keys(cols: BenchmarkColumns, by: Sequence[str]) -> np.ndarray:
+    """One int64 key per record: the mixed-radix combination of the skill code and the `by` codes."""
+    key = cols.codes["skill"].astype(np.int64)
+    for c in by:
+        key = key * max(1, len(cols.vocab[c])) + cols.codes[c]
+    return key
+
+
+def aggregate(cols: BenchmarkColumns, by: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """Per (skill, *by) group: codes, sample_size, scored, avg_skill_score, percentile_<q>."""
+    for c in by:
+        if c not in GROUP_COLUMNS:
+            raise ValueError(f"cannot group by {c!r}; choose from {', '.join(GROUP_COLUMNS)}")
+    n = len(cols)
+    if n == 0:
+        return {"skill": np.empty(0, np.int32), "sample_size": np.empty(0, np.int64)}
+    key = group_keys(cols, by)
+    # Sort by group, then score; NaN (unscored) sorts last within its group
+    order = np.lexsort((cols.score, key))
+    key = key[order]
+    score = cols.score[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    valid = ~np.isnan(score)
+    scored = np.add.reduceat(valid.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(valid, score, 0.0), starts)
+    out: Dict[str, np.ndarray] = {}
+    first = order[starts]
+    out["skill"] = cols.codes["skill"][first]
+    for c in by:
+        out[c] = cols.codes[c][first]
+    out["sample_size"] = sizes
+    out["scored"] = scored
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["avg_skill_score"] = np.where(scored > 0, sums / np.maximum(scored, 1), np.nan)
+        last = np.maximum(scored - 1, 0)
+        for q in PERCENTILES:
+            pos = last * (q / 100.0)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.ceil(pos).astype(np.int64)
+            v_lo = score[starts + lo]
+            v_hi = score[starts + hi]
+            out[f"percentile_{q}"] = np.where(scored > 0, v_lo + (v_hi - v_lo) * (pos - lo), np.nan)
+    return out
+
+
+def _num(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def benchmark_rows(
+    cols: BenchmarkColumns, stats: Dict[str, np.ndarray], by: Sequence[str] = (), keep_unscored: bool = False
+) -> List[Dict[str, Any]]:
+    """linkedin_benchmark rows (id, skill_name, avg_skill_score, percentile_75, percentile_90, sample_size), by sample size.
+
+    Groups without a scored record are skipped unless keep_unscored, as their scores would be None.
+    """
+    order = np.lexsort((stats["skill"], -stats["sample_size"]))
+    if not keep_unscored:
+        order = order[stats["scored"][order] > 0]
+    skills = cols.vocab["skill"].values
+    rows: List[Dict[str, Any]] = []
+    for i, g in enumerate(order.tolist(), start=1):
+        row: Dict[str, Any] = {"id": i, "skill_name": skills[stats["skill"][g]]}
+        for c in by:
+            row[c] = cols.vocab[c].values[stats[c][g]]
+        row["avg_skill_score"] = _num(stats["avg_skill_score"][g])
+        for q in PERCENTILES:
+            row[f"percentile_{q}"] = _num(stats[f"percentile_{q}"][g])
+        row["sample_size"] = int(stats["sample_size"][g])
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aggregate --benchmark records into linkedin_benchmark rows")
+    parser.add_argument("paths", nargs="+", help="Benchmark record files (.json wrapped payload or .ndjson), or one columnar .npz")
+    parser.add_argument("--by", type=str, default="", help=f"Comma-separated breakdown columns: {', '.join(GROUP_COLUMNS)}")
+    parser.add_argument("--min-samples", type=int, default=1, help="Drop groups with fewer records than this")
+    parser.add_argument("--keep-unscored", action="store_true", help="Keep groups with no scored record (null scores; not loadable into linkedin_benchmark)")
+    parser.add_argument("--out", type=str, default=None, help="Write the wrapped JSON payload here (stdout if omitted)")
+    args = parser.parse_args()
+
+    by = [c.strip() for c in args.by.split(",") if c.strip()]
+    if len(args.paths) == 1 and args.paths[0].endswith(".npz"):
+        cols = BenchmarkColumns.from_columnar(ColumnarBenchmark(args.paths[0]))
+    else:
+        cols = BenchmarkColumns.from_records(r for path in args.paths for r in read_records(path))
+    stats = aggregate(cols, by)
+    rows = [r for r in benchmark_rows(cols, stats, by, args.keep_unscored) if r["sample_size"] >= args.min_samples]
+    for i, r in enumerate(rows, start=1):
+        r["id"] = i
+    unscored = 0 if args.keep_unscored else int((stats["scored"] == 0).sum())
+    print(f"{len(cols)} skill records, {len(cols.vocab['skill'])} skills -> {len(rows)} benchmark rows"
+          + (f" ({unscored} unscored groups left out)" if unscored else ""), file=sys.stderr)
+    write_wrapped_json(args.out, {"by": by}, "records", rows)
+    if args.out:
+        print(f"Saved {len(rows)} benchmark rows to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Inverted skill index over courses and job descriptions.
+
+Recommendation lookups ("which courses cover the skills this student is
+missing for role X") otherwise scan every course and job row. The index is
+built once, offline, from the course scraper JSON and the `*_classified.json`
+job files (or --jobs output), with skills normalized through
+normalize_skill / unique_merge_skills so "python" and "Python" share one id.
+
+Every posting list is a sorted int32 array in CSR layout (one flat ids array
+plus int64 offsets per key):
+
+- skill -> courses and skill -> jobs
+- role -> jobs, role -> skills and skill -> roles, the last two with the
+  number of the role's jobs that ask for the skill
+- job -> skills, to recount demand over a union of roles
+
+Jobs get their roles from the `(a OR b ...)` group of the file's search query,
+or from DEFAULT_ROLES found in the title. Courses get their explicit skill tags
+(`skills`, `external_ai_tagged_skill`, `ai_tagged_skill`) plus every known job
+skill that appears as a whole word in their name or description. Job ids and
+SUTD course ids are assigned exactly as db_load.py assigns them, so they are
+the database ids when both tools read the same files; external_courses.json
+records keep their own `external_course_id`. Every course result names its
+table (`courses` or `external_courses`) next to its id.
+
+The index is saved as an uncompressed .npz and memory-mapped on load.
+
+    python scripts/skill_index.py --courses prisma/data/sutd_courses_*.json --jobs "prisma/data/job_description_cleaned/*.json" --out skill_index.npz
+    python scripts/skill_index.py --index skill_index.npz --role "data analyst" --have "Python, SQL" [--top 10]
+"""
+
+import argparse
+import glob
+import json
+import re
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmark_columnar import StringDictionary, decode_strings, map_npz
+from db_load import job_files
+from linkedin_scraper import DEFAULT_ROLES, normalize_skill, unique_merge_skills
+from record_output import read_records, utc_timestamp
+
+
+INDEX_VERSION = 3
+COURSE_TABLES = ("courses", "external_courses")
+_QUERY_ROLES_RE = re.compile(r"^\s*\(([^)]*)\)")
+_ROLE_SPACE_RE = re.compile(r"[\s\-_/]+")
+_TAG_SPLIT_RE = re.compile(r"[,;\n]")
+COURSE_TAG_KEYS = ("skills", "external_ai_tagged_skill", "ai_tagged_skill")
+COURSE_TEXT_KEYS = ("course_name", "description", "full_description", "learning_outcomes", "external_course_name", "external_course_desc")
+# Skills this short ("R", "Go", "C") only tag course text when written with the same casing
+SHORT_SKILL_CHARS = 2
+
+
+def role_key(role: str) -> str:
+    return _ROLE_SPACE_RE.sub(" ", (role or "").lower()).strip()
+
+
+def query_roles(query: Any) -> List[str]:
+    """Roles in the leading "(a OR b ...)" group of a jobs search query."""
+    m = _QUERY_ROLES_RE.match(query) if isinstance(query, str) else None
+    return [role_key(r) for r in m.group(1).split(" OR ") if r.strip()] if m else []
+
+
+_TITLE_ROLES = [(r, re.compile(rf"(?<![a-z0-9]){re.escape(r)}(?![a-z0-9])")) for r in map(role_key, DEFAULT_ROLES)]
+
+
+def title_roles(title: Optional[str]) -> List[str]:
+    key = role_key(title or "")
+    return [r for r, pattern in _TITLE_ROLES if pattern.search(key)]
+
+
+def job_skills(job: Dict[str, Any]) -> List[str]:
+    return unique_merge_skills(job.get("hard_skills"), job.get("soft_skills"), job.get("skills"))
+
+
+def course_tags(course: Dict[str, Any]) -> List[str]:
+    """Explicit skill tags of a course record (the DB's ai_tagged_skill may just hold the course type)."""
+    not_tags = {"", "unknown", (course.get("course_type") or "").strip().lower()}
+    tags: List[str] = []
+    for key in COURSE_TAG_KEYS:
+        value = course.get(key)
+        if isinstance(value, str):
+            value = _TAG_SPLIT_RE.split(value)
+        if isinstance(value, list):
+            tags.extend(str(v).strip() for v in value if v is not None and str(v).strip().lower() not in not_tags)
+    return unique_merge_skills(tags)
+
+
+def course_label(course: Dict[str, Any]) -> str:
+    code = (course.get("course_code") or "").strip()
+    name = (course.get("course_name") or course.get("external_course_name") or "").strip()
+    return f"{code} {name}".strip()
+
+
+class SkillTagger:
+    """Known skill names compiled into whole-word regexes for tagging free text (like SkillCategoryMatcher)."""
+
+    def __init__(self, skills: Iterable[str]):
+        self.names: Dict[str, str] = {}
+        short: List[str] = []
+        for s in skills:
+            if len(s) <= SHORT_SKILL_CHARS:
+                short.append(s)
+            else:
+                self.names.setdefault(s.lower(), s)
+
+        def compile_words(words: Iterable[str], after: str = r"[A-Za-z0-9]") -> Optional["re.Pattern[str]"]:
+            # Longest first so "power bi" wins over "bi"; custom boundaries for "c++" / ".net"
+            alternation = "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+            return re.compile(rf"(?<![A-Za-z0-9])(?P<word>{alternation})(?!{after})") if alternation else None
+
+        self.pattern = compile_words(self.names)
+        # A short skill is not the start of "C++", "C#", "R&D", "C.NET" or the "C/" of "C/C++";
+        # a sentence-ending full stop ("... and C.") and a list slash ("Go/Rust") still end it
+        self.short_pattern = compile_words(short, after=r"[A-Za-z0-9+#&]|\.[A-Za-z0-9]|/(?P=word)[+#]")
+
+    def tags(self, text: str) -> List[str]:
+        found: List[str] = []
+        if self.pattern:
+            found.extend(self.names[m.group(0)] for m in self.pattern.finditer(text.lower()))
+        if self.short_pattern:
+            found.extend(m.group(0) for m in self.short_pattern.finditer(text))
+        return unique_merge_skills(found)
+
+
+def _csr(keys: Sequence[int], values: Sequence[int], num_keys: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(offsets, sorted unique values per key, occurrences of each (key, value) pair)."""
+    keys = np.asarray(keys, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int32)
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    first = np.r_[True, (keys[1:] != keys[:-1]) | (values[1:] != values[:-1])] if len(keys) else np.zeros(0, bool)
+    starts = np.flatnonzero(first)
+    freq = np.diff(np.r_[starts, len(keys)]).astype(np.int32)
+    offsets = np.zeros(num_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys[first], minlength=num_keys), out=offsets[1:])
+    return offsets, values[first], freq
+
+
+def csr_positions(offsets: np.ndarray, keys: Sequence[int]) -> np.ndarray:
+    """Positions in the flat CSR arrays of every key's run, concatenated in key order (one vectorized gather)."""
+    keys = np.asarray(keys, dtype=np.int64)
+    starts = offsets[keys]
+    lengths = offsets[keys + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.zeros(0, np.int64)
+    # Each element's list start, minus where that list begins in the output, plus its output position
+    shift = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+    return shift + np.arange(total)
+
+
+class SkillIndex:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.meta: Dict[str, Any] = json.loads(bytes(arrays["meta"]).decode("utf-8"))
+        if self.meta.get("index_version") != INDEX_VERSION:
+            raise ValueError(f"unsupported skill index version {self.meta.get('index_version')}")
+        self.skills = decode_strings(arrays, "skill")
+        self.roles = decode_strings(arrays, "role")
+        self.courses = decode_strings(arrays, "course")
+        self.skill_ids = {s.lower(): i for i, s in enumerate(self.skills)}
+
+    @classmethod
+    def build(cls, courses: Sequence[Tuple[str, int, Dict[str, Any]]], jobs: Sequence[Tuple[int, Dict[str, Any], List[str]]]) -> "SkillIndex":
+        """courses: (table, course_id, record), table one of COURSE_TABLES; jobs: (job_id, record, roles)."""
+        skill_ids: Dict[str, int] = {}
+        skill_names = StringDictionary()
+        roles = StringDictionary()
+
+        def skill_id(name: str) -> int:
+            key = name.lower()
+            if key not in skill_ids:
+                skill_ids[key] = skill_names.encode(name)
+            return skill_ids[key]
+
+        job_pairs: Tuple[List[int], List[int]] = ([], [])
+        role_jobs: Tuple[List[int], List[int]] = ([], [])
+        role_skills: Tuple[List[int], List[int]] = ([], [])
+        for pos, (_, job, job_roles) in enumerate(jobs):
+            ids = [skill_id(s) for s in job_skills(job)]
+            job_pairs[0].extend(ids)
+            job_pairs[1].extend([pos] * len(ids))
+            for r in job_roles:
+                rid = roles.encode(r)
+                role_jobs[0].append(rid)
+                role_jobs[1].append(pos)
+                role_skills[0].extend([rid] * len(ids))
+                role_skills[1].extend(ids)
+
+        tagged = [course_tags(c) for _, _, c in courses]
+        tagger = SkillTagger(list(skill_names.values) + [t for tags in tagged for t in tags])
+        course_pairs: Tuple[List[int], List[int]] = ([], [])
+        for pos, ((_, _, course), tags) in enumerate(zip(courses, tagged)):
+            text = "\n".join(str(course.get(k) or "") for k in COURSE_TEXT_KEYS)
+            ids = [skill_id(s) for s in unique_merge_skills(tags, tagger.tags(text))]
+            course_pairs[0].extend(ids)
+            course_pairs[1].extend([pos] * len(ids))
+
+        num_skills, num_roles = len(skill_names.values), len(roles.values)
+        arrays: Dict[str, np.ndarray] = {
+            "course_ids": np.asarray([cid for _, cid, _ in courses], dtype=np.int32),
+            "course_tables": np.asarray([COURSE_TABLES.index(table) for table, _, _ in courses], dtype=np.uint8),
+            "job_ids": np.asarray([jid for jid, _, _ in jobs], dtype=np.int32),
+        }
+        for name, (keys, values), num_keys in (
+            ("skill_courses", course_pairs, num_skills),
+            ("skill_jobs", job_pairs, num_skills),
+            ("job_skills", (job_pairs[1], job_pairs[0]), len(jobs)),
+            ("role_jobs", role_jobs, num_roles),
+            ("role_skills", role_skills, num_roles),
+            ("skill_roles", (role_skills[1], role_skills[0]), num_skills),
+        ):
+            offsets, ids, freq = _csr(keys, values, num_keys)
+            arrays[f"{name}.offsets"], arrays[f"{name}.ids"] = offsets, ids
+            if name in ("role_skills", "skill_roles"):
+                arrays[f"{name}.freq"] = freq
+        courses_dict = StringDictionary()
+        for _, _, c in courses:
+            courses_dict.values.append(course_label(c))
+        for column, d in (("skill", skill_names), ("role", roles), ("course", courses_dict)):
+            for suffix, arr in d.arrays().items():
+                arrays[f"{column}.{suffix}"] = arr
+        meta = {
+            "index_version": INDEX_VERSION,
+            "generated_at": utc_timestamp(),
+            "courses": len(courses),
+            "jobs": len(jobs),
+            "skills": num_skills,
+            "roles": num_roles,
+        }
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        return cls(arrays)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, **self.arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillIndex":
+        return cls(map_npz(path))
+
+    def postings(self, name: str, key: int) -> np.ndarray:
+        offsets = self.arrays[f"{name}.offsets"]
+        return self.arrays[f"{name}.ids"][offsets[key]:offsets[key + 1]]
+
+    def _freq(self, name: str, key: int) -> np.ndarray:
+        offsets = self.arrays[f"{name}.offsets"]
+        return self.arrays[f"{name}.freq"][offsets[key]:offsets[key + 1]]
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        return self.skill_ids.get(normalize_skill(skill).lower())
+
+    def course_refs(self, positions: np.ndarray) -> List[Tuple[str, int]]:
+        """(table, course id) of course positions."""
+        tables = self.arrays["course_tables"][positions].tolist()
+        return [(COURSE_TABLES[t], cid) for t, cid in zip(tables, self.arrays["course_ids"][positions].tolist())]
+
+    def courses_for(self, skill: str) -> List[Tuple[str, int]]:
+        """(table, course id) of the courses tagged with skill."""
+        sid = self.skill_id(skill)
+        return [] if sid is None else self.course_refs(self.postings("skill_courses", sid))
+
+    def jobs_for(self, skill: str) -> List[int]:
+        """Job ids asking for skill."""
+        sid = self.skill_id(skill)
+        return [] if sid is None else self.arrays["job_ids"][self.postings("skill_jobs", sid)].tolist()
+
+    def courses_covering(self, skills: Iterable[str]) -> List[Tuple[str, int]]:
+        """(table, course id) of the courses tagged with every one of skills (posting-list intersection, shortest list first)."""
+        ids = [self.skill_id(s) for s in skills]
+        if not ids or None in ids:
+            return []
+        lists = sorted((self.postings("skill_courses", sid) for sid in ids), key=len)
+        common = lists[0]
+        for other in lists[1:]:
+            if not len(common):
+                break
+            common = np.intersect1d(common, other, assume_unique=True)
+        return self.course_refs(common)
+
+    def match_roles(self, role: str) -> List[int]:
+        """Role ids named `role`, or else every role containing all of its words."""
+        key = role_key(role)
+        if key in self.roles:
+            return [self.roles.index(key)]
+        words = key.split()
+        return [i for i, r in enumerate(self.roles) if words and all(w in r.split() for w in words)]
+
+    def gather(self, name: str, keys: np.ndarray) -> np.ndarray:
+        """The postings of every key, concatenated."""
+        return self.arrays[f"{name}.ids"][csr_positions(self.arrays[f"{name}.offsets"], keys)]
+
+    def role_skills(self, role_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, int]:
+        """(skill ids, jobs asking for each, total jobs) over the union of roles."""
+        if not role_ids:
+            return np.zeros(0, np.int32), np.zeros(0, np.int64), 0
+        if len(role_ids) == 1:
+            rid = role_ids[0]
+            return self.postings("role_skills", rid), self._freq("role_skills", rid).astype(np.int64), len(self.postings("role_jobs", rid))
+        # A job filed under two of the roles must only count once, so recount from the jobs' own skills
+        jobs = np.unique(self.gather("role_jobs", np.asarray(role_ids)))
+        skill_ids, freq = np.unique(self.gather("job_skills", jobs), return_counts=True)
+        return skill_ids.astype(np.int32), freq.astype(np.int64), len(jobs)
+
+    def recommend_courses(
+        self, role: str, have: Iterable[str] = (), top_k: int = 10, min_share: float = 0.0, max_skills: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Courses covering the role's most demanded skills that `have` lacks, ranked by covered demand.
+
+        A missing skill weighs the share of the role's jobs asking for it; a course
+        scores the sum over the missing skills it is tagged with.
+        """
+        role_ids = self.match_roles(role)
+        skill_ids, freq, num_jobs = self.role_skills(role_ids)
+        result: Dict[str, Any] = {"role": [self.roles[r] for r in role_ids], "jobs": num_jobs, "missing": [], "courses": []}
+        if not num_jobs:
+            return result
+        have_ids = np.asarray([i for i in (self.skill_id(s) for s in have) if i is not None], dtype=np.int32)
+        share = freq / num_jobs
+        keep = (share >= min_share) & ~np.isin(skill_ids, have_ids)
+        missing, share = skill_ids[keep], share[keep]
+        order = np.lexsort((missing, -share))[:max_skills]
+        missing, share = missing[order], share[order]
+        result["missing"] = [{"skill": self.skills[s], "share": round(float(w), 3)} for s, w in zip(missing.tolist(), share.tolist())]
+        if not len(missing):
+            return result
+        lists = [self.postings("skill_courses", s) for s in missing.tolist()]
+        hits = self.gather("skill_courses", missing)
+        weights = np.repeat(share, [len(p) for p in lists])
+        num_courses = len(self.arrays["course_ids"])
+        score = np.bincount(hits, weights=weights, minlength=num_courses)
+        covered = np.bincount(hits, minlength=num_courses)
+        candidates = np.flatnonzero(covered)
+        best = candidates[np.lexsort((candidates, -covered[candidates], -score[candidates]))][:top_k]
+        for pos in best.tolist():
+            covers = [self.skills[s] for s, p in zip(missing.tolist(), lists) if _contains(p, pos)]
+            result["courses"].append({
+                "table": COURSE_TABLES[int(self.arrays["course_tables"][pos])],
+                "course_id": int(self.arrays["course_ids"][pos]),
+                "course": self.courses[pos],
+                "score": round(float(score[pos]), 3),
+                "covers": covers,
+            })
+        return result
+
+
+def _contains(sorted_ids: np.ndarray, value: int) -> bool:
+    i = int(np.searchsorted(sorted_ids, value))
+    return i < len(sorted_ids) and int(sorted_ids[i]) == value
+
+
+def _expand(patterns: Sequence[str]) -> List[str]:
+    return [path for pattern in patterns for path in (sorted(glob.glob(pattern)) or [pattern])]
+
+
+def load_jobs(paths: Sequence[str]) -> List[Tuple[int, Dict[str, Any], List[str]]]:
+    """(job_id, job, roles) over all files, in db_load's file order and id assignment."""
+    jobs: List[Tuple[int, Dict[str, Any], List[str]]] = []
+    for path in job_files(paths):
+        query = None
+        if path.endswith(".ndjson") or path.endswith(".jsonl"):
+            records = list(read_records(path))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            query = data.get("query") if isinstance(data, dict) else None
+            records = data.get("jobs", []) if isinstance(data, dict) else data
+        file_roles = query_roles(query)
+        for job in records:
+            jobs.append((len(jobs) + 1, job, file_roles or title_roles(job.get("title"))))
+    return jobs
+
+
+def load_courses(paths: Sequence[str]) -> List[Tuple[str, int, Dict[str, Any]]]:
+    """(table, course_id, course) in input order: SUTD courses numbered as db_load numbers them,
+    external courses under their own external_course_id."""
+    courses: List[Tuple[str, int, Dict[str, Any]]] = []
+    next_id = 1
+    for course in (c for path in _expand(paths) for c in read_records(path, keys=("courses",))):
+        if course.get("external_course_id") is not None:
+            courses.append(("external_courses", int(course["external_course_id"]), course))
+        else:
+            courses.append(("courses", next_id, course))
+            next_id += 1
+    return courses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or query the inverted skill index over courses and jobs")
+    parser.add_argument("--courses", nargs="*", default=[], help="Course JSON files (or globs) to index")
+    parser.add_argument("--jobs", nargs="*", default=[], help="Classified job files / --jobs output (or globs) to index")
+    parser.add_argument("--out", type=str, default=None, help="Save the built index here (.npz)")
+    parser.add_argument("--index", type=str, default=None, help="Load a saved index instead of building one")
+    parser.add_argument("--role", type=str, default=None, help="Recommend courses for this role")
+    parser.add_argument("--have", type=str, default="", help="Comma-separated skills the student already has")
+    parser.add_argument("--top", type=int, default=10, help="Number of courses to return")
+    parser.add_argument("--min-share", type=float, default=0.1, help="Only count skills asked for by at least this share of the role's jobs")
+    parser.add_argument("--max-skills", type=int, default=None, help="Only consider this many of the most demanded missing skills")
+    args = parser.parse_args()
+
+    if args.index:
+        index = SkillIndex.load(args.index)
+    elif args.courses or args.jobs:
+        t0 = time.perf_counter()
+        index = SkillIndex.build(load_courses(args.courses), load_jobs(args.jobs))
+        m = index.meta
+        print(
+            f"[index] {m['courses']} courses, {m['jobs']} jobs, {m['skills']} skills, {m['roles']} roles "
+            f"in {time.perf_counter() - t0:.2f}s",
+            file=sys.stderr,
+        )
+        if args.out:
+            index.save(args.out)
+            print(f"Saved skill index to {args.out}", file=sys.stderr)
+    else:
+        parser.error("pass --index, or --courses / --jobs to build one")
+
+    if args.role:
+        have = [s for s in args.have.split(",") if s.strip()]
+        t0 = time.perf_counter()
+        result = index.recommend_courses(args.role, have, top_k=args.top, min_share=args.min_share, max_skills=args.max_skills)
+        print(f"[index] query in {(time.perf_counter() - t0) * 1000:.2f}ms", file=sys.stderr)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
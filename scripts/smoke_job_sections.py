@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Smoke check for the local LinkedIn "About the job" extractor.
+
+Runs the stored job pages in scripts/fixtures/linkedin_jobs/<job id>.html.gz
+through job_sections.linkedin_job_sections and checks the split agrees with
+the LLM-extracted fields for the same jobs in prisma/data/raw_job_description/:
+
+  - title / company / location / employment_type / experience_level: exact
+    (case- and whitespace-insensitive) matches
+  - about_us / job_description / job_requirements: word recall of the
+    reference text within the local extraction
+
+This is not an accuracy measurement. The pages currently committed are
+synthetic: they start with SYNTHETIC_MARKER and were assembled from those same
+reference fields in LinkedIn's guest job-page markup, so passing only shows
+the extractor still understands that layout and round-trips the fields. An
+accuracy figure needs live pages; `--record` fetches them (replacing the
+synthetic ones) and the summary keeps recorded and synthetic pages apart.
+
+It also prints the estimated prompt tokens saved per job: the whole page when
+the local split is complete (extraction prompt skipped), otherwise the page
+minus the description block that is sent instead.
+
+Usage:
+    python smoke_job_sections.py --record [--fixtures DIR] [--refresh]
+    python smoke_job_sections.py [--fixtures DIR] [--min-recall 0.9]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from html_text import html_to_text
+from job_sections import linkedin_job_sections, llm_input
+from linkedin_scraper import JOB_PAGE_TEXT_CHARS, _to_text, http_request, job_extraction_messages, prompt_tokens
+from seen_jobs import linkedin_job_id
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+REFERENCE_GLOB = os.path.join(_HERE, "..", "prisma", "data", "raw_job_description", "*.json")
+FIXTURE_DIR = os.path.join(_HERE, "fixtures", "linkedin_jobs")
+SYNTHETIC_MARKER = "<!-- synthetic fixture"
+HEADER_FIELDS = ("title", "company", "location", "employment_type", "experience_level")
+BODY_FIELDS = ("about_us", "job_description", "job_requirements")
+_WORD_RE = re.compile(r"\w+")
+
+
+def reference_jobs() -> List[Dict[str, Any]]:
+    jobs: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(glob.glob(REFERENCE_GLOB)):
+        with open(path, "r", encoding="utf-8") as f:
+            for job in json.load(f).get("jobs", []):
+                if "linkedin.com/jobs/view" in (job.get("url") or ""):
+                    jobs.setdefault(job["url"], job)
+    return list(jobs.values())
+
+
+def fixture_path(fixtures: str, url: str) -> str:
+    return os.path.join(fixtures, f"{linkedin_job_id(url)}.html.gz")
+
+
+def load_fixture(fixtures: str, url: str) -> Optional[str]:
+    try:
+        with gzip.open(fixture_path(fixtures, url), "rt", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def record_fixture(fixtures: str, url: str) -> str:
+    """Fetch url through the shared client and store its markup as a fixture."""
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; JobScraper/1.0)"}
+    resp = http_request("GET", url, headers=headers, timeout=30)
+    resp.raise_for_status()
+    markup = resp.content.decode(resp.encoding or "utf-8", errors="replace")
+    os.makedirs(fixtures, exist_ok=True)
+    # mtime=0 so re-recording an unchanged page produces no diff
+    with open(fixture_path(fixtures, url), "wb") as f:
+        f.write(gzip.compress(markup.encode("utf-8"), mtime=0))
+    return markup
+
+
+def _norm(value: Any) -> str:
+    return " ".join(_to_text(value).lower().split())
+
+
+def word_recall(expected: Any, got: Any) -> float:
+    want = _WORD_RE.findall(_norm(expected))
+    if not want:
+        return 1.0
+    have = set(_WORD_RE.findall(_norm(got)))
+    return sum(1 for w in want if w in have) / len(want)
+
+
+def check_job(ref: Dict[str, Any], page: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    sections = linkedin_job_sections(page["markup"]) or {}
+    full = prompt_tokens(job_extraction_messages(page["text"]))
+    if sections.get("complete"):
+        saved = full
+    elif sections:
+        saved = full - prompt_tokens(job_extraction_messages(llm_input(sections)))
+    else:
+        saved = 0
+    result: Dict[str, Any] = {"found": bool(sections), "complete": bool(sections.get("complete"))}
+    for field in HEADER_FIELDS:
+        if ref.get(field):
+            result[field] = _norm(ref[field]) == _norm(sections.get(field))
+    body = sections.get("description_text", "")
+    for field in BODY_FIELDS:
+        if ref.get(field):
+            # Incomplete splits go to the LLM as one block, so score against the block then
+            local = sections.get(field) if sections.get("complete") else body
+            result[field] = word_recall(ref[field], local)
+    return result, saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Smoke-check local LinkedIn job-section extraction on stored job pages")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Directory holding the recorded pages")
+    parser.add_argument("--record", action="store_true", help="Fetch missing and synthetic reference job pages into --fixtures")
+    parser.add_argument("--refresh", action="store_true", help="With --record, re-fetch every page")
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    args = parser.parse_args()
+
+    refs = reference_jobs()
+    print(f"{len(refs)} LinkedIn jobs in {os.path.relpath(os.path.dirname(REFERENCE_GLOB))}")
+
+    checked = failures = synthetic = missing = total_saved = 0
+    for ref in refs:
+        url = ref["url"]
+        markup = load_fixture(args.fixtures, url)
+        if args.record and (markup is None or args.refresh or markup.startswith(SYNTHETIC_MARKER)):
+            try:
+                markup = record_fixture(args.fixtures, url)
+            except Exception as e:
+                print(f"  failed   {url}  {e}")
+        if markup is None:
+            missing += 1
+            print(f"  missing  {url}")
+            continue
+        is_synthetic = markup.startswith(SYNTHETIC_MARKER)
+        page = {"markup": markup, "text": html_to_text(markup, max_chars=JOB_PAGE_TEXT_CHARS)}
+        result, saved = check_job(ref, page)
+        checked += 1
+        synthetic += is_synthetic
+        total_saved += saved
+        bad = [
+            k for k, v in result.items()
+            if k not in ("found", "complete") and (v is False or (isinstance(v, float) and v < args.min_recall))
+        ]
+        failures += bool(bad) or not result["found"]
+        status = "local" if result["complete"] else ("block" if result["found"] else "none")
+        print(f"  {status:<5} ~{saved:>5} tokens saved  {'OK ' if not bad else 'BAD'} {url}"
+              + (" (synthetic)" if is_synthetic else "") + (f"  {', '.join(bad)}" if bad else ""))
+    if not checked:
+        print("No stored pages; run with --record first.")
+        sys.exit(1)
+    print(f"{checked} checked ({checked - synthetic} recorded, {synthetic} synthetic), {missing} not stored, "
+          f"{failures} with mismatches, ~{total_saved // checked} input tokens saved per job")
+    if synthetic == checked:
+        print("All pages are synthetic (built from the reference fields): a layout smoke check, not an accuracy figure.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Tests for llm_schema.extract_structured's repair turn.
+
+    python -m pytest scripts/test_llm_schema.py    (or: python scripts/test_llm_schema.py)
+"""
+
+import json
+from typing import Dict, List
+
+from llm_schema import Field, extract_structured, problem_fields
+
+
+FIELDS = [
+    Field("title"),
+    Field("about_us"),
+    Field("job_description"),
+    Field("job_requirements"),
+    Field("skills", "list", required=True),
+]
+
+
+class ScriptedChat:
+    """Replays canned replies and records the messages it was sent."""
+
+    def __init__(self, replies: List[str]):
+        self.replies = list(replies)
+        self.calls: List[List[Dict[str, str]]] = []
+
+    def __call__(self, messages: List[Dict[str, str]]) -> str:
+        self.calls.append(messages)
+        return self.replies.pop(0)
+
+
+def test_repair_keeps_long_description_fields() -> None:
+    first = {
+        "title": "Data Analyst",
+        "about_us": "About us. " + "We build analytics products. " * 300,
+        "job_description": "Responsibilities. " + "Own dashboards and reporting pipelines. " * 300,
+        "job_requirements": "Requirements. " + "Python, SQL and stakeholder communication. " * 300,
+        "skills": [],
+    }
+    # The repair answers with cut-off descriptions next to the missing skills; only the skills may be taken
+    repair = {
+        "title": "Analyst",
+        "about_us": "About us. We build",
+        "job_description": "Responsibilities.",
+        "skills": ["Python", "SQL"],
+    }
+    chat = ScriptedChat([json.dumps(first), json.dumps(repair)])
+    result = extract_structured(chat, [{"role": "user", "content": "page"}], FIELDS, max_repairs=1)
+
+    assert len(json.dumps(first)) > 6000
+    assert result["skills"] == ["Python", "SQL"]
+    for field in ("title", "about_us", "job_description", "job_requirements"):
+        assert result[field] == first[field].strip()
+    # The previous answer is quoted whole and only the broken field is asked for
+    repair_prompt = chat.calls[1][1]["content"]
+    assert first["job_requirements"].strip() in repair_prompt
+    assert repair_prompt.rstrip().endswith("these keys: skills.")
+
+
+def test_unparseable_first_answer_asks_for_every_field() -> None:
+    chat = ScriptedChat(["not json", json.dumps({"title": "Engineer", "skills": "Go, Rust"})])
+    result = extract_structured(chat, [{"role": "user", "content": "page"}], FIELDS, max_repairs=1)
+    assert result["title"] == "Engineer"
+    assert result["skills"] == ["Go", "Rust"]
+    assert "these keys: title, about_us, job_description, job_requirements, skills." in chat.calls[1][1]["content"]
+
+
+def test_reject_reports_only_invalid_replies() -> None:
+    first = {"title": "Engineer", "skills": []}
+    chat = ScriptedChat([json.dumps(first), "still not json", json.dumps({"skills": ["Go"]})])
+    rejected: List[List[Dict[str, str]]] = []
+    result = extract_structured(chat, [{"role": "user", "content": "page"}], FIELDS, max_repairs=2, reject=rejected.append)
+    assert result["skills"] == ["Go"]
+    # The first answer (missing skills) and the unparseable repair, but not the repair that fixed it
+    assert rejected == chat.calls[:2]
+
+
+def test_problem_fields() -> None:
+    assert problem_fields(["'skills' is missing or empty"], FIELDS) == ["skills"]
+    assert problem_fields(["the answer is not a JSON object"], FIELDS) == [f.name for f in FIELDS]
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")